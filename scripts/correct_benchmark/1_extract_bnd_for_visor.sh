@@ -3,6 +3,9 @@
 # Set base directory
 BASE_DIR="/projects/b1171/qgn1237/6_SV_VCF_merger/20241122_octopusv_correct_benchmark"
 
+# Directory holding this script and extract_bnd.py
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
 # Function to process short-read datasets (NGS)
 process_short_read_dataset() {
     dataset=$1
@@ -11,15 +14,12 @@ process_short_read_dataset() {
     # Create directory for BND VCFs if it doesn't exist
     mkdir -p "${BASE_DIR}/${dataset}/bnd_vcfs"
     
-    # Process each caller's VCF
-    for caller in delly lumpy manta svaba; do
-        input_vcf="${BASE_DIR}/${dataset}/raw_vcfs/${caller}.vcf"
-        output_vcf="${BASE_DIR}/${dataset}/bnd_vcfs/${caller}_bnd.vcf"
-        
-        # Extract BND events using grep
-        grep -E "^#|SVTYPE=BND" "${input_vcf}" > "${output_vcf}"
-        echo "Processed ${caller} for ${dataset}"
-    done
+    # Extract BND records (SVTYPE=BND or bracket-notation ALT) for all callers
+    # in one parallel pass, writing <caller>_bnd.vcf and <caller>_bnd_pairs.tsv
+    python3 "${SCRIPT_DIR}/extract_bnd.py" \
+        --input-dir "${BASE_DIR}/${dataset}/raw_vcfs" \
+        --output-dir "${BASE_DIR}/${dataset}/bnd_vcfs" \
+        --callers delly lumpy manta svaba
 }
 
 # Function to process long-read datasets (PacBio/ONT)
@@ -30,15 +30,12 @@ process_long_read_dataset() {
     # Create directory for BND VCFs if it doesn't exist
     mkdir -p "${BASE_DIR}/${dataset}/bnd_vcfs"
     
-    # Process each caller's VCF
-    for caller in cutesv pbsv sniffles svim; do
-        input_vcf="${BASE_DIR}/${dataset}/raw_vcfs/${caller}.vcf"
-        output_vcf="${BASE_DIR}/${dataset}/bnd_vcfs/${caller}_bnd.vcf"
-        
-        # Extract BND events using grep
-        grep -E "^#|SVTYPE=BND" "${input_vcf}" > "${output_vcf}"
-        echo "Processed ${caller} for ${dataset}"
-    done
+    # Extract BND records (SVTYPE=BND or bracket-notation ALT) for all callers
+    # in one parallel pass, writing <caller>_bnd.vcf and <caller>_bnd_pairs.tsv
+    python3 "${SCRIPT_DIR}/extract_bnd.py" \
+        --input-dir "${BASE_DIR}/${dataset}/raw_vcfs" \
+        --output-dir "${BASE_DIR}/${dataset}/bnd_vcfs" \
+        --callers cutesv pbsv sniffles svim
 }
 
 # Process each dataset
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import argparse
+from functools import partial
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.daemon import LRUCache, JobServer, file_key, submit, print_response
+from octopusv_bench.truth_index import TruthIndex
+from octopusv_bench.truth_store import estimate_bytes
+
+DEFAULT_SOCKET = os.path.join(os.environ.get('TMPDIR', '/tmp'), f"octopusv-bench-{os.getuid()}.sock")
+DEFAULT_MEMORY_CAP_MB = 4096
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Keep truth indexes and parsed corrected SVCFs in memory for repeated compare jobs. "
+                    "'serve' starts the daemon; 'compare' and 'compare-two-truth' take exactly the arguments "
+                    "of compare_sv.py and compare_na12878_sv_two_truth.py and run them in the daemon.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help=f"Unix socket (default: {DEFAULT_SOCKET})")
+    parser.add_argument("--wait", type=float, default=0,
+                        help="Seconds a client keeps retrying while the daemon starts (default: 0)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve = subparsers.add_parser("serve", help="Run the daemon in the foreground until 'stop'")
+    serve.add_argument("--memory-cap-mb", type=float, default=DEFAULT_MEMORY_CAP_MB,
+                       help="Estimated memory for cached inputs before least recently used ones are dropped "
+                            f"(default: {DEFAULT_MEMORY_CAP_MB})")
+    for name, script in [('compare', 'compare_sv.py'), ('compare-two-truth', 'compare_na12878_sv_two_truth.py')]:
+        job = subparsers.add_parser(name, add_help=False, help=f"Run a {script} job in the daemon")
+        job.add_argument("args", nargs=argparse.REMAINDER)
+    subparsers.add_parser("status", help="Print the cached inputs and hit/miss counts")
+    subparsers.add_parser("stop", help="Stop the daemon")
+    return parser.parse_args()
+
+def load_truth(path, load_events):
+    with open(path) as f:
+        events = load_events(f)
+    return (events, TruthIndex(events)), estimate_bytes(events)
+
+def load_calls(path, parse_calls):
+    with open(path) as f:
+        svs = list(parse_calls(f))
+    return svs, estimate_bytes(svs)
+
+class BenchJobs:
+    """compare and compare-two-truth jobs sharing one input cache"""
+    def __init__(self, cache):
+        # The comparators are imported here so the thin clients stay fast to start
+        import compare_sv
+        import compare_na12878_sv_two_truth
+        self.compare_sv = compare_sv
+        self.compare_two = compare_na12878_sv_two_truth
+        self.cache = cache
+
+    def cached(self, kind, path, load):
+        return self.cache.get((kind,) + file_key(path), partial(load, path))
+
+    def compare(self, argv):
+        from octopusv_bench.instrument import Instrumentation
+        compare_sv = self.compare_sv
+        args = compare_sv.parse_args(argv)
+        inst = Instrumentation('bench_daemon.py compare', args.profile)
+
+        with inst.phase('load') as phase:
+            (truth_events, truth_index), truth_cached = self.cached(
+                'truth', args.truth_file, partial(load_truth, load_events=compare_sv.load_truth_events))
+            corrected_svs, calls_cached = self.cached(
+                'calls', args.corrected_file, partial(load_calls, parse_calls=compare_sv.parse_calls))
+            phase['records'] = len(truth_events) + len(corrected_svs)
+        # The cached index is shared by jobs with different TRA tolerances
+        truth_index = truth_index.with_tra_end_tolerance(args.tra_tolerance)
+
+        corrected_records, summaries = compare_sv.compare_calls(
+            corrected_svs, truth_events, truth_index, args.output_file, args.tolerance, args.tra_tolerance,
+            args.one_to_one, inst)
+        compare_sv.write_outputs(args, corrected_records, len(truth_events), summaries, inst)
+        inst.finish(args.output_file)
+        return {'calls': corrected_records, 'matched': summaries[0]['matched'],
+                'truth_cached': truth_cached, 'calls_cached': calls_cached}
+
+    def compare_two_truth(self, argv):
+        compare_two = self.compare_two
+        if len(argv) != 5:
+            raise ValueError("compare-two-truth needs: corrected.svcf truth1.vcf truth2.vcf output_file log_file")
+        corrected_file, truth_file1, truth_file2, output_file, log_file = argv
+
+        truth_sets = []
+        cached = []
+        for kind, path, parse_line in [('truth1', truth_file1, compare_two.parse_truth1_sv_line),
+                                       ('truth2', truth_file2, compare_two.parse_truth2_sv_line)]:
+            load_events = partial(compare_two.load_truth_events, parse_line=parse_line)
+            truth_set, hit = self.cached(kind, path, partial(load_truth, load_events=load_events))
+            truth_sets.append(truth_set)
+            cached.append(hit)
+        corrected_svs, calls_cached = self.cached(
+            'na12878_calls', corrected_file, partial(load_calls, parse_calls=compare_two.parse_calls))
+
+        total_matched, correct_type = compare_two.compare_two_truth(corrected_svs, truth_sets, output_file)
+        compare_two.write_log(log_file, total_matched, correct_type)
+        return {'calls': len(corrected_svs), 'matched': total_matched,
+                'truth_cached': all(cached), 'calls_cached': calls_cached}
+
+def serve(socket_path, memory_cap_mb):
+    cache = LRUCache(int(memory_cap_mb * 1024 ** 2))
+    jobs = BenchJobs(cache)
+    server = JobServer(socket_path, {'compare': jobs.compare, 'compare-two-truth': jobs.compare_two_truth}, cache)
+    print(f"Benchmark daemon {os.getpid()} listening on {socket_path}", file=sys.stderr)
+    server.serve()
+
+def main():
+    args = parse_args()
+    if args.command == 'serve':
+        serve(args.socket, args.memory_cap_mb)
+        return
+    try:
+        response = submit(args.socket, args.command, getattr(args, 'args', []), args.wait)
+    except ConnectionError as e:
+        sys.stderr.write(f"Error: {e}\n")
+        sys.exit(1)
+    sys.exit(print_response(response, indent=2 if args.command == 'status' else None))
+
+if __name__ == "__main__":
+    main()
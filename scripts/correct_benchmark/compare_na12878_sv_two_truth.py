@@ -1,6 +1,11 @@
+import os
 import sys
 import re
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.breakends import fill_mate_from_alt
+from octopusv_bench.truth_store import budgeted_events, index_truth, parse_size, resident_bytes
+
 def parse_corrected_sv_line(line):
     parts = line.strip().split('\t')
     chrom = parts[0].replace('chr', '')  # Remove 'chr' prefix if present
@@ -81,75 +86,101 @@ def is_matching_sv(corrected, truth, tolerance):
     
     return False
 
-def main():
-    corrected_file = sys.argv[1]
-    truth_file1 = sys.argv[2]
-    truth_file2 = sys.argv[3]
-    output_file = sys.argv[4]
-    log_file = sys.argv[5]
-    
-    # Read both truth files into memory
-    truth_events1 = []
-    truth_events2 = []
-    
-    with open(truth_file1) as f:
-        for line in f:
-            if line.startswith('#'):
-                continue
-            truth_events1.append(parse_truth1_sv_line(line))
-    
-    with open(truth_file2) as f:
-        for line in f:
-            if line.startswith('#'):
-                continue
-            truth_events2.append(parse_truth2_sv_line(line))
-    
-    matches = []
+def load_truth_events(lines, parse_line, memory_budget=None):
+    """
+    Parse truth VCF lines ('#' lines are skipped) with parse_line, filling in mate positions from the ALT
+
+    Returns a list, or SpilledEvents when the events exceed memory_budget bytes.
+    """
+    events = (fill_mate_from_alt(parse_line(line), strip_chr=True) for line in lines if not line.startswith('#'))
+    return budgeted_events(events, memory_budget)
+
+def parse_calls(lines):
+    """Parse the data lines of a corrected SVCF"""
+    for line in lines:
+        if not line.startswith('#'):
+            yield parse_corrected_sv_line(line)
+
+def compare_two_truth(corrected_svs, truth_sets, output_file):
+    """
+    Match corrected SVs against the first truth set, then the second
+
+    Args:
+        corrected_svs: Parsed corrected SVs (see parse_calls)
+        truth_sets: (events, TruthIndex) for the DGV and the 1KG truth, in that order
+        output_file: Matched pairs output file
+
+    Returns:
+        tuple: (total matched, correctly typed)
+    """
     correct_type = 0
     total_matched = 0
     
-    # Process corrected file
-    with open(corrected_file) as f, open(output_file, 'w') as out:
+    with open(output_file, 'w') as out:
         out.write("corrected_SVCF\tground_truth\n")
         
-        for line in f:
-            if line.startswith('#'):
-                continue
-                
-            corrected_sv = parse_corrected_sv_line(line)
+        for corrected_sv in corrected_svs:
             tolerance = 5000 if corrected_sv['svtype'] == 'TRA' else 50
             
-            # Try matching against both truth sets
-            matched = False
-            
-            # Try truth set 1
-            for truth_sv in truth_events1:
-                if is_matching_sv(corrected_sv, truth_sv, tolerance):
-                    total_matched += 1
-                    if corrected_sv['svtype'] == truth_sv['svtype'] or \
-                       (corrected_sv['svtype'] == 'DUP' and truth_sv['svtype'] == 'INS'):
-                        correct_type += 1
-                    out.write(f"{corrected_sv['line'].strip()}\t{truth_sv['line'].strip()}\n")
-                    matched = True
-                    break
-            
-            # If no match in truth set 1, try truth set 2
-            if not matched:
-                for truth_sv in truth_events2:
-                    if is_matching_sv(corrected_sv, truth_sv, tolerance):
-                        total_matched += 1
-                        if corrected_sv['svtype'] == truth_sv['svtype'] or \
-                           (corrected_sv['svtype'] == 'DUP' and truth_sv['svtype'] == 'INS'):
-                            correct_type += 1
-                        out.write(f"{corrected_sv['line'].strip()}\t{truth_sv['line'].strip()}\n")
-                        break
-    
-    # Write statistics to log file
+            # Try matching against the truth sets in order
+            for truth_events, truth_index in truth_sets:
+                i = truth_index.first_match(corrected_sv, tolerance, is_matching_sv)
+                if i is None:
+                    continue
+                truth_sv = truth_events[i]
+                total_matched += 1
+                if corrected_sv['svtype'] == truth_sv['svtype'] or \
+                   (corrected_sv['svtype'] == 'DUP' and truth_sv['svtype'] == 'INS'):
+                    correct_type += 1
+                out.write(f"{corrected_sv['line'].strip()}\t{truth_sv['line'].strip()}\n")
+                break
+    return total_matched, correct_type
+
+def write_log(log_file, total_matched, correct_type):
     accuracy = (correct_type / total_matched * 100) if total_matched > 0 else 0
     with open(log_file, 'w') as log:
         log.write(f"Total matched events: {total_matched}\n")
         log.write(f"Correctly typed events: {correct_type}\n")
         log.write(f"Accuracy: {accuracy:.2f}%\n")
 
+def parse_memory_budget(argv):
+    """Remove '--memory-budget SIZE' from argv; returns (remaining args, budget in bytes or None)"""
+    if '--memory-budget' not in argv:
+        return argv, None
+    i = argv.index('--memory-budget')
+    try:
+        budget = parse_size(argv[i + 1])
+    except (IndexError, ValueError):
+        print("Error: --memory-budget needs a size such as 2G or 500M", file=sys.stderr)
+        sys.exit(1)
+    return argv[:i] + argv[i + 2:], budget
+
+def main():
+    # Optional --memory-budget SIZE: truth beyond it is spilled to disk and paged per chromosome
+    args, memory_budget = parse_memory_budget(sys.argv[1:])
+    corrected_file = args[0]
+    truth_file1 = args[1]
+    truth_file2 = args[2]
+    output_file = args[3]
+    log_file = args[4]
+    
+    # Read both truth files into memory; the budget covers both, so the 1KG set spills first
+    with open(truth_file1) as f:
+        truth_events1 = load_truth_events(f, parse_truth1_sv_line, memory_budget)
+    if memory_budget is not None:
+        memory_budget = max(memory_budget - resident_bytes(truth_events1), 0)
+    with open(truth_file2) as f:
+        truth_events2 = load_truth_events(f, parse_truth2_sv_line, memory_budget)
+    
+    # Index truth events so each call only checks truth SVs inside its window
+    truth_sets = [(truth_events1, index_truth(truth_events1)), (truth_events2, index_truth(truth_events2))]
+    
+    # Process corrected file
+    with open(corrected_file) as f:
+        total_matched, correct_type = compare_two_truth(parse_calls(f), truth_sets, output_file)
+    
+    # Write statistics to log file
+    write_log(log_file, total_matched, correct_type)
+
 if __name__ == "__main__":
     main()
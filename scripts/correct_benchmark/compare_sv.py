@@ -1,5 +1,19 @@
+import os
 import sys
 import re
+import json
+import argparse
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.breakends import fill_mate_from_alt
+from octopusv_bench.truth_store import add_memory_budget_argument, budgeted_events, index_truth
+from octopusv_bench.instrument import Instrumentation, add_profile_argument
+from octopusv_bench.telemetry import Telemetry, add_telemetry_arguments
+
+SV_TYPES = ['TRA', 'INV', 'DUP', 'INS', 'DEL']
+DEFAULT_TOLERANCE = 50
+TRA_TOLERANCE = 5000
 
 def parse_sv_line(line):
     parts = line.strip().split('\t')
@@ -32,8 +46,8 @@ def is_matching_sv(corrected, truth, tolerance):
     if corrected['svtype'] == 'TRA' and truth['svtype'] == 'TRA':
         if corrected['chr2'] != truth['chr2']:
             return False
-        # Check both breakpoints within TRA tolerance
-        if abs(corrected['end'] - truth['end']) > 5000:
+        # Check both breakpoints within TRA tolerance (TRA calls are matched with --tra-tolerance)
+        if abs(corrected['end'] - truth['end']) > tolerance:
             return False
         return True
     
@@ -46,52 +60,274 @@ def is_matching_sv(corrected, truth, tolerance):
         
     return False
 
-def main():
-    corrected_file = sys.argv[1]
-    truth_file = sys.argv[2]
-    output_file = sys.argv[3]
-    log_file = sys.argv[4]
-    
-    # Read truth file into memory
-    truth_events = []
-    with open(truth_file) as f:
-        for line in f:
-            if line.startswith('#'):
-                continue
-            truth_events.append(parse_sv_line(line))
-    
-    matches = []
-    correct_type = 0
-    total_matched = 0
-    
-    # Process corrected file
-    with open(corrected_file) as f, open(output_file, 'w') as out:
+def is_correct_type(corrected, truth):
+    """Check whether the corrected SV type agrees with the truth SV type"""
+    return corrected['svtype'] == truth['svtype'] or \
+        (corrected['svtype'] == 'DUP' and truth['svtype'] == 'INS')
+
+def match_distance(corrected, truth):
+    """Breakpoint distance used to rank competing matches"""
+    distance = abs(corrected['pos'] - truth['pos'])
+    if corrected['svtype'] == 'TRA' and truth['svtype'] == 'TRA':
+        distance += abs(corrected['end'] - truth['end'])
+    return distance
+
+def one_to_one_matches(corrected_events, truth_events, truth_index, window):
+    """
+    Pair corrected SVs and truth SVs so that each is used at most once
+
+    Candidate pairs are collected per chromosome from the truth index and
+    accepted closest-first, so a truth SV claimed by several corrected calls
+    goes to the nearest one. Ties fall back to file order.
+
+    Returns:
+        list: Index into truth_events (or None) for every corrected event
+    """
+    candidates = defaultdict(list)
+    for c, corrected_sv in enumerate(corrected_events):
+        tolerance = window_tolerance(window, corrected_sv)
+        for i in truth_index.candidates(corrected_sv, tolerance):
+            truth_sv = truth_events[i]
+            if is_matching_sv(corrected_sv, truth_sv, tolerance):
+                candidates[corrected_sv['chrom']].append((match_distance(corrected_sv, truth_sv), c, i))
+
+    assignment = [None] * len(corrected_events)
+    used_truth = set()
+    for chrom_candidates in candidates.values():
+        chrom_candidates.sort()
+        for _, c, i in chrom_candidates:
+            if assignment[c] is None and i not in used_truth:
+                assignment[c] = i
+                used_truth.add(i)
+    return assignment
+
+def svtype_key(svtype):
+    return svtype if svtype else 'NA'
+
+def new_window_stats(tolerance, tra_tolerance):
+    return {
+        'tolerance': tolerance,
+        'tra_tolerance': tra_tolerance,
+        'calls': defaultdict(int),
+        'matched': defaultdict(int),
+        'correct_type': defaultdict(int),
+        'truth_hit': set()
+    }
+
+def window_tolerance(window, sv):
+    return window['tra_tolerance'] if sv['svtype'] == 'TRA' else window['tolerance']
+
+def tally_match(window, corrected_sv, truth_sv, truth_idx):
+    """Count one corrected SV and its matched truth SV (None if unmatched)"""
+    svtype = svtype_key(corrected_sv['svtype'])
+    window['calls'][svtype] += 1
+    if truth_sv is None:
+        return
+    window['matched'][svtype] += 1
+    window['truth_hit'].add(truth_idx)
+    if is_correct_type(corrected_sv, truth_sv):
+        window['correct_type'][svtype] += 1
+
+def summarize_counts(calls, matched, correct_type, truth_total, truth_hit):
+    return {
+        'calls': calls,
+        'matched': matched,
+        'correct_type': correct_type,
+        'accuracy': round(correct_type / matched * 100, 2) if matched > 0 else 0,
+        'unmatched_calls': calls - matched,
+        'truth_total': truth_total,
+        'truth_hit': truth_hit,
+        'truth_recall': round(truth_hit / truth_total * 100, 2) if truth_total > 0 else 0
+    }
+
+def summarize_window(window, truth_events):
+    """Turn raw per-window counters into overall and per-SVTYPE metrics"""
+    truth_total = defaultdict(int)
+    for sv in truth_events:
+        truth_total[svtype_key(sv['svtype'])] += 1
+    truth_hit = defaultdict(int)
+    for i in window['truth_hit']:
+        truth_hit[svtype_key(truth_events[i]['svtype'])] += 1
+
+    svtypes = SV_TYPES + sorted((set(window['calls']) | set(truth_total)) - set(SV_TYPES))
+    by_svtype = {}
+    for svtype in svtypes:
+        by_svtype[svtype] = summarize_counts(
+            window['calls'][svtype], window['matched'][svtype], window['correct_type'][svtype],
+            truth_total[svtype], truth_hit[svtype])
+
+    summary = {'tolerance': window['tolerance'], 'tra_tolerance': window['tra_tolerance']}
+    summary.update(summarize_counts(
+        sum(window['calls'].values()), sum(window['matched'].values()),
+        sum(window['correct_type'].values()), len(truth_events), len(window['truth_hit'])))
+    summary['by_svtype'] = by_svtype
+    return summary
+
+def write_metrics_tsv(path, windows):
+    columns = ['calls', 'matched', 'correct_type', 'accuracy', 'unmatched_calls',
+               'truth_total', 'truth_hit', 'truth_recall']
+    with open(path, 'w') as out:
+        out.write('\t'.join(['tolerance', 'tra_tolerance', 'mode', 'svtype'] + columns) + '\n')
+        for window in windows:
+            modes = [('greedy', window)]
+            if 'one_to_one' in window:
+                modes.append(('one_to_one', window['one_to_one']))
+            for mode, summary in modes:
+                rows = [('ALL', summary)] + list(summary['by_svtype'].items())
+                for svtype, counts in rows:
+                    values = [window['tolerance'], window['tra_tolerance'], mode, svtype] + \
+                        [counts[c] for c in columns]
+                    out.write('\t'.join(str(v) for v in values) + '\n')
+
+def load_truth_events(lines, memory_budget=None):
+    """
+    Parse truth VCF lines ('#' lines are skipped), filling in mate positions from the ALT
+
+    Returns a list, or SpilledEvents when the events exceed memory_budget bytes.
+    """
+    events = (fill_mate_from_alt(parse_sv_line(line)) for line in lines if not line.startswith('#'))
+    return budgeted_events(events, memory_budget)
+
+def parse_calls(lines):
+    """Parse the data lines of a corrected SVCF/VCF"""
+    for line in lines:
+        if not line.startswith('#'):
+            yield parse_sv_line(line)
+
+def compare_calls(corrected_svs, truth_events, truth_index, output_file, tolerances=(DEFAULT_TOLERANCE,),
+                  tra_tolerance=TRA_TOLERANCE, one_to_one=False, inst=None):
+    """
+    Match parsed corrected SVs (see parse_calls) against the indexed truth SVs
+
+    The matched pairs of the first tolerance are written to output_file, and
+    progress goes to the Telemetry of inst, if it has one.
+
+    Returns:
+        tuple: (number of corrected records, one summary per tolerance)
+    """
+    inst = inst or Instrumentation('compare_sv.py')
+    telemetry = inst.telemetry
+    windows = [new_window_stats(tolerance, tra_tolerance) for tolerance in tolerances]
+    corrected_records = 0
+    corrected_events = []
+
+    # Process corrected records
+    with inst.phase('match') as phase, open(output_file, 'w') as out:
         # Write header
         out.write("corrected_SVCF\tground_truth\n")
-        
-        for line in f:
-            if line.startswith('#'):
-                continue
-                
-            corrected_sv = parse_sv_line(line)
-            tolerance = 5000 if corrected_sv['svtype'] == 'TRA' else 50
-            
-            # Find matching event in truth
-            for truth_sv in truth_events:
-                if is_matching_sv(corrected_sv, truth_sv, tolerance):
-                    total_matched += 1
-                    if corrected_sv['svtype'] == truth_sv['svtype'] or \
-                       (corrected_sv['svtype'] == 'DUP' and truth_sv['svtype'] == 'INS'):
-                        correct_type += 1
+
+        for corrected_sv in corrected_svs:
+            corrected_records += 1
+            if telemetry is not None:
+                telemetry.advance(1, len(corrected_sv['line']))
+            if one_to_one:
+                corrected_events.append(corrected_sv)
+
+            # Find matching event in truth for every tolerance window
+            for n, window in enumerate(windows):
+                tolerance = window_tolerance(window, corrected_sv)
+                i = truth_index.first_match(corrected_sv, tolerance, is_matching_sv)
+                truth_sv = truth_events[i] if i is not None else None
+                tally_match(window, corrected_sv, truth_sv, i)
+                if n == 0 and truth_sv is not None:
                     out.write(f"{corrected_sv['line'].strip()}\t{truth_sv['line'].strip()}\n")
-                    break
-    
-    # Write statistics to log file
+        phase['records'] += corrected_records
+
+    summaries = [summarize_window(window, truth_events) for window in windows]
+
+    if one_to_one:
+        with inst.phase('one_to_one') as phase:
+            for window, summary in zip(windows, summaries):
+                window_one_to_one = new_window_stats(window['tolerance'], window['tra_tolerance'])
+                assignment = one_to_one_matches(corrected_events, truth_events, truth_index, window)
+                for corrected_sv, i in zip(corrected_events, assignment):
+                    tally_match(window_one_to_one, corrected_sv, truth_events[i] if i is not None else None, i)
+                summary['one_to_one'] = summarize_window(window_one_to_one, truth_events)
+            phase['records'] += corrected_records * len(windows)
+
+    return corrected_records, summaries
+
+def write_log(log_file, summary):
+    """Write the matched/correct-type statistics of one tolerance window"""
+    total_matched = summary['matched']
+    correct_type = summary['correct_type']
     accuracy = (correct_type / total_matched * 100) if total_matched > 0 else 0
     with open(log_file, 'w') as log:
         log.write(f"Total matched events: {total_matched}\n")
         log.write(f"Correctly typed events: {correct_type}\n")
         log.write(f"Accuracy: {accuracy:.2f}%\n")
+        if 'one_to_one' in summary:
+            one_to_one = summary['one_to_one']
+            log.write(f"One-to-one matched events: {one_to_one['matched']}\n")
+            log.write(f"One-to-one correctly typed events: {one_to_one['correct_type']}\n")
+            log.write(f"One-to-one accuracy: {one_to_one['accuracy']:.2f}%\n")
+
+def write_metrics_json(path, corrected_file, truth_file, corrected_records, truth_records, summaries, timings):
+    metrics = {
+        'corrected_file': corrected_file,
+        'truth_file': truth_file,
+        'corrected_records': corrected_records,
+        'truth_records': truth_records,
+        'windows': summaries,
+        'timings': timings
+    }
+    with open(path, 'w') as f:
+        json.dump(metrics, f, indent=2)
+
+def write_outputs(args, corrected_records, truth_records, summaries, inst):
+    """Write the log and the optional metrics files requested on the command line"""
+    with inst.phase('write'):
+        write_log(args.log_file, summaries[0])
+        if args.metrics_json:
+            write_metrics_json(args.metrics_json, args.corrected_file, args.truth_file, corrected_records,
+                               truth_records, summaries, inst.timings())
+        if args.metrics_tsv:
+            write_metrics_tsv(args.metrics_tsv, summaries)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare octopusv corrected SVs against a VISOR truth VCF.")
+    parser.add_argument("corrected_file", help="Corrected SVCF file")
+    parser.add_argument("truth_file", help="Truth VCF file")
+    parser.add_argument("output_file", help="Matched pairs output file")
+    parser.add_argument("log_file", help="Statistics log file")
+    parser.add_argument("--tolerance", type=int, nargs='+', default=[DEFAULT_TOLERANCE],
+                        help="Position tolerance(s) for non-TRA events; the first one is used for "
+                             "the matches file and log (default: 50)")
+    parser.add_argument("--tra-tolerance", type=int, default=TRA_TOLERANCE,
+                        help="Position tolerance for TRA events (default: 5000)")
+    parser.add_argument("--one-to-one", action="store_true",
+                        help="Also report one-to-one matching, where each truth SV is claimed by at most "
+                             "one corrected SV (closest first)")
+    parser.add_argument("--metrics-json", help="Write per-SVTYPE/per-tolerance metrics and timings as JSON")
+    parser.add_argument("--metrics-tsv", help="Write per-SVTYPE/per-tolerance metrics as TSV")
+    add_memory_budget_argument(parser)
+    add_profile_argument(parser)
+    add_telemetry_arguments(parser)
+    return parser.parse_args(argv)
+
+def main():
+    args = parse_args()
+    with Telemetry.from_args('compare_sv', args) as telemetry:
+        telemetry.set_totals(bytes_read=os.path.getsize(args.corrected_file))
+        telemetry.set_files([args.corrected_file, args.truth_file], args.output_file)
+        inst = Instrumentation('compare_sv.py', args.profile, telemetry)
+
+        # Read truth file into memory
+        with inst.phase('load') as phase, open(args.truth_file) as f:
+            truth_events = load_truth_events(f, args.memory_budget)
+            phase['records'] = len(truth_events)
+
+        with inst.phase('index') as phase:
+            truth_index = index_truth(truth_events, args.tra_tolerance)
+            phase['records'] = len(truth_events)
+
+        with open(args.corrected_file) as f:
+            corrected_records, summaries = compare_calls(parse_calls(f), truth_events, truth_index, args.output_file,
+                                                         args.tolerance, args.tra_tolerance, args.one_to_one, inst)
+
+        # Write statistics to log file
+        write_outputs(args, corrected_records, len(truth_events), summaries, inst)
+    inst.finish(args.output_file)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import gzip
+import argparse
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.breakends import parse_info, parse_breakend_record, pair_breakends
+
+PAIR_INDEX_COLUMNS = ['record', 'event', 'id', 'chrom', 'pos', 'mate_chrom', 'mate_pos',
+                      'orientation', 'sv_class', 'mate_record']
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Extract and classify BND records from raw caller VCFs.")
+    parser.add_argument("--input-dir", required=True, help="Directory with raw caller VCFs (<caller>.vcf[.gz])")
+    parser.add_argument("--output-dir", required=True, help="Directory for <caller>_bnd.vcf and <caller>_bnd_pairs.tsv")
+    parser.add_argument("--callers", nargs='+', required=True, help="Caller names to process")
+    parser.add_argument("-t", "--threads", type=int, default=None,
+                        help="Number of callers processed in parallel (default: one per caller)")
+    return parser.parse_args()
+
+def find_input_vcf(input_dir, caller):
+    for suffix in ('.vcf', '.vcf.gz'):
+        path = os.path.join(input_dir, caller + suffix)
+        if os.path.exists(path):
+            return path
+    return None
+
+def write_pair_index(path, breakends, mates):
+    """Write one row per breakend with its event number and paired record"""
+    event_of = {}
+    next_event = 0
+    with open(path, 'w') as out:
+        out.write('\t'.join(PAIR_INDEX_COLUMNS) + '\n')
+        for i, bnd in enumerate(breakends):
+            mate = mates[i]
+            if i in event_of:
+                event = event_of[i]
+            else:
+                event = next_event
+                next_event += 1
+                if mate is not None:
+                    event_of[mate] = event
+            row = [i, event, bnd['id'], bnd['chrom'], bnd['pos'], bnd['mate_chrom'] or '.',
+                   bnd['mate_pos'] if bnd['mate_pos'] is not None else '.',
+                   bnd['orientation'], bnd['sv_class'], mate if mate is not None else '.']
+            out.write('\t'.join(str(v) for v in row) + '\n')
+
+def extract_caller(input_vcf, output_vcf, pair_index):
+    """
+    Stream one raw VCF, keeping the header and every breakend record
+
+    Returns:
+        dict: Per-caller counts (total records, breakends, paired, by class)
+    """
+    stats = defaultdict(int)
+    breakends = []
+    opener = gzip.open if input_vcf.endswith('.gz') else open
+    with opener(input_vcf, 'rt') as infile, open(output_vcf, 'w') as out:
+        for line in infile:
+            if line.startswith('#'):
+                out.write(line)
+                continue
+            stats['total'] += 1
+            fields = line.rstrip('\n').split('\t')
+            if len(fields) < 8:
+                continue
+            bnd = parse_breakend_record(fields, parse_info(fields[7]))
+            if bnd is None:
+                continue
+            out.write(line)
+            breakends.append(bnd)
+            stats[f"class_{bnd['sv_class']}"] += 1
+
+    mates = pair_breakends(breakends)
+    write_pair_index(pair_index, breakends, mates)
+    stats['bnd'] = len(breakends)
+    stats['paired'] = sum(1 for m in mates if m is not None)
+    return dict(stats)
+
+def run_caller(job):
+    caller, input_vcf, output_vcf, pair_index = job
+    return caller, extract_caller(input_vcf, output_vcf, pair_index)
+
+def main():
+    args = parse_args()
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    jobs = []
+    for caller in args.callers:
+        input_vcf = find_input_vcf(args.input_dir, caller)
+        if input_vcf is None:
+            print(f"Warning: no VCF found for {caller} in {args.input_dir}", file=sys.stderr)
+            continue
+        jobs.append((caller, input_vcf,
+                     os.path.join(args.output_dir, f"{caller}_bnd.vcf"),
+                     os.path.join(args.output_dir, f"{caller}_bnd_pairs.tsv")))
+    if not jobs:
+        sys.exit(1)
+
+    threads = args.threads or len(jobs)
+    with ProcessPoolExecutor(max_workers=min(threads, len(jobs))) as pool:
+        for caller, stats in pool.map(run_caller, jobs):
+            classes = ', '.join(f"{k.replace('class_', '')}={v}"
+                                for k, v in sorted(stats.items()) if k.startswith('class_'))
+            print(f"Processed {caller}: {stats.get('bnd', 0)} BND records out of {stats.get('total', 0)}, "
+                  f"{stats.get('paired', 0)} paired ({classes or 'none'})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+#!/bin/bash
+
+WORKDIR="/projects/b1171/qgn1237/6_SV_VCF_merger/20241202_octopusv_merge_benchmark"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+# Write one canonical copy of every caller VCF (sorted, BGZF + tabix, unique
+# IDs, consistent contig names, valid SVLEN/END) to <dataset>/normalized_vcf.
+# All merger scripts read from there. Copies are cached by input hash, so
+# re-running only rebuilds callers whose raw VCF changed.
+normalize_dataset() {
+    local dataset=$1
+    local genome
+
+    # NA12878 is called against GRCh37, the VISOR simulations against GRCh38
+    if [[ $dataset == NA12878* ]]; then
+        genome=37
+    else
+        genome=38
+    fi
+
+    echo "Normalizing caller VCFs for $dataset"
+    python3 "${SCRIPT_DIR}/normalize_caller_vcfs.py" \
+        --input-dir "$WORKDIR/$dataset/input_vcf" \
+        --output-dir "$WORKDIR/$dataset/normalized_vcf" \
+        -g "$genome"
+}
+
+for dataset in "visor_ngs" "visor_ont" "visor_pacbio" "NA12878_ngs" "NA12878_pacbio"; do
+    normalize_dataset "$dataset"
+done
+
+echo "All caller VCFs normalized"
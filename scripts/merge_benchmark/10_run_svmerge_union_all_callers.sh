@@ -3,39 +3,15 @@
 WORKDIR="/projects/b1171/qgn1237/6_SV_VCF_merger/20241202_octopusv_merge_benchmark"
 GRCH38_REF="/projects/b1171/qgn1237/1_my_database/GRCh38_p13/GRCh38.p13.genome.fa"
 GRCH37_REF="/projects/b1171/qgn1237/1_my_database/GRCh37_hs37d5/hs37d5.fa"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
-# Function to preprocess svdss.vcf to handle duplicate IDs
-preprocess_svdss() {
-    local input_vcf=$1
-    local output_vcf="${input_vcf%.vcf}.unique.vcf"
-    local counter=1
-
-    # Create temp directory if it doesn't exist
-    mkdir -p "$(dirname $input_vcf)/temp"
-
-    echo "Preprocessing svdss.vcf to handle duplicate IDs"
-
-    # Process VCF file: add unique counter to duplicate IDs
-    awk '
-    BEGIN {counter = 1}
-    /^#/ {print; next}
-    {
-        if ($3 in seen) {
-            $3 = $3 "_" counter
-            counter++
-        }
-        seen[$3] = 1
-        print
-    }' OFS="\t" "$input_vcf" > "$output_vcf"
-
-    echo "$output_vcf"
-}
+source "${SCRIPT_DIR}/profile_lib.sh"
 
 # Function to create file of files (fof) for SVmerge
 create_fof() {
     local dataset=$1
     local fof_file=$2
-    local input_dir="$WORKDIR/$dataset/input_vcf"
+    local input_dir="$WORKDIR/$dataset/normalized_vcf"
     
     # Clear existing file if it exists
     > "$fof_file"
@@ -52,11 +28,8 @@ create_fof() {
         echo "$input_dir/debreak.vcf" >> "$fof_file"
         echo "$input_dir/pbsv.vcf" >> "$fof_file"
         echo "$input_dir/sniffles.vcf" >> "$fof_file"
-        
-        # Special handling for svdss.vcf
-        local processed_svdss=$(preprocess_svdss "$input_dir/svdss.vcf")
-        echo "$processed_svdss" >> "$fof_file"
-        
+        # IDs are already unique in the normalized copies
+        echo "$input_dir/svdss.vcf" >> "$fof_file"
         echo "$input_dir/svim.vcf" >> "$fof_file"
     fi
 }
@@ -81,22 +54,12 @@ run_svmerge() {
     mkdir -p "$output_dir"
     
     # Run SVmerge
-    SVmerge \
+    profile svmerge "$output_dir/merged_union" "$dataset" union $(cat "$fof_file") -- SVmerge \
         --ref "$ref_genome" \
         --fof "$fof_file" \
         --prefix "$output_dir/merged_union"
 }
 
-# Function to cleanup temporary files
-cleanup() {
-    local dataset=$1
-    local input_dir="$WORKDIR/$dataset/input_vcf"
-    
-    echo "Cleaning up temporary files for $dataset"
-    rm -f "$input_dir/temp"/*.unique.vcf
-    rmdir "$input_dir/temp" 2>/dev/null || true
-}
-
 # Process each dataset
 process_dataset() {
     local dataset=$1
@@ -112,7 +75,6 @@ process_dataset() {
     
     # Clean up
     rm "$temp_fof"
-    cleanup "$dataset"
 }
 
 # Process all datasets
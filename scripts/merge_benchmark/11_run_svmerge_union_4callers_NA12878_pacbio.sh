@@ -2,10 +2,13 @@
 
 WORKDIR="/projects/b1171/qgn1237/6_SV_VCF_merger/20241202_octopusv_merge_benchmark"
 GRCH37_REF="/projects/b1171/qgn1237/1_my_database/GRCh37_hs37d5/hs37d5.fa"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+source "${SCRIPT_DIR}/profile_lib.sh"
 
 # Create file of files (fof) for SVmerge
 create_fof() {
-    local input_dir="$WORKDIR/NA12878_pacbio/input_vcf"
+    local input_dir="$WORKDIR/NA12878_pacbio/normalized_vcf"
     local fof_file="$WORKDIR/NA12878_pacbio/svmerge_4callers_files.txt"
     
     # Clear existing file if it exists
@@ -31,7 +34,7 @@ run_svmerge() {
     mkdir -p "$output_dir"
     
     # Run SVmerge
-    SVmerge \
+    profile svmerge_4callers "$output_dir/merged_union" NA12878_pacbio union $(cat "$fof_file") -- SVmerge \
         --ref "$GRCH37_REF" \
         --fof "$fof_file" \
         --prefix "$output_dir/merged_union"
@@ -22,7 +22,9 @@
 MAMBA_PATH="/home/qgn1237/2_software/mambaforge/condabin/mamba"
 
 BASE_DIR="/projects/b1171/qgn1237/6_SV_VCF_merger/20241202_octopusv_merge_benchmark"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 NA12878_DIR="${BASE_DIR}/NA12878_ngs"
+DATASET="$(basename "${NA12878_DIR}")"
 TRUTH_VCF="/projects/b1171/qgn1237/6_SV_VCF_merger/20241113_octopusv_final_benchmarking/NA12878_truth_data/fixed_merged_na12878_1kg_sorted.vcf.gz"
 REF_GENOME="/projects/b1171/qgn1237/1_my_database/GRCh37_hs37d5/hs37d5.fa"
 
@@ -45,7 +47,8 @@ process_vcf() {
     echo "Processing ${tool_name} ${analysis_type}: ${base_name}"
 
     # Run VCF_savior.py in mamba666 environment
-    "${MAMBA_PATH}" run -n "${MAMBA666_ENV}" python "${BASE_DIR}/VCF_savior.py" -i "${input_vcf}" -o "${output_dir}/${base_name}_fixed.vcf" -g 37
+    "${MAMBA_PATH}" run -n "${MAMBA666_ENV}" python "${SCRIPT_DIR}/VCF_savior.py" -i "${input_vcf}" -o "${output_dir}/${base_name}_fixed.vcf" -g 37 \
+        --telemetry-label dataset="${DATASET}" --telemetry-label tool="${tool_name}" --telemetry-label analysis="${analysis_type}"
 
     # Check and remove existing evaluation directory if it exists
     eval_dir="${output_dir}/${base_name}_evaluation"
@@ -55,8 +58,12 @@ process_vcf() {
         rip "${eval_dir}"
     fi
 
-    # Run truvari in truvari environment
-    "${MAMBA_PATH}" run -n "${TRUVARI_ENV}" truvari bench \
+    # Run truvari in truvari environment, recording its resources next to the evaluation directory
+    python3 "${SCRIPT_DIR}/profile_command.py" -o "${eval_dir}" \
+        --task truvari_bench --input "${TRUTH_VCF}" --input "${output_dir}/${base_name}_fixed_sorted.vcf.gz" \
+        --telemetry-label dataset="${DATASET}" \
+        --telemetry-label tool="${tool_name}" --telemetry-label analysis="${analysis_type}" -- \
+        "${MAMBA_PATH}" run -n "${TRUVARI_ENV}" truvari bench \
         -b "${TRUTH_VCF}" \
         -c "${output_dir}/${base_name}_fixed_sorted.vcf.gz" \
         -f "${REF_GENOME}" \
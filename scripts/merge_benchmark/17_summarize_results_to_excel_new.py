@@ -2,10 +2,21 @@
 # -*- coding: utf-8 -*-
 
 import os
+import sys
+import glob
 import json
 import pandas as pd
 from pathlib import Path
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.instrument import Instrumentation
+
+# Five main dataset directories
+DATASETS = ['NA12878_ngs', 'NA12878_pacbio', 'visor_ngs', 'visor_ont', 'visor_pacbio']
+
+# Columns copied from the <output>.resources.json records written by profile_command.py
+RESOURCE_COLUMNS = ['wall_seconds', 'user_seconds', 'system_seconds', 'peak_rss_mb', 'read_bytes', 'write_bytes']
+
 def read_summary_json(file_path):
     """Read summary.json file and extract key metrics"""
     try:
@@ -24,17 +35,77 @@ def read_summary_json(file_path):
             'f1': 'NA'
         }
 
+def read_resources_json(file_path):
+    """Read a profile_command.py record and extract the resource figures"""
+    try:
+        with open(file_path, 'r') as f:
+            data = json.load(f)
+            return {column: data.get(column, 'NA') for column in RESOURCE_COLUMNS}
+    except Exception as e:
+        print(f"Error reading {file_path}: {e}")
+        return {column: 'NA' for column in RESOURCE_COLUMNS}
+
+def resource_analysis_type(file_path, analysis_dir):
+    """merged_min2.vcf.resources.json -> min2; union and intersection keep their directory name"""
+    name = os.path.basename(file_path)[:-len('.resources.json')].split('.')[0]
+    if analysis_dir == 'support_threshold':
+        return name.replace('merged_', '')
+    return analysis_dir
+
+def collect_performance(base_path, datasets):
+    """
+    Collect merge and truvari bench resource records
+
+    Merge records sit next to the merged callsets
+    (<dataset>/<analysis>/<tool>/merged_*.resources.json), bench records next
+    to the evaluation directories (*_evaluation.resources.json).
+    """
+    records = []
+    for dataset in datasets:
+        for analysis_dir in ['support_threshold', 'intersection', 'union']:
+            pattern = os.path.join(base_path, dataset, analysis_dir, '*', '*.resources.json')
+            for file_path in sorted(glob.glob(pattern)):
+                records.append({
+                    'dataset': dataset,
+                    'tool': os.path.basename(os.path.dirname(file_path)),
+                    'analysis_type': resource_analysis_type(file_path, analysis_dir),
+                    'step': 'merge',
+                    **read_resources_json(file_path)
+                })
+
+        evaluation_path = os.path.join(base_path, dataset, 'evaluation')
+        pattern = os.path.join(evaluation_path, '**', '*_evaluation.resources.json')
+        for file_path in sorted(glob.glob(pattern, recursive=True)):
+            parts = os.path.relpath(os.path.dirname(file_path), evaluation_path).split(os.sep)
+            records.append({
+                'dataset': dataset,
+                'tool': parts[0],
+                # <tool>/support_threshold/min2 or <tool>/<union|intersection>
+                'analysis_type': parts[-1],
+                'step': 'bench',
+                **read_resources_json(file_path)
+            })
+    return records
+
+def performance_sheet(df, performance):
+    """One row per dataset/tool/analysis with merge and bench resources next to precision/recall/F1"""
+    perf = pd.DataFrame(performance)
+    keys = ['dataset', 'tool', 'analysis_type']
+    sheet = df[keys + ['precision', 'recall', 'f1']] if not df.empty else pd.DataFrame(columns=keys)
+    for step in ['merge', 'bench']:
+        step_df = perf[perf['step'] == step].drop(columns='step')
+        step_df = step_df.rename(columns={column: f"{step}_{column}" for column in RESOURCE_COLUMNS})
+        sheet = sheet.merge(step_df, on=keys, how='outer')
+    return sheet.sort_values(keys).fillna('NA')
+
 def process_directory(base_path):
     """Process directory structure and collect all results"""
     results = []
     
-    # Five main dataset directories
-    datasets = ['NA12878_ngs', 'NA12878_pacbio', 'visor_ngs', 'visor_ont', 'visor_pacbio']
-    
     # Datasets that include combisv_4callers analysis
     combisv_datasets = ['NA12878_pacbio', 'visor_ont', 'visor_pacbio']
     
-    for dataset in datasets:
+    for dataset in DATASETS:
         evaluation_path = os.path.join(base_path, dataset, 'evaluation')
         if not os.path.exists(evaluation_path):
             print(f"Warning: {evaluation_path} does not exist")
@@ -105,11 +176,17 @@ def process_directory(base_path):
     return results
 
 def main():
+    # --profile writes benchmark_results_summary.xlsx.timing.json and .pstats
+    inst = Instrumentation('17_summarize_results_to_excel_new.py', '--profile' in sys.argv[1:])
+
     # Base path for the benchmark results
     base_path = '/projects/b1171/qgn1237/6_SV_VCF_merger/20241202_octopusv_merge_benchmark'
     
     # Collect all results
-    results = process_directory(base_path)
+    with inst.phase('load') as phase:
+        results = process_directory(base_path)
+        performance = collect_performance(base_path, DATASETS)
+        phase['records'] = len(results) + len(performance)
     
     # Convert to DataFrame
     df = pd.DataFrame(results)
@@ -122,30 +199,37 @@ def main():
     
     # Create Excel writer object
     output_file = 'benchmark_results_summary.xlsx'
-    writer = pd.ExcelWriter(output_file, engine='openpyxl')
-    
-    # Create separate sheet for each dataset
-    for dataset in df['dataset'].unique():
-        dataset_df = df[df['dataset'] == dataset]
-        dataset_df.to_excel(
-            writer, 
-            sheet_name=dataset,
+    with inst.phase('write') as phase:
+        writer = pd.ExcelWriter(output_file, engine='openpyxl')
+        
+        # Create separate sheet for each dataset
+        for dataset in df['dataset'].unique():
+            dataset_df = df[df['dataset'] == dataset]
+            dataset_df.to_excel(
+                writer, 
+                sheet_name=dataset,
+                index=False,
+                columns=['tool', 'analysis_type', 'precision', 'recall', 'f1']
+            )
+        
+        # Create performance sheet from the profile_command.py records
+        if performance:
+            performance_sheet(df, performance).to_excel(writer, sheet_name='Performance', index=False)
+
+        # Create overview sheet
+        df.to_excel(
+            writer,
+            sheet_name='Overview',
             index=False,
-            columns=['tool', 'analysis_type', 'precision', 'recall', 'f1']
+            columns=['dataset', 'tool', 'analysis_type', 'precision', 'recall', 'f1']
         )
-    
-    # Create overview sheet
-    df.to_excel(
-        writer,
-        sheet_name='Overview',
-        index=False,
-        columns=['dataset', 'tool', 'analysis_type', 'precision', 'recall', 'f1']
-    )
-    
-    # Save Excel file
-    writer.close()
+        
+        # Save Excel file
+        writer.close()
+        phase['records'] = len(df)
     
     print(f"Results have been saved to {output_file}")
+    inst.finish(output_file)
 
 if __name__ == "__main__":
     main()
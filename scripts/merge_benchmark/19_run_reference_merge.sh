@@ -0,0 +1,57 @@
+#!/bin/bash
+
+WORKDIR="/projects/b1171/qgn1237/6_SV_VCF_merger/20241202_octopusv_merge_benchmark"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+source "${SCRIPT_DIR}/profile_lib.sh"
+
+# Same settings as the SURVIVOR runs: 1000 bp, type and strand must agree, min size 30
+run_reference_merge() {
+    local dataset=$1
+    local min_support=$2
+    local output_file=$3
+    local analysis=$4
+    local input_dir="$WORKDIR/$dataset/normalized_vcf"
+
+    mkdir -p "$(dirname "$output_file")"
+    profile reference "$output_file" "$dataset" "$analysis" "$input_dir"/*.vcf -- \
+        python3 "${SCRIPT_DIR}/reference_merge.py" \
+        -i "$input_dir"/*.vcf \
+        -o "$output_file" \
+        --max-dist 1000 \
+        --min-support "$min_support" \
+        --min-size 30
+}
+
+# Process each dataset
+process_dataset() {
+    local dataset=$1
+    local num_callers=$2
+
+    echo "Processing $dataset with $num_callers callers"
+
+    for support in $(seq 2 $((num_callers - 1))); do
+        run_reference_merge "$dataset" "$support" \
+            "$WORKDIR/$dataset/support_threshold/reference/merged_min${support}.vcf" "min${support}"
+    done
+
+    # Intersection analysis (all callers must support)
+    run_reference_merge "$dataset" "$num_callers" \
+        "$WORKDIR/$dataset/intersection/reference/merged_intersection.vcf" intersection
+
+    # Union analysis (at least 1 caller must support)
+    run_reference_merge "$dataset" 1 \
+        "$WORKDIR/$dataset/union/reference/merged_union.vcf" union
+}
+
+# Process NGS datasets (4 callers)
+for dataset in "visor_ngs" "NA12878_ngs"; do
+    process_dataset "$dataset" 4
+done
+
+# Process long-read datasets (6 callers)
+for dataset in "visor_ont" "visor_pacbio" "NA12878_pacbio"; do
+    process_dataset "$dataset" 6
+done
+
+echo "All reference merge analyses completed"
@@ -1,5 +1,12 @@
 #!/usr/bin/env python3
 
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.instrument import Instrumentation
+from octopusv_bench.telemetry import Telemetry
+
 def parse_vcf(vcf_file):
     """解析VCF文件,返回变异列表"""
     variants = []
@@ -50,25 +57,35 @@ def is_overlapping(var1, var2, overlap_fraction=0.5):
     
     return False
 
-def find_unique_variants(survivor_vcf, octopus_vcf, output_vcf, overlap_fraction=0.5):
+def find_unique_variants(survivor_vcf, octopus_vcf, output_vcf, overlap_fraction=0.5, inst=None):
     """找出Survivor特有的变异"""
+    inst = inst or Instrumentation('1_extract_survivor_specific.py')
     # 解析两个VCF文件
-    survivor_vars = parse_vcf(survivor_vcf)
-    octopus_vars = parse_vcf(octopus_vcf)
+    with inst.phase('parse') as phase:
+        survivor_vars = parse_vcf(survivor_vcf)
+        octopus_vars = parse_vcf(octopus_vcf)
+        phase['records'] = len(survivor_vars) + len(octopus_vars)
     
     # 查找Survivor特有的变异
-    unique_variants = []
-    for sv_var in survivor_vars:
-        is_unique = True
-        for oct_var in octopus_vars:
-            if is_overlapping(sv_var, oct_var, overlap_fraction):
-                is_unique = False
-                break
-        if is_unique:
-            unique_variants.append(sv_var)
+    with inst.phase('match') as phase:
+        telemetry = inst.telemetry
+        if telemetry is not None:
+            telemetry.set_totals(records=len(survivor_vars))
+        unique_variants = []
+        for sv_var in survivor_vars:
+            if telemetry is not None:
+                telemetry.advance(1, len(sv_var['line']))
+            is_unique = True
+            for oct_var in octopus_vars:
+                if is_overlapping(sv_var, oct_var, overlap_fraction):
+                    is_unique = False
+                    break
+            if is_unique:
+                unique_variants.append(sv_var)
+        phase['records'] = len(survivor_vars)
     
     # 输出特有变异到新的VCF文件
-    with open(output_vcf, 'w') as f:
+    with inst.phase('write') as phase, open(output_vcf, 'w') as f:
         # 写入VCF头部信息
         f.write('##fileformat=VCFv4.2\n')
         f.write('##INFO=<ID=UNIQUE_TO,Number=1,Type=String,Description="Variant unique to this caller">\n')
@@ -77,20 +94,24 @@ def find_unique_variants(survivor_vcf, octopus_vcf, output_vcf, overlap_fraction
         # 写入变异
         for var in unique_variants:
             f.write(var['line'] + '\n')
+        phase['records'] = len(unique_variants)
     
     return unique_variants
 
 if __name__ == '__main__':
-    import sys
-    if len(sys.argv) != 4:
-        print("Usage: python script.py survivor.vcf octopus.vcf output.vcf")
+    # --profile 写出 <output>.timing.json 和 <output>.pstats
+    # 进度写入 $OCTOPUSV_BENCH_TEXTFILE_DIR (如已设置) 和终端
+    args = [arg for arg in sys.argv[1:] if arg != '--profile']
+    if len(args) != 3:
+        print("Usage: python script.py survivor.vcf octopus.vcf output.vcf [--profile]")
         sys.exit(1)
     
-    survivor_vcf = sys.argv[1]
-    octopus_vcf = sys.argv[2]
-    output_vcf = sys.argv[3]
-    
-    unique_vars = find_unique_variants(survivor_vcf, octopus_vcf, output_vcf)
+    survivor_vcf, octopus_vcf, output_vcf = args
+    with Telemetry('survivor_specific', {'output': os.path.basename(output_vcf)}) as telemetry:
+        telemetry.set_files([survivor_vcf, octopus_vcf], output_vcf)
+        inst = Instrumentation('1_extract_survivor_specific.py', '--profile' in sys.argv[1:], telemetry)
+        unique_vars = find_unique_variants(survivor_vcf, octopus_vcf, output_vcf, inst=inst)
+    inst.finish(output_vcf)
     print(f"找到 {len(unique_vars)} 个Survivor特有的变异")
     
     # 输出一些统计信息
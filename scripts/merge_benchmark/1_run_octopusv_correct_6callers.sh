@@ -8,8 +8,8 @@ process_directory() {
     local dir=$1
     echo "Processing directory: $dir"
     
-    # Enter input_vcf directory
-    cd "$dir/input_vcf"
+    # Enter the normalized caller VCF directory (see 0_normalize_caller_vcfs.sh)
+    cd "$dir/normalized_vcf"
     
     # Process each vcf file
     for vcf in *.vcf; do
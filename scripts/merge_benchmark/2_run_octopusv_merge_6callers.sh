@@ -1,16 +1,20 @@
 #!/bin/bash
 
 WORKDIR="/projects/b1171/qgn1237/6_SV_VCF_merger/20241202_octopusv_merge_benchmark"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+source "${SCRIPT_DIR}/profile_lib.sh"
 
 # Function to run merge with min support
 run_min_support() {
     local dataset=$1
     local min_support=$2
-    local input_dir="$WORKDIR/$dataset/input_vcf"
+    local input_dir="$WORKDIR/$dataset/normalized_vcf"
     local output_dir="$WORKDIR/$dataset/support_threshold/octopusv"
     
     echo "Running min support $min_support analysis for $dataset"
-    octopusv merge \
+    profile octopusv "$output_dir/merged_min${min_support}.svcf" "$dataset" "min${min_support}" \
+        $input_dir/*_corrected.svcf -- octopusv merge \
         $(ls $input_dir/*_corrected.svcf) \
         --min-support $min_support \
         --output-file "$output_dir/merged_min${min_support}.svcf"
@@ -19,11 +23,12 @@ run_min_support() {
 # Function to run intersection
 run_intersection() {
     local dataset=$1
-    local input_dir="$WORKDIR/$dataset/input_vcf"
+    local input_dir="$WORKDIR/$dataset/normalized_vcf"
     local output_dir="$WORKDIR/$dataset/intersection/octopusv"
     
     echo "Running intersection analysis for $dataset"
-    octopusv merge \
+    profile octopusv "$output_dir/merged_intersection.svcf" "$dataset" intersection \
+        $input_dir/*_corrected.svcf -- octopusv merge \
         $(ls $input_dir/*_corrected.svcf) \
         --intersect \
         --output-file "$output_dir/merged_intersection.svcf"
@@ -32,11 +37,12 @@ run_intersection() {
 # Function to run union
 run_union() {
     local dataset=$1
-    local input_dir="$WORKDIR/$dataset/input_vcf"
+    local input_dir="$WORKDIR/$dataset/normalized_vcf"
     local output_dir="$WORKDIR/$dataset/union/octopusv"
     
     echo "Running union analysis for $dataset"
-    octopusv merge \
+    profile octopusv "$output_dir/merged_union.svcf" "$dataset" union \
+        $input_dir/*_corrected.svcf -- octopusv merge \
         $(ls $input_dir/*_corrected.svcf) \
         --union \
         --output-file "$output_dir/merged_union.svcf"
@@ -1,12 +1,15 @@
 #!/bin/bash
 
 WORKDIR="/projects/b1171/qgn1237/6_SV_VCF_merger/20241202_octopusv_merge_benchmark"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+source "${SCRIPT_DIR}/profile_lib.sh"
 
 # Function to create file list for SURVIVOR
 create_file_list() {
     local dataset=$1
     local list_file=$2
-    local input_dir="$WORKDIR/$dataset/input_vcf"
+    local input_dir="$WORKDIR/$dataset/normalized_vcf"
     
     # Clear existing file if it exists
     > "$list_file"
@@ -22,8 +25,10 @@ run_survivor_merge() {
     local list_file=$1
     local min_support=$2
     local output_file=$3
+    local dataset=$4
+    local analysis=$5
     
-    SURVIVOR merge "$list_file" 1000 "$min_support" 1 1 0 30 "$output_file"
+    profile survivor "$output_file" "$dataset" "$analysis" $(cat "$list_file") -- SURVIVOR merge "$list_file" 1000 "$min_support" 1 1 0 30 "$output_file"
 }
 
 # Process each dataset
@@ -42,23 +47,23 @@ process_dataset() {
         # For NGS datasets (4 callers)
         for support in 2 3; do
             output_file="$WORKDIR/$dataset/support_threshold/survivor/merged_min${support}.vcf"
-            run_survivor_merge "$temp_list" "$support" "$output_file"
+            run_survivor_merge "$temp_list" "$support" "$output_file" "$dataset" "min${support}"
         done
     else
         # For long-read datasets (6 callers)
         for support in 2 3 4 5; do
             output_file="$WORKDIR/$dataset/support_threshold/survivor/merged_min${support}.vcf"
-            run_survivor_merge "$temp_list" "$support" "$output_file"
+            run_survivor_merge "$temp_list" "$support" "$output_file" "$dataset" "min${support}"
         done
     fi
     
     # Intersection analysis (all callers must support)
     output_file="$WORKDIR/$dataset/intersection/survivor/merged_intersection.vcf"
-    run_survivor_merge "$temp_list" "$num_callers" "$output_file"
+    run_survivor_merge "$temp_list" "$num_callers" "$output_file" "$dataset" intersection
     
     # Union analysis (at least 1 caller must support)
     output_file="$WORKDIR/$dataset/union/survivor/merged_union.vcf"
-    run_survivor_merge "$temp_list" 1 "$output_file"
+    run_survivor_merge "$temp_list" 1 "$output_file" "$dataset" union
     
     # Clean up
     rm "$temp_list"
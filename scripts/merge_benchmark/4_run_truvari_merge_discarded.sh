@@ -1,25 +1,30 @@
 #!/bin/bash
 
 WORKDIR="/projects/b1171/qgn1237/6_SV_VCF_merger/20241202_octopusv_merge_benchmark"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
 # Function to run truvari consistency
 run_truvari_consistency() {
     local dataset=$1
-    local input_dir="$WORKDIR/$dataset/input_vcf"
+    local input_dir="$WORKDIR/$dataset/normalized_vcf"
     local output_dir="$WORKDIR/$dataset/intersection/truvari"
     local vcfs=("$input_dir"/*.vcf)
+    local inputs=()
+    for vcf in "${vcfs[@]}"; do
+        inputs+=(--input "$vcf")
+    done
     
     echo "Processing $dataset"
     
-    # Run truvari consistency and capture both stdout and stderr
-    truvari consistency "${vcfs[@]}" \
-        > "$output_dir/merged_intersection.vcf" \
-        2> "$output_dir/consistency_report.txt"
-    
-    # Save json report
-    truvari consistency -j "${vcfs[@]}" \
-        > "$output_dir/consistency_report.json" \
-        2>/dev/null
+    # One pass over the VCFs writes the intersection, the text report and the JSON report
+    # that truvari consistency needed two runs for (resources go to <output>.resources.json)
+    python3 "${SCRIPT_DIR}/profile_command.py" -q -o "$output_dir/merged_intersection.vcf" \
+        --task consistency_process "${inputs[@]}" --telemetry-label dataset="$dataset" -- \
+        python3 "${SCRIPT_DIR}/vcf_consistency.py" "${vcfs[@]}" \
+        -o "$output_dir/merged_intersection.vcf" \
+        -r "$output_dir/consistency_report.txt" \
+        -j "$output_dir/consistency_report.json" \
+        --telemetry-label dataset="$dataset"
 }
 
 # Process all datasets
@@ -1,12 +1,15 @@
 #!/bin/bash
 
 WORKDIR="/projects/b1171/qgn1237/6_SV_VCF_merger/20241202_octopusv_merge_benchmark"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+source "${SCRIPT_DIR}/profile_lib.sh"
 
 # Function to create file list for Jasmine
 create_file_list() {
     local dataset=$1
     local list_file=$2
-    local input_dir="$WORKDIR/$dataset/input_vcf"
+    local input_dir="$WORKDIR/$dataset/normalized_vcf"
     
     # Clear existing file if it exists
     > "$list_file"
@@ -22,9 +25,11 @@ run_jasmine_merge() {
     local list_file=$1
     local min_support=$2
     local output_file=$3
+    local dataset=$4
+    local analysis=$5
     local out_dir=$(dirname "$output_file")
     
-    jasmine \
+    profile jasmine "$output_file" "$dataset" "$analysis" $(cat "$list_file") -- jasmine \
         file_list="$list_file" \
         out_file="$output_file" \
         min_support="$min_support" \
@@ -51,7 +56,7 @@ process_dataset() {
             output_dir="$WORKDIR/$dataset/support_threshold/jasmine"
             mkdir -p "$output_dir"
             output_file="$output_dir/merged_min${support}.vcf"
-            run_jasmine_merge "$temp_list" "$support" "$output_file"
+            run_jasmine_merge "$temp_list" "$support" "$output_file" "$dataset" "min${support}"
         done
     else
         # For long-read datasets (6 callers)
@@ -59,7 +64,7 @@ process_dataset() {
             output_dir="$WORKDIR/$dataset/support_threshold/jasmine"
             mkdir -p "$output_dir"
             output_file="$output_dir/merged_min${support}.vcf"
-            run_jasmine_merge "$temp_list" "$support" "$output_file"
+            run_jasmine_merge "$temp_list" "$support" "$output_file" "$dataset" "min${support}"
         done
     fi
     
@@ -67,13 +72,13 @@ process_dataset() {
     output_dir="$WORKDIR/$dataset/intersection/jasmine"
     mkdir -p "$output_dir"
     output_file="$output_dir/merged_intersection.vcf"
-    run_jasmine_merge "$temp_list" "$num_callers" "$output_file"
+    run_jasmine_merge "$temp_list" "$num_callers" "$output_file" "$dataset" intersection
     
     # Union analysis (at least 1 caller must support)
     output_dir="$WORKDIR/$dataset/union/jasmine"
     mkdir -p "$output_dir"
     output_file="$output_dir/merged_union.vcf"
-    run_jasmine_merge "$temp_list" 1 "$output_file"
+    run_jasmine_merge "$temp_list" 1 "$output_file" "$dataset" union
     
     # Clean up
     rm "$temp_list"
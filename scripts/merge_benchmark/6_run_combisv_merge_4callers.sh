@@ -2,11 +2,14 @@
 
 WORKDIR="/projects/b1171/qgn1237/6_SV_VCF_merger/20241202_octopusv_merge_benchmark"
 COMBISV="/home/qgn1237/2_software/combiSV/combiSV2.3.pl"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+source "${SCRIPT_DIR}/profile_lib.sh"
 
 # Function to run CombiSV merge
 run_combisv_merge() {
     local dataset=$1
-    local input_dir="$WORKDIR/$dataset/input_vcf"
+    local input_dir="$WORKDIR/$dataset/normalized_vcf"
     local output_dir="$WORKDIR/$dataset/union/combisv"
     local output_prefix="$output_dir/merged_union"
     
@@ -16,7 +19,9 @@ run_combisv_merge() {
     mkdir -p "$output_dir"
     
     # Run CombiSV with all available supported callers
-    perl "$COMBISV" \
+    profile combisv "$output_prefix" "$dataset" union \
+        "$input_dir/pbsv.vcf" "$input_dir/sniffles.vcf" "$input_dir/cutesv.vcf" "$input_dir/svim.vcf" -- \
+        perl "$COMBISV" \
         -pbsv "$input_dir/pbsv.vcf" \
         -sniffles "$input_dir/sniffles.vcf" \
         -cutesv "$input_dir/cutesv.vcf" \
@@ -1,11 +1,14 @@
 #!/bin/bash
 
 WORKDIR="/projects/b1171/qgn1237/6_SV_VCF_merger/20241202_octopusv_merge_benchmark"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+source "${SCRIPT_DIR}/profile_lib.sh"
 
 # Function to run union for 4 callers
 run_union_4callers() {
     local dataset=$1
-    local input_dir="$WORKDIR/$dataset/input_vcf"
+    local input_dir="$WORKDIR/$dataset/normalized_vcf"
     local output_dir="$WORKDIR/$dataset/union/octopusv_4callers"
     
     echo "Running union analysis for $dataset with 4 callers"
@@ -14,7 +17,8 @@ run_union_4callers() {
     mkdir -p "$output_dir"
     
     # Only use the 4 specific callers
-    octopusv merge \
+    profile octopusv_4callers "$output_dir/merged_union.svcf" "$dataset" union \
+        "$input_dir"/{cutesv,pbsv,sniffles,svim}_corrected.svcf -- octopusv merge \
         "$input_dir/cutesv_corrected.svcf" \
         "$input_dir/pbsv_corrected.svcf" \
         "$input_dir/sniffles_corrected.svcf" \
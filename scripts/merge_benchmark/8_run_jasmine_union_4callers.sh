@@ -1,12 +1,15 @@
 #!/bin/bash
 
 WORKDIR="/projects/b1171/qgn1237/6_SV_VCF_merger/20241202_octopusv_merge_benchmark"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+source "${SCRIPT_DIR}/profile_lib.sh"
 
 # Function to create file list for Jasmine
 create_file_list() {
     local dataset=$1
     local list_file=$2
-    local input_dir="$WORKDIR/$dataset/input_vcf"
+    local input_dir="$WORKDIR/$dataset/normalized_vcf"
     
     # Clear existing file if it exists
     > "$list_file"
@@ -23,9 +26,10 @@ run_jasmine_merge() {
     local list_file=$1
     local min_support=$2
     local output_file=$3
+    local dataset=$4
     local out_dir=$(dirname "$output_file")
     
-    jasmine \
+    profile jasmine_4callers "$output_file" "$dataset" union $(cat "$list_file") -- jasmine \
         file_list="$list_file" \
         out_file="$output_file" \
         min_support="$min_support" \
@@ -48,7 +52,7 @@ process_dataset() {
     output_dir="$WORKDIR/$dataset/union/jasmine_4callers"
     mkdir -p "$output_dir"
     output_file="$output_dir/merged_union.vcf"
-    run_jasmine_merge "$temp_list" 1 "$output_file"
+    run_jasmine_merge "$temp_list" 1 "$output_file" "$dataset"
     
     # Clean up
     rm "$temp_list"
@@ -1,12 +1,15 @@
 #!/bin/bash
 
 WORKDIR="/projects/b1171/qgn1237/6_SV_VCF_merger/20241202_octopusv_merge_benchmark"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+source "${SCRIPT_DIR}/profile_lib.sh"
 
 # Function to create file list for SURVIVOR
 create_file_list() {
     local dataset=$1
     local list_file=$2
-    local input_dir="$WORKDIR/$dataset/input_vcf"
+    local input_dir="$WORKDIR/$dataset/normalized_vcf"
     
     # Clear existing file if it exists
     > "$list_file"
@@ -23,8 +26,9 @@ run_survivor_merge() {
     local list_file=$1
     local min_support=$2
     local output_file=$3
+    local dataset=$4
     
-    SURVIVOR merge "$list_file" 1000 "$min_support" 1 1 0 30 "$output_file"
+    profile survivor_4callers "$output_file" "$dataset" union $(cat "$list_file") -- SURVIVOR merge "$list_file" 1000 "$min_support" 1 1 0 30 "$output_file"
 }
 
 # Process each dataset
@@ -41,7 +45,7 @@ process_dataset() {
     output_dir="$WORKDIR/$dataset/union/survivor_4callers"
     mkdir -p "$output_dir"
     output_file="$output_dir/merged_union.vcf"
-    run_survivor_merge "$temp_list" 1 "$output_file"
+    run_survivor_merge "$temp_list" 1 "$output_file" "$dataset"
     
     # Clean up
     rm "$temp_list"
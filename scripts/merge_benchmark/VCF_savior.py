@@ -7,10 +7,25 @@ import sys
 import re
 import logging
 from datetime import datetime
-import gzip
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.chunked import map_records, transform_vcf, read_header
+from octopusv_bench.instrument import Instrumentation, add_profile_argument
+from octopusv_bench.telemetry import Telemetry, add_telemetry_arguments
+
+def collect_used_fields(line, used_fields):
+    """Count the INFO keys and FORMAT fields used by one data line"""
+    fields = line.strip().split('\t')
+    if fields[7] != '.':
+        for item in fields[7].split(';'):
+            used_fields[('INFO', item.split('=')[0])] += 1
+    if len(fields) > 8:
+        for field in fields[8].split(':'):
+            used_fields[('FORMAT', field)] += 1
+    return None
 
 class VCFSavior:
-    def __init__(self, input_vcf, output_vcf, genome_version=None):
+    def __init__(self, input_vcf, output_vcf, genome_version=None, threads=1, profile=False, telemetry=None):
         """
         Initialize VCF Savior
         
@@ -18,10 +33,15 @@ class VCFSavior:
             input_vcf (str): Input VCF file path
             output_vcf (str): Output VCF file path
             genome_version (str): Genome version (37 or 38)
+            threads (int): Worker processes for the record passes
+            profile (bool): Write cProfile/tracemalloc results next to the output
+            telemetry (Telemetry): Progress reporting, or None
         """
         self.input_vcf = input_vcf
         self.output_vcf = output_vcf
         self.genome_version = genome_version
+        self.threads = threads
+        self.inst = Instrumentation('VCF_savior.py', profile, telemetry)
         self.temp_files = []
         
         # Setup logging
@@ -158,46 +178,6 @@ class VCFSavior:
         
         return info_fields, format_fields
 
-    def find_undefined_fields(self, vcf_lines, defined_info, defined_format):
-        """
-        Find undefined INFO and FORMAT fields
-        
-        Args:
-            vcf_lines (list): List of VCF data lines
-            defined_info (set): Set of defined INFO fields
-            defined_format (set): Set of defined FORMAT fields
-        Returns:
-            tuple: Sets of undefined INFO and FORMAT fields
-        """
-        undefined_info = set()
-        undefined_format = set()
-        
-        for line in vcf_lines:
-            if isinstance(line, str):
-                fields = line.strip().split('\t')
-            else:
-                fields = line
-                
-            # Check INFO fields
-            info = fields[7]
-            if info != '.':
-                for item in info.split(';'):
-                    if '=' in item:
-                        field = item.split('=')[0]
-                        if field not in defined_info:
-                            undefined_info.add(field)
-                    elif item not in defined_info:
-                        undefined_info.add(item)
-            
-            # Check FORMAT fields
-            if len(fields) > 8:
-                format_fields = fields[8].split(':')
-                for field in format_fields:
-                    if field not in defined_format:
-                        undefined_format.add(field)
-        
-        return undefined_info, undefined_format
-
     def fix_header_definitions(self, header_lines):
         """
         Fix header definitions
@@ -310,35 +290,60 @@ class VCFSavior:
         
         return ';'.join(new_info)
 
+    def fix_record(self, line, changes):
+        """
+        Apply every record-level fix to one VCF data line
+
+        Args:
+            line (str): VCF data line
+            changes (Counter): Per-change counts, updated in place
+        Returns:
+            str: Fixed VCF data line including its newline
+        """
+        changes['records'] += 1
+        processed_line = self.process_vcf_line(line)
+        if processed_line != line.strip():
+            changes['chromosome_names_in_variants'] += 1
+
+        fields = processed_line.strip().split('\t')
+        if fields[6] != 'PASS':
+            changes['filters_set_to_pass'] += 1
+        fields[6] = 'PASS'
+
+        old_info = fields[7]
+        fields[7] = self.fix_svlen(fields[7], fields[1])
+        if old_info != fields[7]:
+            changes['fixed_svlen_values'] += 1
+
+        if len(fields) >= 10:
+            old_format = fields[8]
+            old_sample = fields[9]
+            fields[8], fields[9] = self.fix_genotype_field(fields[8], fields[9])
+            if old_format != fields[8] or old_sample != fields[9]:
+                changes['fixed_genotype_fields'] += 1
+
+        return '\t'.join(fields) + '\n'
+
     def fix_vcf(self):
         """Main process to fix VCF file"""
         try:
             self.logger.info(f"Starting VCF processing with genome version {self.genome_version}")
+            if self.inst.telemetry is not None:
+                # The field scan and the fix pass both read the whole input
+                self.inst.telemetry.set_totals(bytes_read=2 * os.path.getsize(self.input_vcf))
             
-            opener = gzip.open if self.input_vcf.endswith('.gz') else open
-            mode = 'rt' if self.input_vcf.endswith('.gz') else 'r'
-            
-            with opener(self.input_vcf, mode) as f:
-                content = f.readlines()
-
-            header_lines = []
-            data_lines = []
-            changes_made = set()
-
-            for line in content:
-                if line.startswith('#'):
-                    processed_line = self.process_header_line(line.strip())
-                    if processed_line != line.strip():
-                        changes_made.add('chromosome_names_in_header')
-                    header_lines.append(processed_line)
-                else:
-                    processed_line = self.process_vcf_line(line)
-                    if processed_line != line:
-                        changes_made.add('chromosome_names_in_variants')
-                    data_lines.append(processed_line)
+            with self.inst.phase('load'):
+                raw_header = [line.strip() for line in read_header(self.input_vcf)]
+                header_lines = [self.process_header_line(line) for line in raw_header]
+                changes_made = set()
+                if header_lines != raw_header:
+                    changes_made.add('chromosome_names_in_header')
 
-            defined_info, defined_format = self.extract_header_definitions(header_lines)
-            undefined_info, undefined_format = self.find_undefined_fields(data_lines, defined_info, defined_format)
+                defined_info, defined_format = self.extract_header_definitions(header_lines)
+                _, used_fields = map_records(self.input_vcf, collect_used_fields, self.threads,
+                                             telemetry=self.inst.telemetry)
+                undefined_info = {field for kind, field in used_fields if kind == 'INFO' and field not in defined_info}
+                undefined_format = {field for kind, field in used_fields if kind == 'FORMAT' and field not in defined_format}
 
             if undefined_info:
                 changes_made.add('added_missing_info_definitions')
@@ -352,31 +357,16 @@ class VCFSavior:
                 new_headers.append(f'##FORMAT=<ID={field},Number=.,Type=String,Description="Auto-generated definition for {field}">')
 
             fixed_headers = self.fix_header_definitions(header_lines[:-1] + new_headers)
+            fixed_headers.append(header_lines[-1])
 
-            with open(self.output_vcf, 'w') as f:
-                for header in fixed_headers:
-                    f.write(header + '\n')
-                f.write(header_lines[-1] + '\n')
-
-                for line in data_lines:
-                    fields = line.strip().split('\t')
-                    if fields[6] != 'PASS':
-                        changes_made.add('filters_set_to_pass')
-                    fields[6] = 'PASS'
-                    
-                    old_info = fields[7]
-                    fields[7] = self.fix_svlen(fields[7], fields[1])
-                    if old_info != fields[7]:
-                        changes_made.add('fixed_svlen_values')
-                    
-                    if len(fields) >= 10:
-                        old_format = fields[8]
-                        old_sample = fields[9]
-                        fields[8], fields[9] = self.fix_genotype_field(fields[8], fields[9])
-                        if old_format != fields[8] or old_sample != fields[9]:
-                            changes_made.add('fixed_genotype_fields')
-                    
-                    f.write('\t'.join(fields) + '\n')
+            with self.inst.phase('fix') as phase:
+                record_changes = transform_vcf(self.input_vcf, self.output_vcf, self.fix_record, self.threads,
+                                               header_fn=lambda header, counts: [header + '\n' for header in fixed_headers],
+                                               telemetry=self.inst.telemetry)
+                phase['records'] = record_changes.pop('records', 0)
+            # The field scan read the same records
+            self.inst.phases['load']['records'] = phase['records']
+            changes_made.update(change for change, count in record_changes.items() if count)
 
             if changes_made:
                 self.logger.info("Changes made to the VCF file:")
@@ -387,21 +377,26 @@ class VCFSavior:
 
             sorted_vcf = self.output_vcf.replace('.vcf', '_sorted.vcf')
             
-            self.logger.info("Sorting VCF file...")
-            sort_cmd = f"cat {self.output_vcf} | awk '$1 ~ /^#/ {{print $0;next}} {{print $0 | \"sort -k1,1V -k2,2n\"}}' > {sorted_vcf}"
-            subprocess.run(sort_cmd, shell=True, check=True)
+            with self.inst.phase('sort') as phase:
+                self.logger.info("Sorting VCF file...")
+                sort_cmd = f"cat {self.output_vcf} | awk '$1 ~ /^#/ {{print $0;next}} {{print $0 | \"sort -k1,1V -k2,2n\"}}' > {sorted_vcf}"
+                subprocess.run(sort_cmd, shell=True, check=True)
+                phase['records'] = self.inst.phases['fix']['records']
 
-            self.logger.info("Compressing sorted VCF...")
-            subprocess.run(f"bgzip -c {sorted_vcf} > {sorted_vcf}.gz", shell=True, check=True)
+            with self.inst.phase('write') as phase:
+                self.logger.info("Compressing sorted VCF...")
+                subprocess.run(f"bgzip -c {sorted_vcf} > {sorted_vcf}.gz", shell=True, check=True)
 
-            self.logger.info("Creating index...")
-            subprocess.run(f"tabix -p vcf {sorted_vcf}.gz", shell=True, check=True)
+                self.logger.info("Creating index...")
+                subprocess.run(f"tabix -p vcf {sorted_vcf}.gz", shell=True, check=True)
+                phase['records'] = self.inst.phases['fix']['records']
 
             self.logger.info(f"Processing complete. Files generated:")
             self.logger.info(f"1. Fixed VCF: {self.output_vcf}")
             self.logger.info(f"2. Sorted VCF: {sorted_vcf}")
             self.logger.info(f"3. Compressed VCF: {sorted_vcf}.gz")
             self.logger.info(f"4. Index file: {sorted_vcf}.gz.tbi")
+            self.inst.finish(self.output_vcf)
 
         except Exception as e:
             self.logger.error(f"Error: {str(e)}")
@@ -414,11 +409,17 @@ def main():
     parser.add_argument('-i', '--input', required=True, help='Input VCF file')
     parser.add_argument('-o', '--output', required=True, help='Output VCF file')
     parser.add_argument('-g', '--genome', choices=['37', '38'], help='Genome version (37 or 38) for chromosome naming')
+    parser.add_argument('-t', '--threads', type=int, default=1,
+                        help='Worker processes; plain and BGZF inputs are split into chunks (default: 1)')
+    add_profile_argument(parser)
+    add_telemetry_arguments(parser)
     
     args = parser.parse_args()
     
-    savior = VCFSavior(args.input, args.output, args.genome)
-    savior.fix_vcf()
+    with Telemetry.from_args('vcf_savior', args) as telemetry:
+        telemetry.set_files([args.input], args.output)
+        savior = VCFSavior(args.input, args.output, args.genome, args.threads, args.profile, telemetry)
+        savior.fix_vcf()
 
 if __name__ == '__main__':
     main()
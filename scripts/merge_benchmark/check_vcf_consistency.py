@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.consistency import Consistency, format_report
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'consistency_fixture')
+FIXTURE_VCFS = ['a.vcf', 'b.vcf', 'c.vcf', 'd.vcf']
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Check that vcf_consistency.py reports what truvari consistency reports. Without VCFs, "
+                    "compares against the truvari 5.4 reports stored with the fixture in consistency_fixture/; "
+                    "with VCFs, runs truvari consistency on them and compares against its output.")
+    parser.add_argument("vcfs", nargs='*', help="VCFs to check against a live truvari run (default: the fixture)")
+    parser.add_argument("--truvari", default="truvari", help="truvari executable (default: truvari)")
+    return parser.parse_args()
+
+def truvari_reports(truvari, vcfs):
+    """(text report, JSON report) of truvari consistency on vcfs"""
+    text = subprocess.run([truvari, 'consistency'] + vcfs, check=True, capture_output=True, text=True).stdout
+    data = subprocess.run([truvari, 'consistency', '-j'] + vcfs, check=True, capture_output=True, text=True).stdout
+    return text, json.loads(data)
+
+def fixture_reports():
+    with open(os.path.join(FIXTURE_DIR, 'truvari_report.txt')) as f:
+        text = f.read()
+    with open(os.path.join(FIXTURE_DIR, 'truvari_report.json')) as f:
+        return text, json.load(f)
+
+def compare(expected_text, expected_json, output):
+    """Differences between truvari's reports and a report() dict, as messages"""
+    problems = []
+    text = format_report(output)
+    if text != expected_text:
+        for number, (want, got) in enumerate(zip(expected_text.splitlines(), text.splitlines()), 1):
+            if want != got:
+                problems.append(f"text report line {number}: truvari '{want}', got '{got}'")
+                break
+        else:
+            problems.append(f"text report has {len(text.splitlines())} lines, "
+                            f"truvari {len(expected_text.splitlines())}")
+    # Round-trip through JSON so tuples, key order and int/float spelling do not matter
+    got_json = json.loads(json.dumps(output))
+    for key in expected_json:
+        if got_json.get(key) != expected_json[key]:
+            problems.append(f"JSON '{key}' differs: truvari {expected_json[key]}, got {got_json.get(key)}")
+    return problems
+
+def main():
+    args = parse_args()
+    if args.vcfs:
+        try:
+            expected_text, expected_json = truvari_reports(args.truvari, args.vcfs)
+        except (OSError, subprocess.CalledProcessError) as e:
+            sys.stderr.write(f"Error: could not run truvari consistency: {e}\n")
+            sys.exit(1)
+        output = Consistency(args.vcfs).scan().report()
+    else:
+        expected_text, expected_json = fixture_reports()
+        # Reports name the inputs as given, so read the fixture by the names truvari saw
+        os.chdir(FIXTURE_DIR)
+        output = Consistency(FIXTURE_VCFS).scan().report()
+
+    problems = compare(expected_text, expected_json, output)
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    if problems:
+        sys.exit(1)
+    print(f"Reports match truvari consistency ({output['total_calls']} calls across {output['num_vcfs']} VCFs)")
+
+if __name__ == "__main__":
+    main()
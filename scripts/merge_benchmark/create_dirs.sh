@@ -11,6 +11,7 @@ tools=("octopusv" "survivor" "jasmine" "truvari")
 for dataset in "${datasets[@]}"; do
     # Create main directories
     mkdir -p "$WORKDIR/$dataset/input_vcf"
+    mkdir -p "$WORKDIR/$dataset/normalized_vcf"
     
     # Create analysis directories
     for method in "${analysis[@]}"; do
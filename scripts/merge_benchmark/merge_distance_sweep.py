@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.instrument import Instrumentation, add_profile_argument
+from octopusv_bench.sv_merge import load_callset, candidate_pairs, UnionFind, write_merged_vcf
+from octopusv_bench.truth_index import TruthIndex
+
+DEFAULT_DISTANCES = [0, 50, 100, 200, 300, 500, 750, 1000, 1500, 2000]
+# truvari bench --refdist default
+TRUTH_TOLERANCE = 500
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Sweep the merge distance in one pass: candidate pairs are computed once within the "
+                    "largest distance and single-linkage clusters grow as the threshold increases.")
+    parser.add_argument("-i", "--inputs", nargs='+', required=True, help="Caller VCFs, e.g. the normalized copies")
+    parser.add_argument("--names", nargs='+', help="Sample column names (default: input file names)")
+    parser.add_argument("-d", "--distances", type=int, nargs='+', default=DEFAULT_DISTANCES,
+                        help=f"Merge distances to evaluate (default: {' '.join(map(str, DEFAULT_DISTANCES))})")
+    parser.add_argument("--min-support", type=int, default=1,
+                        help="Minimum number of supporting callsets (default: 1)")
+    parser.add_argument("--min-size", type=int, default=30,
+                        help="Ignore intra-chromosomal SVs shorter than this (default: 30)")
+    parser.add_argument("--ignore-type", action="store_true", help="Merge calls of different SV types")
+    parser.add_argument("--ignore-strand", action="store_true", help="Merge calls with different strands")
+    parser.add_argument("--output-dir", help="Write merged_d<distance>.vcf for every distance")
+    parser.add_argument("--truth", help="Truth VCF; adds precision/recall/F1 per distance")
+    parser.add_argument("--truth-tolerance", type=int, default=TRUTH_TOLERANCE,
+                        help="Breakpoint tolerance for truth matching (default: 500)")
+    parser.add_argument("-o", "--output", required=True, help="Per-distance summary TSV")
+    add_profile_argument(parser)
+    return parser.parse_args()
+
+def is_truth_match(sv, truth, tolerance):
+    """Same chromosome(s), type and breakpoints within tolerance"""
+    if sv['chrom'] != truth['chrom'] or sv['svtype'] != truth['svtype']:
+        return False
+    if abs(sv['pos'] - truth['pos']) > tolerance:
+        return False
+    if sv['svtype'] == 'TRA':
+        return sv['chr2'] == truth['chr2']
+    return abs(sv['end'] - truth['end']) <= tolerance
+
+def truth_hits(svs, truth_path, tolerance):
+    """
+    Match every input SV against the truth set once
+
+    A merged record is scored through its representative call, so these
+    per-SV hits serve every distance in the sweep.
+
+    Returns:
+        tuple: (truth index or None per SV, number of truth SVs)
+    """
+    truth_events = load_callset(truth_path, 0)
+    index = TruthIndex(truth_events, tolerance)
+    hits = [index.first_match(sv, tolerance, is_truth_match) for sv in svs]
+    return hits, len(truth_events)
+
+def representatives(svs, uf, min_support):
+    """
+    Representative call of every cluster with enough support
+
+    Uses the same choice as cluster_record: lowest callset, then position.
+    """
+    best = {}
+    callsets = {}
+    for i, sv in enumerate(svs):
+        root = uf.find(i)
+        callsets.setdefault(root, set()).add(sv['callset'])
+        key = (sv['callset'], sv['pos'])
+        if root not in best or key < best[root][0]:
+            best[root] = (key, i)
+    return [i for root, (_, i) in best.items() if len(callsets[root]) >= min_support]
+
+def score(reps, hits, truth_total):
+    tp = sum(1 for i in reps if hits[i] is not None)
+    truth_hit = len({hits[i] for i in reps if hits[i] is not None})
+    precision = tp / len(reps) if reps else 0
+    recall = truth_hit / truth_total if truth_total else 0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0
+    return {'tp': tp, 'fp': len(reps) - tp, 'truth_total': truth_total, 'truth_hit': truth_hit,
+            'precision': round(precision, 4), 'recall': round(recall, 4), 'f1': round(f1, 4)}
+
+def main():
+    args = parse_args()
+    names = args.names or [os.path.basename(p).split('.')[0] for p in args.inputs]
+    if len(names) != len(args.inputs):
+        sys.stderr.write("Error: --names needs one name per input\n")
+        sys.exit(1)
+    distances = sorted(set(args.distances))
+
+    inst = Instrumentation('merge_distance_sweep.py', args.profile)
+    with inst.phase('load') as phase:
+        svs = []
+        for callset, path in enumerate(args.inputs):
+            svs.extend(load_callset(path, callset, args.min_size))
+        phase['records'] = len(svs)
+    with inst.phase('pairs') as phase:
+        pairs = sorted(candidate_pairs(svs, distances[-1], not args.ignore_type, not args.ignore_strand))
+        phase['records'] = len(pairs)
+    timings = inst.timings()
+    print(f"Loaded {len(svs)} SVs and {len(pairs)} candidate pairs within {distances[-1]} bp "
+          f"in {timings['load']['seconds'] + timings['pairs']['seconds']:.2f}s")
+
+    hits = None
+    if args.truth:
+        with inst.phase('match') as phase:
+            hits, truth_total = truth_hits(svs, args.truth, args.truth_tolerance)
+            phase['records'] = len(svs)
+        print(f"Matched calls against {truth_total} truth SVs in {inst.timings()['match']['seconds']:.2f}s")
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    columns = ['distance', 'clusters', 'records', 'seconds']
+    if hits is not None:
+        columns += ['tp', 'fp', 'truth_total', 'truth_hit', 'precision', 'recall', 'f1']
+
+    uf = UnionFind(len(svs))
+    clusters = len(svs)
+    p = 0
+    with open(args.output, 'w') as out:
+        out.write('\t'.join(columns) + '\n')
+        for distance in distances:
+            # One phase per distance, so the table and timing JSON show where the sweep spends its time
+            with inst.phase(f"d{distance}") as phase:
+                # Pairs are sorted, so each threshold only adds the next slice
+                while p < len(pairs) and pairs[p][0] <= distance:
+                    if uf.union(pairs[p][1], pairs[p][2]):
+                        clusters -= 1
+                    p += 1
+                reps = representatives(svs, uf, args.min_support)
+                row = {'distance': distance, 'clusters': clusters, 'records': len(reps)}
+                if hits is not None:
+                    row.update(score(reps, hits, truth_total))
+                if args.output_dir:
+                    write_merged_vcf(os.path.join(args.output_dir, f"merged_d{distance}.vcf"),
+                                     svs, uf.groups(), names, args.min_support)
+                phase['records'] = len(reps)
+            row['seconds'] = round(inst.timings()[f"d{distance}"]['seconds'], 3)
+            out.write('\t'.join(str(row[c]) for c in columns) + '\n')
+            print('\t'.join(f"{c}={row[c]}" for c in columns))
+    inst.finish(args.output)
+
+if __name__ == "__main__":
+    main()
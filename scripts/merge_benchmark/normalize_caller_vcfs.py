@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import glob
+import gzip
+import json
+import shutil
+import hashlib
+import argparse
+import subprocess
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.bgzf import BGZF_EOF, MAX_BLOCK_DATA, write_blocks
+from octopusv_bench.contigs import ContigOrder, header_contigs
+from octopusv_bench.instrument import Instrumentation, add_profile_argument
+from octopusv_bench.vcf_rules import VCFRecord, InferSvlenRule, build_rules, fix_vcf_header
+
+# Bump when the normalization output changes so cached copies are rebuilt
+NORMALIZE_VERSION = 2
+MANIFEST = 'manifest.json'
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Write sorted, BGZF-indexed caller VCFs with unique IDs, consistent contig names "
+                    "and valid SVLEN/END, cached by input hash for all mergers.")
+    parser.add_argument("--input-dir", required=True, help="Directory with raw caller VCFs (<caller>.vcf)")
+    parser.add_argument("--output-dir", required=True, help="Directory for the normalized copies and manifest")
+    parser.add_argument("--callers", nargs='+', help="Caller names (default: every *.vcf in --input-dir)")
+    parser.add_argument("-g", "--genome", choices=['37', '38'], help="Genome version for contig names")
+    parser.add_argument("-t", "--threads", type=int, default=None,
+                        help="Number of callers normalized in parallel (default: one per caller)")
+    parser.add_argument("--force", action="store_true", help="Ignore the cache and rebuild every copy")
+    add_profile_argument(parser)
+    return parser.parse_args()
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def input_hash(path, cached):
+    """SHA-256 of the input, reusing the cached one while size and mtime are unchanged"""
+    stat = os.stat(path)
+    if cached and cached.get('size') == stat.st_size and cached.get('mtime_ns') == stat.st_mtime_ns:
+        return cached['sha256'], stat
+    return file_sha256(path), stat
+
+def output_paths(output_dir, caller):
+    vcf = os.path.join(output_dir, f"{caller}.vcf")
+    return [vcf, vcf + '.gz', vcf + '.gz.tbi']
+
+def unique_id(record_id, caller, n, seen, counter):
+    """Keep the first use of an ID and append a running counter to repeats"""
+    if record_id == '.':
+        record_id = f"{caller}_{n}"
+    new_id = record_id
+    while new_id in seen:
+        new_id = f"{record_id}_{counter[0]}"
+        counter[0] += 1
+    seen.add(new_id)
+    return new_id
+
+def normalize_vcf(input_vcf, output_vcf, caller, genome=None):
+    """
+    Normalize one caller VCF into output_vcf, output_vcf.gz and its tabix index
+
+    Returns:
+        dict: Per-rule hit counts plus record and renamed-ID totals
+    """
+    # Records with neither SVLEN nor END keep their coordinates; no placeholder length is invented
+    record_rules = build_rules(['chrom_rename'] if genome else [], genome) + [InferSvlenRule(placeholders=False)] + \
+        build_rules(['infer_end', 'define_missing'])
+    header_rules = build_rules(['chrom_rename'] if genome else [], genome) + build_rules(
+        ['header_dedup', 'define_missing'])
+    counts = Counter()
+    header = []
+    records = []
+    seen_ids = set()
+    counter = [1]
+
+    opener = gzip.open if input_vcf.endswith('.gz') else open
+    with opener(input_vcf, 'rt') as f:
+        for n, line in enumerate(f):
+            if line.startswith('#'):
+                header.append(line)
+                continue
+            record = VCFRecord(line)
+            if len(record.fields) < 8:
+                counts['skipped_short_lines'] += 1
+                continue
+            for rule in record_rules:
+                if rule.fix_record(record, counts):
+                    counts[rule.name] += 1
+            new_id = unique_id(record.fields[2], caller, n, seen_ids, counter)
+            if new_id != record.fields[2]:
+                counts['unique_id'] += 1
+                record.fields[2] = new_id
+            records.append((record.fields[0], int(record.fields[1]), n, record.to_line()))
+
+    header = fix_vcf_header(header_rules, header, counts)
+    contig_order = ContigOrder(header_contigs(header))
+    records.sort(key=lambda r: (contig_order.key(r[0]), r[1], r[2]))
+    counts['records'] = len(records)
+
+    with open(output_vcf, 'w') as out:
+        out.writelines(header)
+        out.writelines(r[3] for r in records)
+
+    with open(output_vcf, 'rb') as src, open(output_vcf + '.gz', 'wb') as out:
+        for data in iter(lambda: src.read(MAX_BLOCK_DATA), b''):
+            write_blocks(out, data)
+        out.write(BGZF_EOF)
+    subprocess.run(['tabix', '-f', '-p', 'vcf', output_vcf + '.gz'], check=True)
+    # define_missing tallies (kind, field) keys that only matter for the header
+    return {key: count for key, count in counts.items() if isinstance(key, str)}
+
+def run_caller(job):
+    caller, input_vcf, output_vcf, genome = job
+    return caller, normalize_vcf(input_vcf, output_vcf, caller, genome)
+
+def main():
+    args = parse_args()
+    if shutil.which('tabix') is None:
+        sys.stderr.write("Error: tabix is required to index the normalized VCFs\n")
+        sys.exit(1)
+    os.makedirs(args.output_dir, exist_ok=True)
+    # Callers are normalized in worker processes, which are timed as a whole but not profiled
+    inst = Instrumentation('normalize_caller_vcfs.py', args.profile)
+
+    manifest_path = os.path.join(args.output_dir, MANIFEST)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    callers = args.callers or sorted(os.path.basename(p)[:-4] for p in glob.glob(os.path.join(args.input_dir, '*.vcf')))
+    settings = {'genome': args.genome, 'version': NORMALIZE_VERSION}
+    jobs = []
+    pending = {}
+    with inst.phase('hash'):
+        for caller in callers:
+            input_vcf = os.path.join(args.input_dir, f"{caller}.vcf")
+            if not os.path.exists(input_vcf):
+                print(f"Warning: no VCF found for {caller} in {args.input_dir}", file=sys.stderr)
+                continue
+            sha256, stat = input_hash(input_vcf, manifest.get(caller))
+            entry = {'input': os.path.abspath(input_vcf), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                     'sha256': sha256, 'settings': settings}
+            cached = manifest.get(caller)
+            outputs = output_paths(args.output_dir, caller)
+            if (not args.force and cached and cached.get('sha256') == sha256 and cached.get('settings') == settings
+                    and all(os.path.exists(p) for p in outputs)):
+                print(f"Cached {caller}: {outputs[0]}")
+                manifest[caller].update(entry)
+                continue
+            # The manifest entry is only replaced once the new copy is written
+            pending[caller] = entry
+            jobs.append((caller, input_vcf, outputs[0], args.genome))
+
+    if jobs:
+        threads = args.threads or len(jobs)
+        with inst.phase('normalize') as phase, ProcessPoolExecutor(max_workers=min(threads, len(jobs))) as pool:
+            for caller, stats in pool.map(run_caller, jobs):
+                manifest[caller] = dict(pending[caller], stats=stats)
+                phase['records'] += stats.get('records', 0)
+                print(f"Normalized {caller}: {stats.get('records', 0)} records, "
+                      f"{stats.get('unique_id', 0)} IDs renamed, {stats.get('chrom_rename', 0)} contigs renamed, "
+                      f"{stats.get('infer_svlen', 0)} SVLEN and {stats.get('infer_end', 0)} END filled, "
+                      f"{stats.get('no_svlen_or_end', 0)} left without SVLEN or END")
+
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    inst.finish(manifest_path)
+
+if __name__ == "__main__":
+    main()
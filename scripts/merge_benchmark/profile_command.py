@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.resources import run_profiled, resources_path, write_record
+from octopusv_bench.telemetry import Telemetry, add_telemetry_arguments
+from octopusv_bench.run_db import PROFILED_ENV, record_stage, input_size
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Run a command and record wall time, CPU, peak RSS and I/O of its whole process tree. "
+                    "The record is also appended to the run database in $OCTOPUSV_BENCH_RUN_DB when that is set.",
+        usage="%(prog)s (-o OUTPUT | -j JSON) [--interval SECONDS] [--task NAME] [--stage NAME] "
+              "[--input PATH ...] [--telemetry-label KEY=VALUE ...] -- command [args ...]")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("-o", "--output", help="Tool output file, prefix or directory; "
+                                               "the record is written to <output>.resources.json")
+    target.add_argument("-j", "--json", help="Explicit path of the JSON record")
+    parser.add_argument("--interval", type=float, default=0.2, help="Sampling interval in seconds (default: 0.2)")
+    parser.add_argument("--label", help="Free-form label stored in the record")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="Do not print the summary line (for commands whose stderr is captured)")
+    parser.add_argument("--task", help="Telemetry and run database task name (default: --label or the command's name)")
+    parser.add_argument("--input", action="append", default=[], metavar="PATH",
+                        help="Input file of the command, for the input size in the run database; repeatable")
+    parser.add_argument("--stage", default='run', help="Telemetry stage shown while the command runs (default: run)")
+    add_telemetry_arguments(parser)
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="Command to run, after --")
+    args = parser.parse_args()
+    if args.command and args.command[0] == '--':
+        args.command = args.command[1:]
+    if not args.command:
+        parser.error("no command given")
+    return args
+
+def previous_record(path):
+    """The record of an earlier run of the same step, or None"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def main():
+    args = parse_args()
+    path = args.json or resources_path(args.output)
+    name = os.path.basename(args.command[0])
+    task = args.task or args.label or name
+    # The run database gets the full resource record below instead of the telemetry's own
+    telemetry = Telemetry.from_args(task, args, record=False)
+    # Progress is bytes read by the process tree; an earlier run of the same step gives the ETA
+    previous = previous_record(path)
+    if previous and previous.get('exit_code') == 0:
+        telemetry.set_totals(bytes_read=previous.get('read_chars') or None,
+                             expected_seconds=previous.get('wall_seconds'))
+    telemetry.set_stage(args.stage)
+
+    # stdin/stdout/stderr are inherited so driver redirections keep working; the
+    # command's own telemetry sees PROFILED_ENV and leaves the run database to us
+    try:
+        record = run_profiled(args.command, args.interval,
+                              on_sample=lambda sample: telemetry.set_progress(bytes_read=sample['read_chars']),
+                              env=dict(os.environ, **{PROFILED_ENV: '1'}))
+    except OSError as e:
+        telemetry.close('failed')
+        sys.stderr.write(f"Error: cannot run {args.command[0]}: {e}\n")
+        sys.exit(127)
+    telemetry.set_progress(bytes_read=record['read_chars'])
+    telemetry.close('done' if record['exit_code'] == 0 else 'failed')
+    if args.label:
+        record['label'] = args.label
+    write_record(path, record)
+    record_stage(task, telemetry.labels, output=args.output or args.json,
+                 input_bytes=input_size(args.input), read_bytes=record['read_chars'],
+                 wall_seconds=record['wall_seconds'],
+                 cpu_seconds=round(record['user_seconds'] + record['system_seconds'], 3),
+                 peak_rss_mb=record['peak_rss_mb'], exit_code=record['exit_code'], command=record['command'])
+    if not args.quiet:
+        print(f"[profile] {os.path.basename(args.command[0])}: {record['wall_seconds']}s wall, "
+              f"{record['user_seconds'] + record['system_seconds']:.1f}s CPU, {record['peak_rss_mb']} MB peak RSS "
+              f"-> {path}", file=sys.stderr)
+    sys.exit(record['exit_code'])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+#!/bin/bash
+
+# Sourced by the benchmark drivers: source "${SCRIPT_DIR}/profile_lib.sh"
+#
+# profile TOOL OUTPUT DATASET ANALYSIS INPUT... -- COMMAND...
+# Run a tool and record wall time, CPU, peak RSS and I/O to <output>.resources.json and, when
+# $OCTOPUSV_BENCH_RUN_DB is set, to the run database under its dataset, tool and analysis type.
+# The run database task is $PROFILE_TASK (default: merge).
+
+PROFILE_LIB_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+profile() {
+    local tool=$1 output=$2 dataset=$3 analysis=$4
+    shift 4
+    local inputs=()
+    while [[ $# -gt 0 && $1 != -- ]]; do
+        inputs+=(--input "$1")
+        shift
+    done
+    shift
+    python3 "${PROFILE_LIB_DIR}/profile_command.py" -o "$output" --task "${PROFILE_TASK:-merge}" "${inputs[@]}" \
+        --telemetry-label dataset="$dataset" --telemetry-label tool="$tool" \
+        --telemetry-label analysis="$analysis" -- "$@"
+}
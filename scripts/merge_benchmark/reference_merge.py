@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.instrument import Instrumentation, add_profile_argument
+from octopusv_bench.sv_merge import load_callset, merge_svs, write_merged_vcf
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="In-process reference SV merger (breakpoint distance, type, strand and size rules) "
+                    "writing SUPP/SUPP_VEC annotated VCFs.")
+    parser.add_argument("-i", "--inputs", nargs='+', required=True, help="Caller VCFs, e.g. the normalized copies")
+    parser.add_argument("--names", nargs='+', help="Sample column names (default: input file names)")
+    parser.add_argument("-o", "--output", required=True, help="Merged VCF")
+    parser.add_argument("--max-dist", type=int, default=1000,
+                        help="Maximum start and end breakpoint distance (default: 1000)")
+    parser.add_argument("--min-support", type=int, default=1,
+                        help="Minimum number of supporting callsets (default: 1)")
+    parser.add_argument("--min-size", type=int, default=30,
+                        help="Ignore intra-chromosomal SVs shorter than this (default: 30)")
+    parser.add_argument("--ignore-type", action="store_true", help="Merge calls of different SV types")
+    parser.add_argument("--ignore-strand", action="store_true", help="Merge calls with different strands")
+    add_profile_argument(parser)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    names = args.names or [os.path.basename(p).split('.')[0] for p in args.inputs]
+    if len(names) != len(args.inputs):
+        sys.stderr.write("Error: --names needs one name per input\n")
+        sys.exit(1)
+
+    inst = Instrumentation('reference_merge.py', args.profile)
+    with inst.phase('load') as phase:
+        svs = []
+        for callset, path in enumerate(args.inputs):
+            svs.extend(load_callset(path, callset, args.min_size))
+        phase['records'] = len(svs)
+    with inst.phase('merge') as phase:
+        clusters = merge_svs(svs, args.max_dist, not args.ignore_type, not args.ignore_strand)
+        phase['records'] = len(svs)
+    with inst.phase('write') as phase:
+        written = write_merged_vcf(args.output, svs, clusters, names, args.min_support)
+        phase['records'] = written
+
+    timings = inst.timings()
+    print(f"Loaded {len(svs)} SVs from {len(args.inputs)} callsets in {timings['load']['seconds']:.2f}s")
+    print(f"Built {len(clusters)} clusters in {timings['merge']['seconds']:.2f}s")
+    print(f"Wrote {written} records with SUPP >= {args.min_support} to {args.output} "
+          f"in {timings['write']['seconds']:.2f}s")
+    inst.finish(args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.run_db import RUN_DB_ENV, STAGE_KEY, connect, list_runs, latest_stages
+
+DEFAULT_TOLERANCE = 0.25
+# Differences below these are noise for short stages, whatever the ratio
+DEFAULT_MIN_SECONDS = 1.0
+DEFAULT_MIN_MB = 50.0
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compare the stage timings of a benchmark run with a baseline run from the run database "
+                    f"(${RUN_DB_ENV}) and flag stages that got slower or heavier. Exits with 1 on regressions.")
+    parser.add_argument("--db", default=os.environ.get(RUN_DB_ENV), help=f"Run database (default: ${RUN_DB_ENV})")
+    parser.add_argument("--run", help="Run to check (default: the most recently recorded run)")
+    parser.add_argument("--baseline", help="Run to compare against (default: the run recorded before --run)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed increase of wall time before a stage is flagged (default: 0.25 = 25%%)")
+    parser.add_argument("--rss-tolerance", type=float,
+                        help="Allowed increase of peak RSS before a stage is flagged (default: --tolerance)")
+    parser.add_argument("--min-seconds", type=float, default=DEFAULT_MIN_SECONDS,
+                        help=f"Ignore wall time increases smaller than this (default: {DEFAULT_MIN_SECONDS})")
+    parser.add_argument("--min-mb", type=float, default=DEFAULT_MIN_MB,
+                        help=f"Ignore peak RSS increases smaller than this (default: {DEFAULT_MIN_MB})")
+    parser.add_argument("-o", "--output", help="Also write the comparison as JSON")
+    parser.add_argument("--list", action="store_true", help="List the recorded runs and exit")
+    args = parser.parse_args()
+    if not args.db:
+        parser.error(f"no run database; pass --db or set ${RUN_DB_ENV}")
+    if args.rss_tolerance is None:
+        args.rss_tolerance = args.tolerance
+    return args
+
+def stage_name(key):
+    """task[dataset/tool/analysis] (output file name)"""
+    stage = dict(zip(STAGE_KEY, key))
+    labels = '/'.join(value for value in (stage['dataset'], stage['tool'], stage['analysis_type']) if value)
+    name = f"{stage['task']}[{labels}]" if labels else stage['task']
+    return f"{name} {os.path.basename(stage['output'])}" if stage['output'] else name
+
+def change(before, after):
+    if before is None or after is None:
+        return None
+    return after / before - 1 if before else None
+
+def compare_runs(baseline, current, args):
+    """
+    Per-stage wall time and peak RSS of two runs
+
+    Args:
+        baseline, current: stage key -> row, as returned by latest_stages
+
+    Returns:
+        list: One dict per stage in either run; 'flags' holds slower/heavier
+              (regressions), faster/lighter, input_changed, new or missing
+    """
+    rows = []
+    for key in list(baseline) + [key for key in current if key not in baseline]:
+        before, after = baseline.get(key), current.get(key)
+        row = {'stage': stage_name(key), 'key': dict(zip(STAGE_KEY, key)), 'flags': []}
+        if before is None or after is None:
+            row['flags'].append('new' if before is None else 'missing')
+            present = before or after
+            row.update(wall_seconds=present['wall_seconds'], peak_rss_mb=present['peak_rss_mb'])
+            rows.append(row)
+            continue
+        row.update(baseline_wall_seconds=before['wall_seconds'], wall_seconds=after['wall_seconds'],
+                   wall_change=change(before['wall_seconds'], after['wall_seconds']),
+                   baseline_peak_rss_mb=before['peak_rss_mb'], peak_rss_mb=after['peak_rss_mb'],
+                   rss_change=change(before['peak_rss_mb'], after['peak_rss_mb']),
+                   baseline_input_bytes=before['input_bytes'], input_bytes=after['input_bytes'])
+        for name, tolerance, floor, better in (('wall', args.tolerance, args.min_seconds, 'faster'),
+                                                ('rss', args.rss_tolerance, args.min_mb, 'lighter')):
+            column = 'wall_seconds' if name == 'wall' else 'peak_rss_mb'
+            delta = (after[column] or 0) - (before[column] or 0)
+            ratio = row[f"{name}_change"]
+            if ratio is None or abs(delta) < floor:
+                continue
+            if ratio > tolerance:
+                row['flags'].append('slower' if name == 'wall' else 'heavier')
+            elif ratio < -tolerance:
+                row['flags'].append(better)
+        if before['input_bytes'] != after['input_bytes']:
+            row['flags'].append('input_changed')
+        rows.append(row)
+    return rows
+
+def format_change(value):
+    return f"{value:+.0%}" if value is not None else ''
+
+def print_report(rows, run_id, baseline_id):
+    print(f"Run {run_id} against baseline {baseline_id}")
+    print(f"{'stage':<60}{'wall s':>10}{'base s':>10}{'change':>8}{'RSS MB':>10}{'base MB':>10}{'change':>8}  flags")
+    for row in rows:
+        print(f"{row['stage'][:59]:<60}{row['wall_seconds'] or 0:>10.1f}{row.get('baseline_wall_seconds') or 0:>10.1f}"
+              f"{format_change(row.get('wall_change')):>8}{row['peak_rss_mb'] or 0:>10.1f}"
+              f"{row.get('baseline_peak_rss_mb') or 0:>10.1f}{format_change(row.get('rss_change')):>8}  "
+              f"{','.join(row['flags'])}")
+
+def main():
+    args = parse_args()
+    if not os.path.exists(args.db):
+        sys.stderr.write(f"Error: run database {args.db} does not exist\n")
+        sys.exit(1)
+    db = connect(args.db)
+    runs = [row['run_id'] for row in list_runs(db)]
+    if args.list:
+        for row in list_runs(db):
+            print(f"{row['run_id']:<30}{row['stages']:>6} stages  {row['first']} .. {row['last']}  "
+                  f"revisions: {row['revisions'] or '-'}")
+        return
+
+    run_id = args.run or (runs[-1] if runs else None)
+    if run_id not in runs:
+        sys.stderr.write(f"Error: run '{run_id}' is not in {args.db}\n")
+        sys.exit(1)
+    baseline_id = args.baseline
+    if baseline_id is None:
+        earlier = runs[:runs.index(run_id)]
+        if not earlier:
+            print(f"No run before {run_id} in {args.db}; pass --baseline to choose one")
+            return
+        baseline_id = earlier[-1]
+    if baseline_id not in runs:
+        sys.stderr.write(f"Error: baseline run '{baseline_id}' is not in {args.db}\n")
+        sys.exit(1)
+
+    rows = compare_runs(latest_stages(db, baseline_id), latest_stages(db, run_id), args)
+    print_report(rows, run_id, baseline_id)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'run': run_id, 'baseline': baseline_id, 'tolerance': args.tolerance,
+                       'rss_tolerance': args.rss_tolerance, 'stages': rows}, f, indent=2)
+
+    regressions = [row for row in rows if {'slower', 'heavier'} & set(row['flags'])]
+    if regressions:
+        print(f"\nRegressions beyond {args.tolerance:.0%} wall / {args.rss_tolerance:.0%} RSS:")
+        for row in regressions:
+            print(f"  {row['stage']}: {row['baseline_wall_seconds']} -> {row['wall_seconds']} s "
+                  f"({format_change(row['wall_change'])}), {row['baseline_peak_rss_mb']} -> {row['peak_rss_mb']} MB "
+                  f"({format_change(row['rss_change'])})")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.tolerance:.0%} wall / {args.rss_tolerance:.0%} RSS")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.match_store import MatchStore
+
+DATASETS = ['NA12878_ngs', 'NA12878_pacbio', 'visor_ngs', 'visor_ont', 'visor_pacbio']
+DEFAULT_DB = 'variant_matches.db'
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Load per-variant benchmark results (truvari tp-base/tp-call/fp/fn, or compare_sv.py matches) "
+                    "into SQLite and answer cross-tool questions such as 'truth SVs found by octopusv but "
+                    "missed by jasmine' without rescanning the VCFs.")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"Match store (default: {DEFAULT_DB})")
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    commands.required = True
+
+    scan = commands.add_parser('scan', help="Load every <dataset>/evaluation/**/*_evaluation directory")
+    scan.add_argument("base_path", help="Merge benchmark directory holding the dataset directories")
+    scan.add_argument("--datasets", nargs='+', default=DATASETS, help="Datasets to load (default: all five)")
+
+    truvari = commands.add_parser('load-truvari', help="Load one truvari bench output directory")
+    truvari.add_argument("eval_dir")
+    truvari.add_argument("--dataset", required=True)
+    truvari.add_argument("--tool", required=True)
+    truvari.add_argument("--analysis", required=True, help="Analysis type, e.g. union, intersection or min2")
+
+    matches = commands.add_parser('load-matches', help="Load a compare_sv.py matches file")
+    matches.add_argument("matches_file")
+    matches.add_argument("--truth", required=True, help="Truth VCF the matches were made against")
+    matches.add_argument("--calls", help="Compared VCF, to also store its unmatched calls as fp")
+    matches.add_argument("--dataset", required=True)
+    matches.add_argument("--tool", required=True)
+    matches.add_argument("--analysis", default='correct', help="Analysis type (default: correct)")
+
+    runs = commands.add_parser('runs', help="List the loaded runs with found/missed counts")
+    runs.add_argument("--dataset")
+
+    query = commands.add_parser('query', help="Truth SVs found by all --found-by tools and missed by all --missed-by")
+    query.add_argument("--dataset", required=True)
+    query.add_argument("--analysis",
+                       help="Analysis type of the tools; TOOL:ANALYSIS overrides it (default: the analysis type "
+                            "of the dataset's loaded runs, when they all share one)")
+    query.add_argument("--found-by", nargs='+', default=[], metavar="TOOL")
+    query.add_argument("--missed-by", nargs='+', default=[], metavar="TOOL")
+    query.add_argument("-o", "--output", help="Write the variants as TSV here instead of stdout")
+    query.add_argument("--count", action="store_true", help="Only print the number of variants")
+    return parser.parse_args()
+
+def evaluation_dirs(evaluation_path):
+    """
+    (tool, analysis_type, path) of the truvari directories under <dataset>/evaluation
+
+    Layouts as in 17_summarize_results_to_excel_new.py:
+    <tool>/<union|intersection>/*_evaluation, <tool>/support_threshold/<minN>/*_evaluation
+    and combisv_4callers/merged_union_evaluation.
+    """
+    found = []
+    for root, dirs, _ in os.walk(evaluation_path):
+        for name in sorted(dirs):
+            if not name.endswith('_evaluation'):
+                continue
+            parts = os.path.relpath(os.path.join(root, name), evaluation_path).split(os.sep)
+            if len(parts) > 2:
+                analysis_type = parts[-2]
+            else:
+                analysis_type = name[:-len('_evaluation')].replace('merged_', '')
+            found.append((parts[0], analysis_type, os.path.join(root, name)))
+        # truvari outputs contain no further evaluation directories
+        dirs[:] = [name for name in dirs if not name.endswith('_evaluation')]
+    return sorted(found)
+
+def print_load(dataset, tool, analysis_type, counts):
+    print(f"{dataset:<16}{tool:<22}{analysis_type:<14}"
+          + '  '.join(f"{name}={count}" for name, count in counts.items()))
+
+def scan(store, args):
+    for dataset in args.datasets:
+        evaluation_path = os.path.join(args.base_path, dataset, 'evaluation')
+        if not os.path.exists(evaluation_path):
+            print(f"Warning: {evaluation_path} does not exist")
+            continue
+        for tool, analysis_type, eval_dir in evaluation_dirs(evaluation_path):
+            counts = store.load_truvari(eval_dir, dataset, tool, analysis_type)
+            if counts is None:
+                print(f"Warning: no truvari outputs in {eval_dir}")
+                continue
+            print_load(dataset, tool, analysis_type, counts)
+
+def list_runs(store, args):
+    print(f"{'dataset':<16}{'tool':<22}{'analysis':<14}{'source':<12}{'found':>8}{'missed':>8}{'tp':>8}{'fp':>8}")
+    for row in store.runs(args.dataset):
+        print(f"{row['dataset']:<16}{row['tool']:<22}{row['analysis_type']:<14}{row['source']:<12}"
+              f"{row['found']:>8}{row['missed']:>8}{row['tp_calls']:>8}{row['fp_calls']:>8}")
+
+def query(store, args):
+    analysis = args.analysis
+    if analysis is None and any(':' not in spec for spec in args.found_by + args.missed_by):
+        types = store.analysis_types(args.dataset)
+        if len(types) != 1:
+            loaded = f"runs of {', '.join(types)}" if types else "no runs"
+            sys.stderr.write(f"Error: --analysis is needed: {args.dataset} has {loaded} loaded\n")
+            sys.exit(1)
+        analysis = types[0]
+    start = time.perf_counter()
+    try:
+        rows = store.query(args.dataset, analysis, args.found_by, args.missed_by)
+    except KeyError as e:
+        sys.stderr.write(f"Error: {e.args[0]}\n")
+        sys.exit(1)
+    seconds = time.perf_counter() - start
+    if args.count:
+        print(len(rows))
+    else:
+        columns = ['chrom', 'pos', 'end', 'svtype', 'svlen', 'variant_key']
+        out = open(args.output, 'w') if args.output else sys.stdout
+        try:
+            out.write('\t'.join(columns) + '\n')
+            for row in rows:
+                out.write('\t'.join('' if row[column] is None else str(row[column]) for column in columns) + '\n')
+        finally:
+            if args.output:
+                out.close()
+    print(f"{len(rows)} truth variants in {seconds * 1000:.1f} ms", file=sys.stderr)
+
+def main():
+    args = parse_args()
+    store = MatchStore(args.db)
+    try:
+        if args.command == 'scan':
+            scan(store, args)
+        elif args.command == 'load-truvari':
+            counts = store.load_truvari(args.eval_dir, args.dataset, args.tool, args.analysis)
+            if counts is None:
+                sys.stderr.write(f"Error: no truvari tp-base/fn/tp-call/fp VCFs in {args.eval_dir}\n")
+                sys.exit(1)
+            print_load(args.dataset, args.tool, args.analysis, counts)
+        elif args.command == 'load-matches':
+            try:
+                counts = store.load_matches(args.matches_file, args.truth, args.dataset, args.tool,
+                                            args.analysis, args.calls)
+            except ValueError as e:
+                sys.stderr.write(f"Error: {e}\n")
+                sys.exit(1)
+            print_load(args.dataset, args.tool, args.analysis, counts)
+        elif args.command == 'runs':
+            list_runs(store, args)
+        else:
+            query(store, args)
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.consistency import Consistency, format_report
+from octopusv_bench.instrument import Instrumentation, add_profile_argument
+from octopusv_bench.telemetry import Telemetry, add_telemetry_arguments
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Consistency of records across VCFs, as truvari consistency reports it, from a single pass "
+                    "over each input: writes the intersection VCF, the text report and the JSON report together.")
+    parser.add_argument("vcfs", nargs='+', help="Input VCFs (plain or gzipped)")
+    parser.add_argument("-o", "--output", help="Intersection VCF: records present in every input, "
+                                               "with the header of the last input")
+    parser.add_argument("-r", "--report", help="Text report (default: stdout)")
+    parser.add_argument("-j", "--json", help="JSON report, as truvari consistency -j")
+    add_profile_argument(parser)
+    add_telemetry_arguments(parser)
+    args = parser.parse_args()
+    if len(args.vcfs) < 2:
+        parser.error("at least two VCFs are needed")
+    missing = [path for path in args.vcfs if not os.path.exists(path)]
+    if missing:
+        parser.error(f"input not found: {', '.join(missing)}")
+    return args
+
+def main():
+    args = parse_args()
+    with Telemetry.from_args('consistency', args) as telemetry:
+        telemetry.set_totals(bytes_read=sum(os.path.getsize(path) for path in args.vcfs))
+        telemetry.set_files(args.vcfs, args.output)
+        inst = Instrumentation('vcf_consistency.py', args.profile, telemetry)
+
+        with inst.phase('scan') as phase:
+            consistency = Consistency(args.vcfs)
+            if args.output:
+                with open(args.output, 'w') as out:
+                    consistency.scan(out, telemetry)
+            else:
+                consistency.scan(telemetry=telemetry)
+            phase['records'] = sum(consistency.calls_per_vcf)
+
+        with inst.phase('write') as phase:
+            output = consistency.report()
+            if args.report:
+                with open(args.report, 'w') as f:
+                    f.write(format_report(output))
+            else:
+                sys.stdout.write(format_report(output))
+            if args.json:
+                with open(args.json, 'w') as f:
+                    json.dump(output, f, indent=4)
+            phase['records'] = len(output['detailed'])
+    inst.finish(args.output or args.json or 'vcf_consistency')
+    print(f"{consistency.intersection} of {output['total_calls']} distinct calls are in all "
+          f"{len(args.vcfs)} VCFs", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import timeit
+import argparse
+import platform
+import tempfile
+from bisect import bisect_left
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, SCRIPTS_DIR)
+from octopusv_bench.cli import load_script
+from octopusv_bench.synthetic import Genome, generate_truth, generate_calls, truth_lines, caller_lines, dialect
+from octopusv_bench.sv_merge import load_callset, merge_svs, cluster_record
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_SIZES = [1000, 10000]
+DEFAULT_THRESHOLD = 0.25
+# find_unique_variants compares every pair of records, so it is capped
+QUADRATIC_MAX_SIZE = 2000
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Time the hot per-record functions on generated records and compare them with a stored baseline.")
+    parser.add_argument("--sizes", type=int, nargs='+', default=DEFAULT_SIZES,
+                        help=f"Input sizes in records (default: {' '.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument("--cases", nargs='+', help="Only run these cases (default: all)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repeats; the fastest is kept (default: 5)")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the generated records (default: 1)")
+    parser.add_argument("-o", "--output", help="Write the results as JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="Baseline JSON with one entry per host (default: baseline.json here)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store these results as this host's baseline, keeping other hosts' entries")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown per record before a case fails (default: 0.25 = 25%%)")
+    parser.add_argument("--list", action="store_true", help="List the cases and exit")
+    return parser.parse_args()
+
+def vcf_line(fields, extra=()):
+    chrom, pos, record_id, ref, alt, info = fields
+    return '\t'.join([chrom, str(pos), record_id, ref, alt, '.', 'PASS', info] + list(extra)) + '\n'
+
+class Records:
+    """Generated truth and caller lines for one size, built once and shared by the cases"""
+    def __init__(self, size, seed):
+        rng = random.Random(seed)
+        self.genome = Genome()
+        self.truth = generate_truth(rng, self.genome, size)
+        self.calls = generate_calls(random.Random(f"{seed}:calls"), self.truth, self.genome, sensitivity=1.0)[:size]
+        self.truth_lines = [vcf_line(fields) for sv in self.truth for fields in truth_lines(sv)][:size]
+        settings = dialect('manta')
+        self.call_lines = []
+        # (truth id or None, breakend number) of every call line, to pair it with its truth record
+        self.call_truth = []
+        for n, call in enumerate(self.calls):
+            for k, fields in enumerate(caller_lines(call, n, 'manta', settings)):
+                self.call_lines.append(vcf_line(fields, ['GT', '0/1']))
+                self.call_truth.append((call['truth_id'], k))
+        self.call_lines = self.call_lines[:size]
+        self.call_truth = self.call_truth[:size]
+        self.rng = random.Random(f"{seed}:cases")
+        # Scratch files for the file-based cases; removed after the size is done
+        self.tmpdir = tempfile.mkdtemp(prefix='microbench_')
+
+def case_parse_sv_line(records, modules):
+    parse_sv_line = modules['compare_sv'].parse_sv_line
+    lines = records.call_lines
+
+    def run():
+        for line in lines:
+            parse_sv_line(line)
+    return run, len(lines)
+
+def case_is_matching_sv(records, modules):
+    compare_sv = modules['compare_sv']
+    is_matching_sv = compare_sv.is_matching_sv
+    calls = list(compare_sv.parse_calls(records.call_lines))
+    # Truth events per truth id (both breakends of a TRA), parsed as compare_sv.py loads them
+    truth_by_id = {sv['id']: compare_sv.load_truth_events(vcf_line(fields) for fields in truth_lines(sv))
+                   for sv in records.truth}
+    by_chrom = {}
+    for events in truth_by_id.values():
+        for event in events:
+            by_chrom.setdefault(event['chrom'], []).append(event)
+    for events in by_chrom.values():
+        events.sort(key=lambda event: event['pos'])
+    positions = {chrom: [event['pos'] for event in events] for chrom, events in by_chrom.items()}
+
+    def nearest_truth(call):
+        """The truth event closest to a false positive call, as a tolerance window would offer"""
+        events = by_chrom.get(call['chrom'])
+        if not events:
+            return None
+        i = min(bisect_left(positions[call['chrom']], call['pos']), len(events) - 1)
+        return events[i]
+
+    # Each call against the truth record it was drawn from, false positives against their nearest one
+    pairs = []
+    for call, (truth_id, k) in zip(calls, records.call_truth):
+        if truth_id is not None:
+            events = truth_by_id[truth_id]
+            truth_sv = events[min(k, len(events) - 1)]
+        else:
+            truth_sv = nearest_truth(call)
+        if truth_sv is not None:
+            tolerance = compare_sv.TRA_TOLERANCE if call['svtype'] == 'TRA' else compare_sv.DEFAULT_TOLERANCE
+            pairs.append((call, truth_sv, tolerance))
+
+    def run():
+        for call, truth_sv, tolerance in pairs:
+            is_matching_sv(call, truth_sv, tolerance)
+    return run, len(pairs)
+
+def case_is_overlapping(records, modules):
+    is_overlapping = modules['extract_survivor_specific'].is_overlapping
+    variants = [{'chrom': sv['chrom'], 'start': sv['pos'], 'end': max(sv['end'], sv['pos'] + 1)}
+                for sv in records.calls]
+    pairs = list(zip(variants, variants[1:] + variants[:1]))
+
+    def run():
+        for a, b in pairs:
+            is_overlapping(a, b)
+    return run, len(pairs)
+
+def case_find_unique_variants(records, modules):
+    find_unique_variants = modules['extract_survivor_specific'].find_unique_variants
+    # Intervals only: breakends without END have zero length, which is_overlapping cannot divide by
+    def intervals(lines):
+        return [line for line in lines if 'SVTYPE=BND' not in line and 'SVTYPE=TRA' not in line][:QUADRATIC_MAX_SIZE]
+    survivor_lines, octopus_lines = intervals(records.call_lines), intervals(records.truth_lines)
+    n = len(survivor_lines)
+    paths = {}
+    for name, lines in (('survivor', survivor_lines), ('octopus', octopus_lines)):
+        paths[name] = os.path.join(records.tmpdir, f"{name}.vcf")
+        with open(paths[name], 'w') as f:
+            f.writelines(lines)
+    output = os.path.join(records.tmpdir, 'unique.vcf')
+
+    def run():
+        find_unique_variants(paths['survivor'], paths['octopus'], output)
+    return run, n
+
+def case_standardize_chrom_name(records, modules):
+    savior = modules['VCF_savior'].VCFSavior(None, None, '38')
+    chroms = [line.split('\t', 1)[0] for line in records.call_lines]
+    # Mix in bare and non-standard names so every branch is taken
+    chroms = [c[3:] if i % 3 == 0 else (f"{c}_random" if i % 7 == 0 else c) for i, c in enumerate(chroms)]
+
+    def run():
+        for chrom in chroms:
+            savior.standardize_chrom_name(chrom)
+    return run, len(chroms)
+
+def case_fix_svlen(records, modules):
+    savior = modules['VCF_savior'].VCFSavior(None, None, '38')
+    items = []
+    for i, line in enumerate(records.call_lines):
+        fields = line.split('\t')
+        info = fields[7]
+        if i % 2 and 'SVLEN=' in info:
+            # Half of the records lose SVLEN so the inference branch is timed too
+            info = ';'.join(item for item in info.split(';') if not item.startswith('SVLEN='))
+        items.append((info, fields[1]))
+
+    def run():
+        for info, pos in items:
+            savior.fix_svlen(info, pos)
+    return run, len(items)
+
+def case_fix_genotype_field(records, modules):
+    savior = modules['VCF_savior'].VCFSavior(None, None, '38')
+    variants = [('GT', '0/1'), ('GT:GQ:DR:DV', './.:12:3:4'), ('GQ:GT', '20:0/1'), ('DR:DV', '5:6')]
+    items = [variants[records.rng.randrange(len(variants))] for _ in records.call_lines]
+
+    def run():
+        for format_str, sample_str in items:
+            savior.fix_genotype_field(format_str, sample_str)
+    return run, len(items)
+
+def case_parse_variant_types(records, modules):
+    parse_variant_types = modules['how_many_survivor_fp'].parse_variant_types
+    svs = []
+    for callset, lines in enumerate((records.call_lines, records.truth_lines)):
+        path = os.path.join(records.tmpdir, f"callset{callset}.vcf")
+        with open(path, 'w') as f:
+            f.writelines(lines)
+        svs.extend(load_callset(path, callset))
+    names = ['caller', 'truth']
+    # SURVIVOR-style merged lines with per-sample TY fields
+    lines = ['\t'.join(cluster_record(svs, members, names)[1]) for members in merge_svs(svs, 1000)]
+    lines = lines[:len(records.call_lines)]
+
+    def run():
+        for line in lines:
+            parse_variant_types(line)
+    return run, len(lines)
+
+def case_generate_random_sequence(records, modules):
+    generate_random_sequence = modules['vcf2visor_bed_input'].generate_random_sequence
+    lengths = [sv['svlen'] for sv in records.truth if sv['svtype'] == 'INS'] or [100]
+    rng = random.Random(1)
+
+    def run():
+        for length in lengths:
+            generate_random_sequence(length, rng)
+    return run, len(lengths)
+
+CASES = {
+    'parse_sv_line': case_parse_sv_line,
+    'is_matching_sv': case_is_matching_sv,
+    'is_overlapping': case_is_overlapping,
+    'find_unique_variants': case_find_unique_variants,
+    'standardize_chrom_name': case_standardize_chrom_name,
+    'fix_svlen': case_fix_svlen,
+    'fix_genotype_field': case_fix_genotype_field,
+    'parse_variant_types': case_parse_variant_types,
+    'generate_random_sequence': case_generate_random_sequence,
+}
+
+def load_modules():
+    return {
+        'compare_sv': load_script('correct_benchmark/compare_sv.py', 'compare_sv'),
+        'extract_survivor_specific': load_script('merge_benchmark/1_extract_survivor_specific.py',
+                                                 'extract_survivor_specific'),
+        'how_many_survivor_fp': load_script('merge_benchmark/2_how_many_survivor_FP_counted_as_tp.py',
+                                            'how_many_survivor_fp'),
+        'VCF_savior': load_script('merge_benchmark/VCF_savior.py', 'VCF_savior'),
+        'vcf2visor_bed_input': load_script('truth_set_preparation/vcf2visor_bed_input.py', 'vcf2visor_bed_input'),
+    }
+
+def run_cases(names, sizes, repeat, seed):
+    """
+    Time every case at every size
+
+    Returns:
+        dict: case -> size (as str) -> ops, best_seconds and ns_per_op
+    """
+    modules = load_modules()
+    results = {name: {} for name in names}
+    for size in sizes:
+        records = Records(size, seed)
+        try:
+            for name in names:
+                run, ops = CASES[name](records, modules)
+                best = min(timeit.repeat(run, repeat=repeat, number=1))
+                results[name][str(size)] = {
+                    'ops': ops,
+                    'best_seconds': round(best, 6),
+                    'ns_per_op': round(best / ops * 1e9, 1) if ops else None
+                }
+                print(f"{name:<26} n={size:<8} {ops:>8} ops  {best:9.4f}s  "
+                      f"{results[name][str(size)]['ns_per_op']:>12} ns/op")
+        finally:
+            shutil.rmtree(records.tmpdir, ignore_errors=True)
+    return results
+
+def load_baselines(path):
+    """Baselines by host name"""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def compare_with_baseline(results, baseline, threshold):
+    """
+    Cases slower per record than baseline * (1 + threshold)
+
+    Returns:
+        list: (case, size, baseline ns/op, current ns/op)
+    """
+    regressions = []
+    for name, by_size in results.items():
+        for size, current in by_size.items():
+            reference = baseline.get('results', {}).get(name, {}).get(size)
+            if not reference or not reference.get('ns_per_op') or current['ns_per_op'] is None:
+                continue
+            if current['ns_per_op'] > reference['ns_per_op'] * (1 + threshold):
+                regressions.append((name, size, reference['ns_per_op'], current['ns_per_op']))
+    return regressions
+
+def main():
+    args = parse_args()
+    if args.list:
+        print('\n'.join(CASES))
+        return
+    names = args.cases or list(CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        sys.stderr.write(f"Error: unknown cases: {', '.join(unknown)}\n")
+        sys.exit(1)
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.node(),
+            'repeat': args.repeat,
+            'seed': args.seed
+        },
+        'results': run_cases(names, args.sizes, args.repeat, args.seed)
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    # Timings only compare on the machine that produced them
+    host = report['meta']['machine']
+    baselines = load_baselines(args.baseline)
+    if args.save_baseline:
+        baselines[host] = report
+        with open(args.baseline, 'w') as f:
+            json.dump(baselines, f, indent=2)
+        print(f"Baseline for {host} saved to {args.baseline}")
+        return
+    if host not in baselines:
+        others = ', '.join(sorted(str(name) for name in baselines)) or 'none'
+        print(f"No baseline for {host} in {args.baseline} (hosts: {others}); "
+              f"run with --save-baseline on this machine to create one")
+        return
+
+    baseline = baselines[host]
+    regressions = compare_with_baseline(report['results'], baseline, args.threshold)
+    if regressions:
+        print(f"\nRegressions beyond {args.threshold:.0%} against {args.baseline}:")
+        for name, size, before, after in regressions:
+            print(f"  {name} n={size}: {before} -> {after} ns/op ({after / before - 1:+.0%})")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+import zlib
+import struct
+
+BGZF_MAGIC = b'\x1f\x8b\x08\x04'
+# Same payload limit as htslib so compressed blocks stay below 64 KiB
+MAX_BLOCK_DATA = 0xff00
+BGZF_EOF = bytes.fromhex('1f8b08040000000000ff0600424302001b0003000000000000000000')
+
+def is_bgzf(path):
+    """Check whether a file starts with a BGZF block header"""
+    with open(path, 'rb') as f:
+        header = f.read(18)
+    return len(header) == 18 and header[:4] == BGZF_MAGIC and header[12:14] == b'BC'
+
+def block_size(f, offset, path=''):
+    """
+    Compressed size of the BGZF block starting at offset
+
+    Returns:
+        int: Block size in bytes, or None at end of file
+    """
+    f.seek(offset)
+    header = f.read(12)
+    if not header:
+        return None
+    if len(header) < 12 or header[:4] != BGZF_MAGIC:
+        raise ValueError(f"{path} is not BGZF-compressed (bad block at offset {offset})")
+    xlen = struct.unpack('<H', header[10:12])[0]
+    extra = f.read(xlen)
+    i = 0
+    while i + 4 <= len(extra):
+        slen = struct.unpack('<H', extra[i + 2:i + 4])[0]
+        if extra[i:i + 2] == b'BC' and slen == 2:
+            return struct.unpack('<H', extra[i + 4:i + 6])[0] + 1
+        i += 4 + slen
+    raise ValueError(f"{path} has a gzip member without BSIZE at offset {offset}")
+
+def block_offsets(path):
+    """
+    List the BGZF blocks of a file without decompressing them
+
+    Returns:
+        list: (compressed offset, compressed size) per block
+    """
+    blocks = []
+    with open(path, 'rb') as f:
+        offset = 0
+        while True:
+            size = block_size(f, offset, path)
+            if size is None:
+                break
+            blocks.append((offset, size))
+            offset += size
+    return blocks
+
+def compress_block(data):
+    """Compress up to MAX_BLOCK_DATA bytes into one BGZF block"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    deflated = compressor.compress(data) + compressor.flush()
+    header = BGZF_MAGIC + b'\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00' + struct.pack('<H', len(deflated) + 25)
+    return header + deflated + struct.pack('<II', zlib.crc32(data) & 0xffffffff, len(data))
+
+def write_blocks(f, data):
+    """Write data to an open binary file as BGZF blocks (no EOF marker)"""
+    for start in range(0, len(data), MAX_BLOCK_DATA):
+        f.write(compress_block(data[start:start + MAX_BLOCK_DATA]))
+
+def read_block(f, offset, size):
+    """Decompress one BGZF block from an open binary file"""
+    f.seek(offset)
+    return zlib.decompress(f.read(size), 31)
+
+def split_blocks(blocks, parts):
+    """Split a block list into at most `parts` contiguous (start, end) ranges"""
+    parts = max(1, min(parts, len(blocks)))
+    step, extra = divmod(len(blocks), parts)
+    ranges = []
+    start = 0
+    for n in range(parts):
+        end = start + step + (1 if n < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+def ends_with_newline(f, blocks, start):
+    """Whether the data before blocks[start] ends on a line boundary"""
+    for k in range(start - 1, -1, -1):
+        data = read_block(f, *blocks[k])
+        if data:
+            return data.endswith(b'\n')
+    return True
+
+def iter_range_lines(path, blocks, start, end):
+    """
+    Yield the text lines that start inside blocks[start:end]
+
+    A line crossing the end of the range is completed from the following
+    blocks; a line crossing the start belongs to the previous range and is
+    skipped, so consecutive ranges together yield every line exactly once.
+    """
+    with open(path, 'rb') as f:
+        skip = start > 0 and not ends_with_newline(f, blocks, start)
+        pending = b''
+        for k in range(start, len(blocks)):
+            data = read_block(f, *blocks[k])
+            if k >= end:
+                # Past the range: only finish the line that is already started
+                if not pending:
+                    break
+                cut = data.find(b'\n')
+                if cut < 0:
+                    pending += data
+                    continue
+                pending += data[:cut + 1]
+                break
+            if skip:
+                cut = data.find(b'\n')
+                if cut < 0:
+                    continue
+                data = data[cut + 1:]
+                skip = False
+            data = pending + data
+            cut = data.rfind(b'\n')
+            if cut < 0:
+                pending = data
+                continue
+            pending = data[cut + 1:]
+            yield from data[:cut + 1].decode().splitlines(True)
+        if pending:
+            yield pending.decode()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+from octopusv_bench.breakends import pair_breakends
+
+class BreakendIndex:
+    """
+    Two-sided breakend events keyed by (chrom1, chrom2)
+
+    Events of each chromosome pair are kept sorted by their first-side
+    position, so a lookup is a binary search on side one followed by a
+    window check on side two instead of a scan over all events.
+    """
+    def __init__(self):
+        self.pending = defaultdict(list)
+        self.sides = {}
+
+    def add(self, chrom1, pos1, chrom2, pos2, item):
+        """Add one event; item is returned by matching queries"""
+        key = (chrom1, chrom2)
+        self.pending[key].append((pos1, pos2, item))
+        self.sides.pop(key, None)
+
+    def build(self, key):
+        entries = sorted(self.pending.get(key, []), key=lambda e: e[0])
+        side = ([e[0] for e in entries], [e[1] for e in entries], [e[2] for e in entries])
+        self.sides[key] = side
+        return side
+
+    def query(self, chrom1, pos1, chrom2, pos2, tolerance1, tolerance2):
+        """
+        Find events whose two breakpoints both fall inside the given windows
+
+        Returns:
+            list: Items of matching events, ordered by first-side position
+        """
+        key = (chrom1, chrom2)
+        if key not in self.pending:
+            return []
+        side = self.sides.get(key) or self.build(key)
+        positions1, positions2, items = side
+        lo = bisect_left(positions1, pos1 - tolerance1)
+        hi = bisect_right(positions1, pos1 + tolerance1)
+        return [items[k] for k in range(lo, hi) if abs(positions2[k] - pos2) <= tolerance2]
+
+    def __len__(self):
+        return sum(len(entries) for entries in self.pending.values())
+
+def breakend_events(breakends):
+    """
+    Group breakend records into two-sided events
+
+    Args:
+        breakends (list): Breakend dicts from breakends.parse_breakend_record
+    Returns:
+        list: (record index, mate record index or None) per event, in record order
+    """
+    mates = pair_breakends(breakends)
+    events = []
+    for i, mate in enumerate(mates):
+        if mate is None or i < mate:
+            events.append((i, mate))
+    return events
+
+def index_breakend_events(breakends):
+    """
+    Build a BreakendIndex holding every event under both orientations
+
+    Items are (record index, mate record index or None) tuples, so a query
+    from either side of a translocation finds the same event.
+    """
+    index = BreakendIndex()
+    for event in breakend_events(breakends):
+        bnd = breakends[event[0]]
+        if bnd['mate_chrom'] is None:
+            continue
+        index.add(bnd['chrom'], bnd['pos'], bnd['mate_chrom'], bnd['mate_pos'], event)
+        index.add(bnd['mate_chrom'], bnd['mate_pos'], bnd['chrom'], bnd['pos'], event)
+    return index
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+
+import re
+
+# Bracket notation from the VCF spec: t[p[, t]p], ]p]t and [p[t
+BND_ALT_PATTERN = re.compile(r'([\[\]])([^\[\]:]+):(\d+)\1')
+
+def parse_info(info_field):
+    """Parse an INFO column into a dict, flags map to True"""
+    info = {}
+    if info_field == '.':
+        return info
+    for item in info_field.split(';'):
+        if '=' in item:
+            key, val = item.split('=', 1)
+            info[key] = val
+        else:
+            info[item] = True
+    return info
+
+def parse_breakend_alt(alt):
+    """
+    Parse a bracket-notation ALT allele
+
+    Args:
+        alt (str): ALT column
+    Returns:
+        tuple: (mate_chrom, mate_pos, orientation) or None if alt is not a breakend.
+            Orientation uses the 3to5/5to3/3to3/5to5 connection types:
+            t[p[ -> 3to5, t]p] -> 3to3, ]p]t -> 5to3, [p[t -> 5to5
+    """
+    match = BND_ALT_PATTERN.search(alt)
+    if not match:
+        return None
+    bracket, mate_chrom, mate_pos = match.group(1), match.group(2), int(match.group(3))
+    if match.start() == 0:
+        orientation = '5to5' if bracket == '[' else '5to3'
+    else:
+        orientation = '3to5' if bracket == '[' else '3to3'
+    return mate_chrom, mate_pos, orientation
+
+def fill_mate_from_alt(sv, strip_chr=False):
+    """
+    Take chr2/end of a TRA record without CHR2 from its bracket ALT allele
+
+    Args:
+        sv (dict): Parsed SV with 'svtype', 'chr2', 'end' and the raw 'line'
+        strip_chr (bool): Remove a 'chr' prefix from the mate chromosome
+    Returns:
+        dict: The same sv, updated in place
+    """
+    if sv['svtype'] != 'TRA' or sv['chr2'] is not None:
+        return sv
+    fields = sv['line'].split('\t')
+    parsed = parse_breakend_alt(fields[4]) if len(fields) > 4 else None
+    if parsed is not None:
+        mate_chrom, mate_pos, _ = parsed
+        sv['chr2'] = mate_chrom.replace('chr', '') if strip_chr else mate_chrom
+        sv['end'] = mate_pos
+    return sv
+
+def classify_breakend(chrom, pos, mate_chrom, mate_pos, orientation):
+    """
+    Derive the SV class implied by a breakend and its mate
+
+    Returns:
+        str: TRA for inter-chromosomal joins, INV/DEL/DUP for intra-chromosomal
+            joins with a known orientation, BND otherwise
+    """
+    if mate_chrom is None:
+        return 'BND'
+    if mate_chrom != chrom:
+        return 'TRA'
+    if orientation in ('3to3', '5to5'):
+        return 'INV'
+    downstream = mate_pos >= pos
+    if orientation == '3to5':
+        return 'DEL' if downstream else 'DUP'
+    if orientation == '5to3':
+        return 'DUP' if downstream else 'DEL'
+    return 'BND'
+
+def parse_breakend_record(fields, info=None, svtypes=('BND',)):
+    """
+    Extract breakend attributes from a split VCF data line
+
+    Mate coordinates come from the bracket ALT when present, otherwise from
+    CHR2/END in INFO (as written by callers that do not use bracket notation).
+
+    Args:
+        fields (list): Split VCF data line
+        info (dict): Parsed INFO column, parsed from fields when omitted
+        svtypes (tuple): SVTYPE values treated as breakends without a bracket ALT
+    Returns:
+        dict: Breakend attributes, or None if the record is not a breakend
+    """
+    if info is None:
+        info = parse_info(fields[7])
+    parsed = parse_breakend_alt(fields[4])
+    if parsed is None and info.get('SVTYPE') not in svtypes:
+        return None
+
+    chrom = fields[0]
+    pos = int(fields[1])
+    if parsed is not None:
+        mate_chrom, mate_pos, orientation = parsed
+    else:
+        mate_chrom = info.get('CHR2')
+        end = info.get('END')
+        mate_pos = int(end) if end is not None and end.isdigit() else None
+        orientation = info.get('CT', '.')
+        if mate_pos is None:
+            mate_chrom = None
+
+    return {
+        'id': fields[2],
+        'chrom': chrom,
+        'pos': pos,
+        'mate_chrom': mate_chrom,
+        'mate_pos': mate_pos,
+        'orientation': orientation,
+        'mate_id': info.get('MATEID', '.'),
+        'sv_class': classify_breakend(chrom, pos, mate_chrom, mate_pos, orientation)
+    }
+
+def pair_breakends(breakends):
+    """
+    Pair breakend records into two-sided events
+
+    Records are paired through MATEID first and then through reciprocal
+    coordinates (mate of A is B's position and vice versa).
+
+    Args:
+        breakends (list): Breakend dicts as returned by parse_breakend_record
+    Returns:
+        list: Index of the mate for every breakend, or None if unpaired
+    """
+    mates = [None] * len(breakends)
+    by_id = {}
+    by_position = {}
+    for i, bnd in enumerate(breakends):
+        if bnd['id'] != '.':
+            by_id.setdefault(bnd['id'], i)
+        by_position.setdefault((bnd['chrom'], bnd['pos']), []).append(i)
+
+    for i, bnd in enumerate(breakends):
+        if mates[i] is not None:
+            continue
+        j = None
+        if bnd['mate_id'] != '.':
+            j = by_id.get(bnd['mate_id'])
+        if j is None and bnd['mate_chrom'] is not None:
+            for k in by_position.get((bnd['mate_chrom'], bnd['mate_pos']), []):
+                other = breakends[k]
+                if k != i and mates[k] is None and \
+                   other['mate_chrom'] == bnd['chrom'] and other['mate_pos'] == bnd['pos']:
+                    j = k
+                    break
+        if j is not None and j != i and mates[j] is None:
+            mates[i] = j
+            mates[j] = i
+    return mates
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+
+import os
+import gzip
+import shutil
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from octopusv_bench.bgzf import is_bgzf, block_offsets, split_blocks, iter_range_lines
+
+def default_threads():
+    return os.cpu_count() or 1
+
+def plan_chunks(path, parts):
+    """
+    Split a VCF into independent chunks that start on line boundaries
+
+    Plain files are split into byte ranges, BGZF files into block ranges.
+    Other gzip files cannot be split and form a single chunk.
+
+    Returns:
+        list: Chunk descriptors understood by iter_chunk_lines
+    """
+    if path.endswith('.gz'):
+        if parts > 1 and is_bgzf(path):
+            blocks = block_offsets(path)
+            return [('bgzf', path, blocks, start, end) for start, end in split_blocks(blocks, parts)]
+        return [('gzip', path)]
+
+    size = os.path.getsize(path)
+    parts = max(1, min(parts, size))
+    boundaries = [0]
+    with open(path, 'rb') as f:
+        for n in range(1, parts):
+            f.seek(max(size * n // parts, boundaries[-1]))
+            if f.tell() > 0:
+                f.seek(f.tell() - 1)
+                f.readline()
+            boundaries.append(min(f.tell(), size))
+    boundaries.append(size)
+    return [('text', path, start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+def iter_chunk_lines(chunk):
+    """Yield the text lines of one chunk"""
+    kind, path = chunk[0], chunk[1]
+    if kind == 'bgzf':
+        yield from iter_range_lines(path, *chunk[2:])
+    elif kind == 'gzip':
+        with gzip.open(path, 'rt') as f:
+            yield from f
+    else:
+        start, end = chunk[2], chunk[3]
+        with open(path, 'rb') as f:
+            f.seek(start)
+            position = start
+            while position < end:
+                line = f.readline()
+                if not line:
+                    break
+                position += len(line)
+                yield line.decode()
+
+def read_header(path):
+    """Return the header lines ('#' prefixed, newline kept) of a VCF"""
+    opener = gzip.open if path.endswith('.gz') else open
+    header = []
+    with opener(path, 'rt') as f:
+        for line in f:
+            if not line.startswith('#'):
+                break
+            header.append(line)
+    return header
+
+def chunk_bytes(chunk):
+    """Bytes of the input file covered by a chunk (compressed bytes for gzip/BGZF)"""
+    kind, path = chunk[0], chunk[1]
+    if kind == 'bgzf':
+        blocks, start, end = chunk[2:]
+        return sum(size for _, size in blocks[start:end])
+    if kind == 'gzip':
+        return os.path.getsize(path)
+    return chunk[3] - chunk[2]
+
+def run_chunks(chunk_fn, jobs, threads, telemetry=None):
+    """
+    Run chunk_fn over jobs, in a process pool when there is more than one
+
+    chunk_fn returns (result, data lines read). With telemetry, progress is
+    reported as each chunk finishes, in job order.
+    """
+    def report(job, result):
+        result, records = result
+        if telemetry is not None:
+            telemetry.advance(records, chunk_bytes(job[0]))
+        return result
+
+    if len(jobs) == 1 or threads <= 1:
+        return [report(job, chunk_fn(job)) for job in jobs]
+    with ProcessPoolExecutor(max_workers=min(threads, len(jobs))) as pool:
+        return [report(job, result) for job, result in zip(jobs, pool.map(chunk_fn, jobs))]
+
+def map_chunk(job):
+    chunk, record_fn = job
+    counts = Counter()
+    outputs = []
+    records = 0
+    for line in iter_chunk_lines(chunk):
+        if line.startswith('#'):
+            continue
+        records += 1
+        out = record_fn(line, counts)
+        if out is not None:
+            outputs.append(out)
+    return (outputs, counts), records
+
+def map_records(path, record_fn, threads=None, telemetry=None):
+    """
+    Apply record_fn(line, counts) to every data line of a VCF in parallel
+
+    record_fn must be picklable (a module-level function or a partial of one).
+    It may increment the Counter it is given and may return a string to keep.
+
+    Returns:
+        tuple: (returned strings in file order, summed Counter)
+    """
+    threads = threads or default_threads()
+    results = run_chunks(map_chunk, [(chunk, record_fn) for chunk in plan_chunks(path, threads)], threads, telemetry)
+    outputs = []
+    counts = Counter()
+    for chunk_outputs, chunk_counts in results:
+        outputs.extend(chunk_outputs)
+        counts.update(chunk_counts)
+    return outputs, counts
+
+def transform_chunk(job):
+    chunk, record_fn, part_path = job
+    counts = Counter()
+    records = 0
+    with open(part_path, 'w') as out:
+        for line in iter_chunk_lines(chunk):
+            if line.startswith('#'):
+                continue
+            records += 1
+            new_line = record_fn(line, counts)
+            if new_line is not None:
+                out.write(new_line)
+    return counts, records
+
+def transform_vcf(path, output, record_fn, threads=None, header_fn=None, telemetry=None):
+    """
+    Rewrite a VCF with record_fn(line, counts) applied to every data line
+
+    Chunks are written to part files by the workers and concatenated in
+    order after the header. record_fn returns the new line including its
+    newline, or None to drop the record. header_fn(header, counts) runs after
+    the records, so the header may depend on what the records contained.
+
+    Returns:
+        Counter: Counts summed over all chunks
+    """
+    threads = threads or default_threads()
+    chunks = plan_chunks(path, threads)
+    parts = [f"{output}.part{n}" for n in range(len(chunks))]
+    counts = Counter()
+    try:
+        jobs = [(c, record_fn, p) for c, p in zip(chunks, parts)]
+        for chunk_counts in run_chunks(transform_chunk, jobs, threads, telemetry):
+            counts.update(chunk_counts)
+        header = read_header(path)
+        if header_fn is not None:
+            header = header_fn(header, counts)
+        with open(output, 'w') as out:
+            out.writelines(header)
+            for part in parts:
+                with open(part, 'r') as f:
+                    shutil.copyfileobj(f, out, 1024 * 1024)
+    finally:
+        for part in parts:
+            if os.path.exists(part):
+                os.remove(part)
+    return counts
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import runpy
+import argparse
+import importlib.util
+from functools import partial
+from itertools import chain
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Subcommand -> (script under scripts/, help). A script is only loaded when its subcommand runs.
+COMMANDS = {
+    'prep-truth': ('truth_set_preparation/merge_truth_vcfs.py', 'Merge and deduplicate truth VCFs'),
+    'fix': ('truth_set_preparation/fix_vcf_pipeline.py', 'Fix a VCF for Truvari with composable rules'),
+    'compare': ('correct_benchmark/compare_sv.py', 'Compare corrected SVs against a truth VCF'),
+    'daemon': ('correct_benchmark/bench_daemon.py', 'Serve compare jobs with the truth indexes kept in memory'),
+    'consistency': ('merge_benchmark/vcf_consistency.py',
+                    'Intersection VCF and truvari-style consistency reports in one pass'),
+    'survivor-specific': ('merge_benchmark/1_extract_survivor_specific.py',
+                          'Extract the SURVIVOR calls missing from the OctopusV merge'),
+    'summarize': ('merge_benchmark/17_summarize_results_to_excel_new.py',
+                  'Collect the truvari summaries into benchmark_results_summary.xlsx'),
+    'plot': ('merge_benchmark/18_heatmap_for_results.py', 'Draw the merge benchmark heatmap'),
+    'timings': ('merge_benchmark/run_timing_report.py',
+                'Compare stage timings in the run database with a baseline run'),
+    'matches': ('merge_benchmark/variant_match_store.py',
+                'Load per-variant results into SQLite and run cross-tool queries'),
+}
+
+def load_script(relative_path, name):
+    """Import a pipeline script by path (several start with a digit)"""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(SCRIPTS_DIR, relative_path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def run_script(relative_path, argv):
+    """Run a pipeline script as __main__, exactly as if it had been called with argv"""
+    path = os.path.join(SCRIPTS_DIR, relative_path)
+    saved_argv = sys.argv
+    sys.argv = [path] + argv
+    # python3 <script> puts the script's directory first on sys.path
+    sys.path.insert(0, os.path.dirname(path))
+    try:
+        runpy.run_path(path, run_name='__main__')
+    finally:
+        sys.argv = saved_argv
+        sys.path.remove(os.path.dirname(path))
+
+def tee_lines(lines, path=None):
+    """Pass lines through, also writing them to path when one is given"""
+    if path is None:
+        yield from lines
+        return
+    with open(path, 'w') as out:
+        for line in lines:
+            out.write(line)
+            yield line
+
+def call_set_name(path):
+    name = os.path.basename(path)
+    for suffix in ('.gz', '.vcf', '.svcf'):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return name
+
+def parse_run_args(argv):
+    parser = argparse.ArgumentParser(
+        prog='octopusv-bench run',
+        description="Chain prep-truth, fix and compare in one process. The merged truth is parsed and indexed "
+                    "once and shared by every call set, and fixed records go straight to the comparison "
+                    "instead of through intermediate files.")
+    parser.add_argument("--truth", nargs='+', required=True,
+                        help="Truth VCF(s); several are merged and deduplicated as in prep-truth")
+    parser.add_argument("--calls", nargs='+', required=True, help="Corrected SVCF/VCF files to compare")
+    parser.add_argument("--names", nargs='+', help="Output name per call set (default: file name without extension)")
+    parser.add_argument("-o", "--output-dir", required=True,
+                        help="Writes <name>_matches.txt, <name>_statistics.log, <name>_metrics.json/.tsv, "
+                             "<name>_fix.json and truth.stats.json")
+    parser.add_argument("--sort", action="store_true", help="Sort the truth inputs in memory first")
+    parser.add_argument("-r", "--rules", help="Comma-separated fix rules (default: as in fix)")
+    parser.add_argument("--skip", default='', help="Comma-separated fix rules to leave out")
+    parser.add_argument("-g", "--genome", choices=['37', '38'], help="Genome version for chrom_rename")
+    parser.add_argument("-t", "--threads", type=int, default=1, help="Worker processes for the fix step (default: 1)")
+    parser.add_argument("--tolerance", type=int, nargs='+', default=[50],
+                        help="Position tolerance(s) for non-TRA events (default: 50)")
+    parser.add_argument("--tra-tolerance", type=int, default=5000,
+                        help="Position tolerance for TRA events (default: 5000)")
+    parser.add_argument("--one-to-one", action="store_true", help="Also report one-to-one matching")
+    parser.add_argument("--keep-intermediates", action="store_true",
+                        help="Also write truth_merged.vcf and <name>_fixed.vcf")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile with cProfile and tracemalloc; writes run.timing.json and run.pstats")
+    args = parser.parse_args(argv)
+    if args.names and len(args.names) != len(args.calls):
+        parser.error("--names needs one name per --calls file")
+    return args
+
+def run_chain(argv):
+    """The 'run' subcommand: prep-truth -> fix -> compare with the records kept in memory"""
+    from octopusv_bench.chunked import map_records, read_header
+    from octopusv_bench.instrument import Instrumentation
+    from octopusv_bench.truth_index import TruthIndex
+    from octopusv_bench.vcf_rules import build_rules, fix_vcf_records, fix_vcf_header
+
+    args = parse_run_args(argv)
+    merge_truth = load_script(COMMANDS['prep-truth'][0], 'merge_truth_vcfs')
+    fix_pipeline = load_script(COMMANDS['fix'][0], 'fix_vcf_pipeline')
+    compare_sv = load_script(COMMANDS['compare'][0], 'compare_sv')
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    output = partial(os.path.join, args.output_dir)
+    names = args.names or [call_set_name(path) for path in args.calls]
+    inst = Instrumentation('octopusv-bench run', args.profile)
+
+    try:
+        rules = build_rules(fix_pipeline.select_rules(args.rules, args.skip, args.genome), args.genome)
+        with inst.phase('load') as phase:
+            header, records, stats = merge_truth.merged_records(args.truth, args.sort)
+            truth_lines = ('\t'.join(fields) + '\n' for fields in records)
+            if args.keep_intermediates:
+                truth_lines = tee_lines(chain((line + '\n' for line in header), truth_lines),
+                                        output('truth_merged.vcf'))
+            truth_events = compare_sv.load_truth_events(truth_lines)
+            phase['records'] = len(truth_events)
+    except ValueError as e:
+        sys.stderr.write(f"Error: {e}\n")
+        sys.exit(1)
+    merge_truth.write_stats(stats, output('truth.stats.json'))
+
+    with inst.phase('index') as phase:
+        truth_index = TruthIndex(truth_events, args.tra_tolerance)
+        phase['records'] = len(truth_events)
+
+    for calls, name in zip(args.calls, names):
+        with inst.phase('fix') as phase:
+            fixed_lines, counts = map_records(calls, partial(fix_vcf_records, rules), args.threads)
+            phase['records'] += len(fixed_lines)
+            fixed_path = output(f"{name}_fixed.vcf") if args.keep_intermediates else None
+            if fixed_path:
+                with open(fixed_path, 'w') as out:
+                    out.writelines(fix_vcf_header(rules, read_header(calls), counts))
+                    out.writelines(fixed_lines)
+
+        with open(output(f"{name}_fix.json"), 'w') as f:
+            json.dump(fix_pipeline.rule_report(calls, fixed_path, rules, counts), f, indent=2)
+
+        corrected_records, summaries = compare_sv.compare_calls(
+            compare_sv.parse_calls(fixed_lines), truth_events, truth_index, output(f"{name}_matches.txt"),
+            args.tolerance, args.tra_tolerance, args.one_to_one, inst)
+
+        with inst.phase('write') as phase:
+            compare_sv.write_log(output(f"{name}_statistics.log"), summaries[0])
+            compare_sv.write_metrics_json(output(f"{name}_metrics.json"), calls, ','.join(args.truth),
+                                          corrected_records, len(truth_events), summaries, inst.timings())
+            compare_sv.write_metrics_tsv(output(f"{name}_metrics.tsv"), summaries)
+            phase['records'] += len(summaries)
+        print(f"{name}: {summaries[0]['matched']} of {corrected_records} calls matched", file=sys.stderr)
+
+    inst.finish(output('run'))
+
+def parse_args(argv=None):
+    commands = '\n'.join(f"  {name:<19}{help_text}" for name, (_, help_text) in COMMANDS.items())
+    parser = argparse.ArgumentParser(
+        prog='octopusv-bench',
+        description="Run the OctopusV benchmark steps. Arguments after the subcommand go to its script; "
+                    "use '<subcommand> --help' for them.",
+        epilog=f"subcommands:\n{commands}\n  {'run':<19}Chain prep-truth, fix and compare in memory",
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=list(COMMANDS) + ['run'], metavar='subcommand')
+    parser.add_argument("args", nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'run':
+        run_chain(args.args)
+    else:
+        run_script(COMMANDS[args.command][0], args.args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+import gzip
+import hashlib
+from collections import Counter
+
+# 12-byte digests keep the key table small on the six-caller sets; collisions are negligible
+DIGEST_SIZE = 12
+
+def open_vcf(path):
+    return gzip.open(path, 'rt') if path.endswith('.gz') else open(path, 'r')
+
+def identity_key(line):
+    """Digest of CHROM, POS, ID, REF and ALT, the fields truvari consistency compares"""
+    return hashlib.blake2b('\t'.join(line.split('\t', 5)[:5]).encode(), digest_size=DIGEST_SIZE).digest()
+
+class Consistency:
+    """
+    Presence of every distinct record across several VCFs, from one pass over each
+
+    presence maps an identity key to a bitmask of the inputs holding it.
+    Records of the last input whose key is already in every other input
+    make up the intersection, so they can be written while that input is
+    read instead of in a second pass.
+    """
+    def __init__(self, vcfs):
+        self.vcfs = list(vcfs)
+        self.presence = {}
+        self.calls_per_vcf = [0] * len(self.vcfs)
+        self.intersection = 0
+
+    def scan(self, intersection_out=None, telemetry=None):
+        """
+        Read every input once, writing the intersection records (with the last input's header)
+
+        Returns:
+            Consistency: self
+        """
+        others = (1 << (len(self.vcfs) - 1)) - 1
+        last = len(self.vcfs) - 1
+        for i, path in enumerate(self.vcfs):
+            bit = 1 << i
+            presence = self.presence
+            with open_vcf(path) as f:
+                for line in f:
+                    if line.startswith('#'):
+                        if i == last and intersection_out is not None:
+                            intersection_out.write(line)
+                        continue
+                    key = identity_key(line)
+                    mask = presence.get(key, 0)
+                    if telemetry is not None:
+                        telemetry.advance(1, len(line))
+                    # Like truvari, a key repeated within one input is counted once
+                    if mask & bit:
+                        continue
+                    self.calls_per_vcf[i] += 1
+                    if i == last and mask & others == others:
+                        self.intersection += 1
+                        if intersection_out is not None:
+                            intersection_out.write(line)
+                    presence[key] = mask | bit
+        return self
+
+    def group(self, mask):
+        """'101'-style membership string, one character per input in order"""
+        return ''.join('1' if mask >> i & 1 else '0' for i in range(len(self.vcfs)))
+
+    def report(self):
+        """
+        Summary in the layout of `truvari consistency -j`
+
+        Returns:
+            dict: vcfs, total_calls, num_vcfs, vcf_counts, shared (calls per number
+                  of VCFs, every count from num_vcfs down to 1) and detailed (calls
+                  per membership group)
+        """
+        total = len(self.presence)
+        group_tally = Counter(self.presence.values())
+        shared_tally = Counter()
+        for mask, count in group_tally.items():
+            shared_tally[bin(mask).count('1')] += count
+        output = {
+            'vcfs': self.vcfs,
+            'total_calls': total,
+            'num_vcfs': len(self.vcfs),
+            'vcf_counts': {vcf: count for vcf, count in zip(self.vcfs, self.calls_per_vcf)},
+            'shared': [{'vcf_count': n, 'num_calls': shared_tally[n],
+                        'call_pct': shared_tally[n] / total if total else 0}
+                       for n in range(len(self.vcfs), 0, -1)],
+            'detailed': []
+        }
+        groups = sorted(((self.group(mask), count) for mask, count in group_tally.items()),
+                        key=lambda item: (-item[1], item[0]))
+        for group, count in groups:
+            row = {'group': group, 'total': count, 'total_pct': count / total}
+            for i, vcf in enumerate(self.vcfs):
+                calls = self.calls_per_vcf[i]
+                row[vcf] = count / calls if group[i] == '1' and calls else 0
+            output['detailed'].append(row)
+        return output
+
+def format_report(output):
+    """The text report of `truvari consistency` for a report() dict"""
+    lines = ["#", f"# Total {output['total_calls']} calls across {output['num_vcfs']} VCFs", "#",
+             "#File\tNumCalls"]
+    lines.extend(f"{vcf}\t{output['vcf_counts'][vcf]}" for vcf in output['vcfs'])
+    lines.extend(["#", "# Summary of consistency", "#", "#VCFs\tCalls\tPct"])
+    lines.extend(f"{row['vcf_count']}\t{row['num_calls']}\t{row['call_pct'] * 100:.2f}%"
+                 for row in output['shared'])
+    lines.extend(["#", "# Breakdown of VCFs' consistency", "#", "#Group\tTotal\tTotalPct\tPctOfFileCalls"])
+    for row in output['detailed']:
+        file_pcts = ' '.join(f"{row[vcf] * 100:.2f}%" if row['group'][i] == '1' else "0%"
+                             for i, vcf in enumerate(output['vcfs']))
+        lines.append(f"{row['group']}\t{row['total']}\t{row['total_pct'] * 100:.2f}%\t{file_pcts}")
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+
+import re
+
+def natural_key(chrom):
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', chrom)]
+
+def header_contigs(header_lines):
+    """Contig IDs in the order the ##contig lines declare them"""
+    return [re.search(r'ID=([^,>]+)', line).group(1) for line in header_lines if line.startswith('##contig=<ID=')]
+
+class ContigOrder:
+    """Sort key for chromosomes: declared contigs first, others in natural order"""
+    def __init__(self, contigs):
+        self.rank = {}
+        for chrom in contigs:
+            self.rank.setdefault(chrom, len(self.rank))
+        self.cache = {}
+
+    def key(self, chrom):
+        key = self.cache.get(chrom)
+        if key is None:
+            if chrom in self.rank:
+                key = (0, self.rank[chrom], [])
+            else:
+                key = (1, 0, natural_key(chrom))
+            self.cache[chrom] = key
+        return key
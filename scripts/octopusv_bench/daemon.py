@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import socket
+import socketserver
+from collections import OrderedDict
+
+def file_key(path):
+    """Cache key for an input file; it changes whenever the file is rewritten"""
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+class LRUCache:
+    """
+    Loaded inputs kept under a memory cap, least recently used evicted first
+
+    Sizes are the estimates returned by the loaders, not measured. An entry
+    larger than the cap is still kept while it is the only one.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, load):
+        """
+        Return the cached value for key, calling load() on a miss
+
+        load returns (value, estimated bytes).
+
+        Returns:
+            tuple: (value, True on a cache hit)
+        """
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key][0], True
+        self.misses += 1
+        value, size = load()
+        self.entries[key] = (value, size)
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            self.evict(next(iter(self.entries)))
+        return value, False
+
+    def evict(self, key):
+        _, size = self.entries.pop(key)
+        self.total_bytes -= size
+        self.evictions += 1
+
+    def clear(self):
+        for key in list(self.entries):
+            self.evict(key)
+
+    def status(self):
+        return {
+            'entries': [{'key': list(key), 'mb': round(size / 1024 ** 2, 2)}
+                        for key, (_, size) in self.entries.items()],
+            'total_mb': round(self.total_bytes / 1024 ** 2, 2),
+            'max_mb': round(self.max_bytes / 1024 ** 2, 2),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+def send_message(sock, message):
+    sock.sendall(json.dumps(message).encode() + b'\n')
+
+def read_message(stream):
+    line = stream.readline()
+    if not line:
+        raise ConnectionError("Connection closed before a message was received")
+    return json.loads(line)
+
+class JobHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = read_message(self.rfile)
+        except (ConnectionError, ValueError) as e:
+            send_message(self.request, {'ok': False, 'error': f"Bad request: {e}"})
+            return
+        send_message(self.request, self.server.run_job(request))
+
+class JobServer(socketserver.UnixStreamServer):
+    """
+    Unix socket server that runs one JSON job per connection, one job at a time
+
+    Jobs are dicts {'job': name, 'args': [...], 'cwd': dir}; handlers are
+    called as handler(args) inside cwd and return a dict merged into the
+    response. 'status' and 'stop' are built in.
+    """
+    def __init__(self, socket_path, handlers, cache):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, JobHandler)
+        self.socket_path = socket_path
+        self.handlers = handlers
+        self.cache = cache
+        self.started = time.time()
+        self.jobs = 0
+        self.stopping = False
+
+    def run_job(self, request):
+        job = request.get('job')
+        if job == 'status':
+            return {'ok': True, 'pid': os.getpid(), 'jobs': self.jobs,
+                    'uptime_seconds': round(time.time() - self.started, 1), 'cache': self.cache.status()}
+        if job == 'stop':
+            self.stopping = True
+            return {'ok': True}
+        if job not in self.handlers:
+            return {'ok': False, 'error': f"Unknown job '{job}'; known jobs: {', '.join(self.handlers)}"}
+
+        start = time.perf_counter()
+        saved_cwd = os.getcwd()
+        try:
+            os.chdir(request.get('cwd', saved_cwd))
+            response = self.handlers[job](request.get('args', []))
+        except SystemExit as e:
+            # argparse errors and the scripts' own sys.exit calls
+            return {'ok': False, 'error': f"{job} exited with status {e.code}"}
+        except Exception as e:
+            return {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+        finally:
+            os.chdir(saved_cwd)
+        self.jobs += 1
+        return dict(response, ok=True, seconds=round(time.perf_counter() - start, 6))
+
+    def serve(self):
+        """Handle jobs until a 'stop' job arrives, then remove the socket"""
+        try:
+            while not self.stopping:
+                self.handle_request()
+        finally:
+            self.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+def submit(socket_path, job, args=(), wait=0.0):
+    """
+    Send one job to a JobServer and return its response
+
+    Args:
+        socket_path: Server socket
+        job: Job name
+        args: Job arguments, as on the script's command line
+        wait: Seconds to keep retrying while the server is starting up
+
+    Raises:
+        ConnectionError: If no server answers on socket_path
+    """
+    deadline = time.monotonic() + wait
+    while True:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(socket_path)
+            break
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            sock.close()
+            if time.monotonic() >= deadline:
+                raise ConnectionError(f"No benchmark daemon listening on {socket_path}") from e
+            time.sleep(0.1)
+    with sock:
+        send_message(sock, {'job': job, 'args': list(args), 'cwd': os.getcwd()})
+        with sock.makefile('rb') as stream:
+            return read_message(stream)
+
+def print_response(response, indent=None):
+    """Print a job response to stderr; returns the exit code for the client"""
+    if not response.get('ok'):
+        print(f"Error: {response.get('error')}", file=sys.stderr)
+        return 1
+    print(json.dumps(response, indent=indent), file=sys.stderr)
+    return 0
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+import io
+import os
+import sys
+import json
+import time
+import pstats
+import cProfile
+import tracemalloc
+from contextlib import contextmanager
+
+TOP_FUNCTIONS = 25
+
+def add_profile_argument(parser):
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile with cProfile and tracemalloc; writes <output>.timing.json and "
+                             "<output>.pstats and prints a per-phase timing table")
+
+class Instrumentation:
+    """
+    Per-phase wall time and record counts, plus cProfile/tracemalloc when profiling
+
+    Phases (load, parse, index, match, write, or script-specific names) are
+    timed with `with inst.phase('match') as phase:` and the block adds its
+    record count to phase['records']. Timing is always on (it costs
+    two clock reads per phase); cProfile and tracemalloc only run with
+    profile=True, and only in this process, not in worker processes.
+    Entering a phase also sets the stage of the optional Telemetry.
+    """
+    def __init__(self, script, profile=False, telemetry=None):
+        self.script = script
+        self.profile = profile
+        self.telemetry = telemetry
+        self.phases = {}
+        self.profiler = None
+        self.start = time.perf_counter()
+        if profile:
+            tracemalloc.start()
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def __getstate__(self):
+        # Worker processes get a copy that times but does not profile
+        return dict(self.__dict__, profile=False, profiler=None, telemetry=None)
+
+    @contextmanager
+    def phase(self, name):
+        entry = self.phases.setdefault(name, {'seconds': 0.0, 'records': 0})
+        if self.telemetry is not None:
+            self.telemetry.set_stage(name)
+        # reset_peak is Python 3.9+; older versions report the peak so far
+        if self.profile and hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry['seconds'] += time.perf_counter() - start
+            if self.profile:
+                peak = tracemalloc.get_traced_memory()[1]
+                entry['tracemalloc_peak_mb'] = max(entry.get('tracemalloc_peak_mb', 0), round(peak / 1024 ** 2, 2))
+
+    def timings(self):
+        """Per-phase seconds, records and records/second, in the order the phases first ran"""
+        summary = {}
+        for name, entry in self.phases.items():
+            seconds = entry['seconds']
+            summary[name] = dict(entry, seconds=round(seconds, 6),
+                                 records_per_second=round(entry['records'] / seconds, 1) if seconds > 0 else None)
+        return summary
+
+    def table(self):
+        lines = [f"{'phase':<12}{'seconds':>12}{'records':>12}{'records/s':>14}{'peak MB':>10}"]
+        for name, entry in self.timings().items():
+            rate = entry['records_per_second']
+            peak = entry.get('tracemalloc_peak_mb', '')
+            lines.append(f"{name:<12}{entry['seconds']:>12.3f}{entry['records']:>12}"
+                         f"{rate if rate is not None else '':>14}{peak:>10}")
+        lines.append(f"{'total':<12}{time.perf_counter() - self.start:>12.3f}")
+        return '\n'.join(lines)
+
+    def finish(self, output_base, extra=None):
+        """
+        Stop profiling and write <output_base>.timing.json and .pstats
+
+        Does nothing unless profiling. Returns the JSON path or None.
+        """
+        if not self.profile:
+            return None
+        self.profiler.disable()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        stats_path = f"{output_base}.pstats"
+        self.profiler.dump_stats(stats_path)
+        buffer = io.StringIO()
+        pstats.Stats(self.profiler, stream=buffer).sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+
+        report = {
+            'script': self.script,
+            'argv': sys.argv,
+            'pid': os.getpid(),
+            'wall_seconds': round(time.perf_counter() - self.start, 6),
+            # reset per phase, so this is the largest phase peak
+            'tracemalloc_peak_mb': max([e.get('tracemalloc_peak_mb', 0) for e in self.phases.values()]
+                                       + [round(peak / 1024 ** 2, 2)]),
+            'phases': self.timings(),
+            'pstats': stats_path,
+            'top_functions': buffer.getvalue().splitlines()
+        }
+        if extra:
+            report.update(extra)
+        json_path = f"{output_base}.timing.json"
+        with open(json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(self.table(), file=sys.stderr)
+        print(f"Profile written to {json_path} and {stats_path}", file=sys.stderr)
+        return json_path
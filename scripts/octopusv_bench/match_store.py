@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+
+import os
+import gzip
+import time
+import sqlite3
+import hashlib
+
+# truvari 3.x writes tp-call.vcf, 4.x tp-comp.vcf; either may be bgzipped
+TRUVARI_FILES = {
+    'tp-base': ('truth', 1),
+    'fn': ('truth', 0),
+    'tp-call': ('call', 'tp'),
+    'tp-comp': ('call', 'tp'),
+    'fp': ('call', 'fp'),
+}
+BATCH_SIZE = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    dataset TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    analysis_type TEXT NOT NULL,
+    source TEXT NOT NULL,
+    path TEXT,
+    loaded_at TEXT NOT NULL,
+    UNIQUE (dataset, tool, analysis_type)
+);
+CREATE TABLE IF NOT EXISTS truth_variants (
+    id INTEGER PRIMARY KEY,
+    dataset TEXT NOT NULL,
+    variant_key TEXT NOT NULL,
+    chrom TEXT,
+    pos INTEGER,
+    end INTEGER,
+    svtype TEXT,
+    svlen INTEGER,
+    UNIQUE (dataset, variant_key)
+);
+CREATE TABLE IF NOT EXISTS truth_results (
+    run_id INTEGER NOT NULL,
+    variant_id INTEGER NOT NULL,
+    found INTEGER NOT NULL,
+    PRIMARY KEY (run_id, found, variant_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS truth_results_variant ON truth_results (variant_id, run_id);
+CREATE TABLE IF NOT EXISTS calls (
+    run_id INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    chrom TEXT,
+    pos INTEGER,
+    end INTEGER,
+    svtype TEXT,
+    svlen INTEGER,
+    call_key TEXT
+);
+CREATE INDEX IF NOT EXISTS calls_run ON calls (run_id, status);
+"""
+
+def open_vcf(path):
+    return gzip.open(path, 'rt') if path.endswith('.gz') else open(path, 'r')
+
+def record_lines(path):
+    with open_vcf(path) as f:
+        for line in f:
+            if not line.startswith('#'):
+                yield line
+
+def variant_key(fields):
+    """Identity of a VCF record: CHROM:POS:ID plus a digest of REF/ALT, which can be whole sequences"""
+    digest = hashlib.md5(f"{fields[3]}\t{fields[4]}".encode()).hexdigest()[:12]
+    return f"{fields[0]}:{fields[1]}:{fields[2]}:{digest}"
+
+def describe(line):
+    """(key, chrom, pos, end, svtype, svlen) of a VCF record line"""
+    fields = line.rstrip('\n').split('\t')
+    info = {}
+    for item in fields[7].split(';') if len(fields) > 7 else ():
+        key, _, value = item.partition('=')
+        info[key] = value
+    svlen = info.get('SVLEN', '').split(',')[0].lstrip('-')
+    return (variant_key(fields), fields[0], int(fields[1]),
+            int(info['END']) if info.get('END', '').isdigit() else None,
+            info.get('SVTYPE'), int(svlen) if svlen.isdigit() else None)
+
+def truvari_files(eval_dir):
+    """(name, path) of the truvari record files present in an evaluation directory"""
+    files = []
+    for name in TRUVARI_FILES:
+        for suffix in ('.vcf', '.vcf.gz'):
+            path = os.path.join(eval_dir, name + suffix)
+            if os.path.exists(path):
+                files.append((name, path))
+                break
+    return files
+
+class MatchStore:
+    """
+    Variant-level benchmark results in SQLite
+
+    Every truth record of a dataset gets one truth_variants row (keyed by
+    variant_key), and every loaded run (dataset, tool, analysis type) one
+    truth_results row per truth variant saying whether the run found it.
+    Called records are kept in calls as tp or fp. Cross-tool questions are
+    then set operations on the (run_id, found, variant_id) primary key.
+    """
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+        self.variant_ids = {}
+
+    def close(self):
+        self.db.close()
+
+    def dataset_variants(self, dataset):
+        """variant_key -> id of the dataset's truth variants, read once per dataset"""
+        if dataset not in self.variant_ids:
+            self.variant_ids[dataset] = dict(self.db.execute(
+                "SELECT variant_key, id FROM truth_variants WHERE dataset = ?", (dataset,)))
+        return self.variant_ids[dataset]
+
+    def begin_run(self, dataset, tool, analysis_type, source, path=None):
+        """Register a run, replacing the results of an earlier load of the same run; returns its id"""
+        old = self.db.execute("SELECT id FROM runs WHERE dataset = ? AND tool = ? AND analysis_type = ?",
+                              (dataset, tool, analysis_type)).fetchone()
+        if old is not None:
+            self.db.execute("DELETE FROM truth_results WHERE run_id = ?", (old['id'],))
+            self.db.execute("DELETE FROM calls WHERE run_id = ?", (old['id'],))
+            self.db.execute("DELETE FROM runs WHERE id = ?", (old['id'],))
+        cursor = self.db.execute(
+            "INSERT INTO runs (dataset, tool, analysis_type, source, path, loaded_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (dataset, tool, analysis_type, source, path, time.strftime('%Y-%m-%dT%H:%M:%S')))
+        return cursor.lastrowid
+
+    def variant_id(self, dataset, description):
+        ids = self.dataset_variants(dataset)
+        key = description[0]
+        if key not in ids:
+            ids[key] = self.db.execute(
+                "INSERT INTO truth_variants (dataset, variant_key, chrom, pos, end, svtype, svlen) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", (dataset,) + description).lastrowid
+        return ids[key]
+
+    def add_truth(self, run_id, dataset, lines, found):
+        """
+        Record truth lines as found (1) or missed (0) by a run
+
+        found is either a constant or a function of the record's variant_key.
+
+        Returns:
+            int: Number of truth records
+        """
+        rows = []
+        count = 0
+        for line in lines:
+            description = describe(line)
+            hit = found(description[0]) if callable(found) else found
+            rows.append((run_id, self.variant_id(dataset, description), int(hit)))
+            count += 1
+            if len(rows) >= BATCH_SIZE:
+                self.db.executemany("INSERT OR REPLACE INTO truth_results VALUES (?, ?, ?)", rows)
+                rows = []
+        self.db.executemany("INSERT OR REPLACE INTO truth_results VALUES (?, ?, ?)", rows)
+        return count
+
+    def add_calls(self, run_id, lines, status):
+        """Record called lines as tp or fp; status may be a function of the record's variant_key"""
+        rows = []
+        for line in lines:
+            key, chrom, pos, end, svtype, svlen = describe(line)
+            rows.append((run_id, status(key) if callable(status) else status, chrom, pos, end, svtype, svlen, key))
+        self.db.executemany("INSERT INTO calls VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def load_truvari(self, eval_dir, dataset, tool, analysis_type):
+        """
+        Load the tp-base/fn/tp-call (tp-comp)/fp VCFs of a truvari bench directory
+
+        Returns:
+            dict: Records loaded per file, or None when the directory has no truvari outputs
+        """
+        files = truvari_files(eval_dir)
+        if not files:
+            return None
+        run_id = self.begin_run(dataset, tool, analysis_type, 'truvari', os.path.abspath(eval_dir))
+        counts = {}
+        for name, path in files:
+            kind, value = TRUVARI_FILES[name]
+            if kind == 'truth':
+                counts[name] = self.add_truth(run_id, dataset, record_lines(path), value)
+            else:
+                counts[name] = self.add_calls(run_id, record_lines(path), value)
+        self.db.commit()
+        return counts
+
+    def load_matches(self, matches_file, truth_vcf, dataset, tool, analysis_type, calls_vcf=None):
+        """
+        Load a compare_sv.py matches file: truth records in it were found, the rest missed
+
+        Calls come from calls_vcf when given (fp when absent from the matches),
+        otherwise only the matched calls are stored.
+
+        Returns:
+            dict: Records loaded per kind
+
+        Raises:
+            ValueError: If a matched truth record is not in truth_vcf
+        """
+        truth_lines = list(record_lines(truth_vcf))
+        truth_keys = {variant_key(line.split('\t', 5)) for line in truth_lines}
+        matched_truth = set()
+        matched_calls = []
+        with open(matches_file) as f:
+            next(f, None)
+            for line in f:
+                fields = line.rstrip('\n').split('\t')
+                # The corrected record and the truth record are joined by a tab and either may
+                # carry sample columns, so the truth record starts at the first known truth key
+                start = next((k for k in range(8, len(fields) - 4) if variant_key(fields[k:k + 5]) in truth_keys),
+                             None)
+                if start is None:
+                    raise ValueError(f"{matches_file}: matched truth record not found in {truth_vcf}: "
+                                     f"{line[:200].strip()}")
+                matched_calls.append('\t'.join(fields[:start]))
+                matched_truth.add(variant_key(fields[start:start + 5]))
+
+        run_id = self.begin_run(dataset, tool, analysis_type, 'compare_sv', os.path.abspath(matches_file))
+        counts = {'truth': self.add_truth(run_id, dataset, truth_lines, matched_truth.__contains__),
+                  'found': len(matched_truth)}
+        if calls_vcf:
+            matched_keys = {variant_key(line.split('\t')) for line in matched_calls}
+            counts['calls'] = self.add_calls(run_id, record_lines(calls_vcf),
+                                             lambda key: 'tp' if key in matched_keys else 'fp')
+        else:
+            counts['calls'] = self.add_calls(run_id, matched_calls, 'tp')
+        self.db.commit()
+        return counts
+
+    def runs(self, dataset=None):
+        """Loaded runs with their found/missed truth and tp/fp call counts"""
+        query = ("SELECT r.*, "
+                 "(SELECT COUNT(*) FROM truth_results t WHERE t.run_id = r.id AND t.found = 1) AS found, "
+                 "(SELECT COUNT(*) FROM truth_results t WHERE t.run_id = r.id AND t.found = 0) AS missed, "
+                 "(SELECT COUNT(*) FROM calls c WHERE c.run_id = r.id AND c.status = 'tp') AS tp_calls, "
+                 "(SELECT COUNT(*) FROM calls c WHERE c.run_id = r.id AND c.status = 'fp') AS fp_calls "
+                 "FROM runs r")
+        params = ()
+        if dataset:
+            query += " WHERE r.dataset = ?"
+            params = (dataset,)
+        return self.db.execute(query + " ORDER BY r.dataset, r.tool, r.analysis_type", params).fetchall()
+
+    def analysis_types(self, dataset):
+        """Analysis types of the runs loaded for a dataset"""
+        return [row[0] for row in self.db.execute(
+            "SELECT DISTINCT analysis_type FROM runs WHERE dataset = ? ORDER BY analysis_type", (dataset,))]
+
+    def run_id(self, dataset, tool, analysis_type):
+        row = self.db.execute("SELECT id FROM runs WHERE dataset = ? AND tool = ? AND analysis_type = ?",
+                              (dataset, tool, analysis_type)).fetchone()
+        if row is None:
+            raise KeyError(f"No results loaded for {tool} {analysis_type} on {dataset}")
+        return row['id']
+
+    def query(self, dataset, analysis_type, found_by=(), missed_by=()):
+        """
+        Truth variants found by every tool in found_by and missed by every tool in missed_by
+
+        Tools may be given as TOOL or TOOL:ANALYSIS to override analysis_type.
+        With no found_by, the starting set is every truth variant of the dataset.
+
+        Raises:
+            KeyError: If a tool has no loaded run for the dataset and analysis type
+        """
+        def run_of(spec):
+            tool, _, analysis = spec.partition(':')
+            return self.run_id(dataset, tool, analysis or analysis_type)
+
+        parts = []
+        params = []
+        if found_by:
+            for spec in found_by:
+                parts.append("SELECT variant_id FROM truth_results WHERE run_id = ? AND found = 1")
+                params.append(run_of(spec))
+            selection = ' INTERSECT '.join(parts)
+        else:
+            selection = "SELECT id FROM truth_variants WHERE dataset = ?"
+            params.append(dataset)
+        for spec in missed_by:
+            selection += " EXCEPT SELECT variant_id FROM truth_results WHERE run_id = ? AND found = 1"
+            params.append(run_of(spec))
+        return self.db.execute(f"SELECT * FROM truth_variants WHERE id IN ({selection}) ORDER BY chrom, pos",
+                               params).fetchall()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import time
+import subprocess
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+# Exit checks run this often; /proc samples every `interval` seconds
+POLL_INTERVAL = 0.01
+IO_FIELDS = {'rchar': 'read_chars', 'wchar': 'write_chars',
+             'read_bytes': 'read_bytes', 'write_bytes': 'write_bytes'}
+
+def read_proc(pid, name):
+    try:
+        with open(f"/proc/{pid}/{name}") as f:
+            return f.read()
+    except OSError:
+        return None
+
+def parent_map():
+    """Map every visible PID to its parent PID"""
+    parents = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        stat = read_proc(entry, 'stat')
+        if stat is None:
+            continue
+        # The command name may contain spaces; fields resume after the last ')'
+        fields = stat[stat.rfind(')') + 2:].split()
+        parents[int(entry)] = int(fields[1])
+    return parents
+
+def process_tree(root):
+    """PIDs of root and all of its live descendants"""
+    children = {}
+    for pid, ppid in parent_map().items():
+        children.setdefault(ppid, []).append(pid)
+    tree = []
+    stack = [root]
+    while stack:
+        pid = stack.pop()
+        tree.append(pid)
+        stack.extend(children.get(pid, []))
+    return tree
+
+def sample_tree(root):
+    """
+    Current RSS and I/O totals of a process tree
+
+    Returns:
+        dict: rss_bytes, processes and the /proc/<pid>/io counters summed over
+              the tree (I/O of reaped children is already folded into their parent)
+    """
+    sample = {'rss_bytes': 0, 'processes': 0}
+    sample.update({key: 0 for key in IO_FIELDS.values()})
+    for pid in process_tree(root):
+        statm = read_proc(pid, 'statm')
+        if statm is None:
+            continue
+        sample['processes'] += 1
+        sample['rss_bytes'] += int(statm.split()[1]) * PAGE_SIZE
+        io = read_proc(pid, 'io')
+        if io is None:
+            continue
+        for line in io.splitlines():
+            key, _, value = line.partition(':')
+            if key in IO_FIELDS:
+                sample[IO_FIELDS[key]] += int(value)
+    return sample
+
+def run_profiled(command, interval=0.2, on_sample=None, **popen_kwargs):
+    """
+    Run a command and sample /proc for its whole process tree until it exits
+
+    CPU time comes from the rusage of the reaped command, which includes all
+    waited-for descendants. Peak RSS is the largest sampled tree total (or
+    the largest single process if that is higher); I/O is read from the
+    exited command before it is reaped. on_sample, if given, is called with
+    every sample as it is taken.
+
+    Returns:
+        dict: Resource record including the command's exit code
+    """
+    start = time.perf_counter()
+    started_at = time.time()
+    proc = subprocess.Popen(command, **popen_kwargs)
+    peak = {'rss_bytes': 0, 'processes': 0}
+    io = {key: 0 for key in IO_FIELDS.values()}
+    samples = 0
+    next_sample = 0
+    while True:
+        # WNOWAIT leaves the exited command as a zombie, so its final I/O
+        # counters (including reaped children) can still be read
+        exited = os.waitid(os.P_PID, proc.pid, os.WEXITED | os.WNOHANG | os.WNOWAIT)
+        if exited is not None or time.perf_counter() >= next_sample:
+            sample = sample_tree(proc.pid)
+            samples += 1
+            peak['rss_bytes'] = max(peak['rss_bytes'], sample['rss_bytes'])
+            peak['processes'] = max(peak['processes'], sample['processes'])
+            for key in io:
+                io[key] = max(io[key], sample[key])
+            if on_sample is not None:
+                on_sample(sample)
+            next_sample = time.perf_counter() + interval
+        if exited is not None:
+            break
+        time.sleep(POLL_INTERVAL)
+    _, status, rusage = os.wait4(proc.pid, 0)
+    wall = time.perf_counter() - start
+    # Popen never saw the exit status; keep it consistent for callers
+    proc.returncode = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+
+    record = {
+        'command': [str(arg) for arg in command],
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(started_at)),
+        'exit_code': proc.returncode,
+        'wall_seconds': round(wall, 3),
+        'user_seconds': round(rusage.ru_utime, 3),
+        'system_seconds': round(rusage.ru_stime, 3),
+        'cpu_percent': round((rusage.ru_utime + rusage.ru_stime) / wall * 100, 1) if wall > 0 else None,
+        # ru_maxrss is in kilobytes on Linux
+        'peak_rss_mb': round(max(peak['rss_bytes'], rusage.ru_maxrss * 1024) / 1024 ** 2, 1),
+        'max_processes': peak['processes'],
+        'samples': samples,
+        'interval_seconds': interval,
+    }
+    record.update(io)
+    return record
+
+def resources_path(output):
+    """JSON record path next to a tool's output file, prefix or directory"""
+    return f"{output.rstrip(os.sep)}.resources.json"
+
+def write_record(path, record):
+    with open(path, 'w') as f:
+        json.dump(record, f, indent=2)
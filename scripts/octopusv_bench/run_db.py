@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import time
+import socket
+import sqlite3
+import subprocess
+
+# SQLite file every stage execution is appended to; nothing is recorded when unset
+RUN_DB_ENV = 'OCTOPUSV_BENCH_RUN_DB'
+# Name of the run a stage belongs to, e.g. an OctopusV version (default: the git revision of the scripts)
+RUN_ID_ENV = 'OCTOPUSV_BENCH_RUN_ID'
+# Set by profile_command.py for the command it wraps, whose stage it records itself
+PROFILED_ENV = 'OCTOPUSV_BENCH_PROFILED'
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Columns that identify a stage across runs
+STAGE_KEY = ('task', 'dataset', 'tool', 'analysis_type', 'output')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stage_runs (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    git_revision TEXT,
+    host TEXT,
+    task TEXT NOT NULL,
+    dataset TEXT,
+    tool TEXT,
+    analysis_type TEXT,
+    output TEXT,
+    labels TEXT,
+    input_records INTEGER,
+    input_bytes INTEGER,
+    read_bytes INTEGER,
+    wall_seconds REAL,
+    cpu_seconds REAL,
+    peak_rss_mb REAL,
+    exit_code INTEGER,
+    command TEXT
+);
+CREATE INDEX IF NOT EXISTS stage_runs_run ON stage_runs (run_id, task);
+"""
+
+_revision = None
+
+def git_revision():
+    """Short git revision of the scripts, with '+dirty' for uncommitted changes, or None outside git"""
+    global _revision
+    if _revision is None:
+        try:
+            revision = subprocess.run(['git', '-C', SCRIPTS_DIR, 'rev-parse', '--short=12', 'HEAD'],
+                                      stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                      universal_newlines=True, check=True).stdout.strip()
+            status = subprocess.run(['git', '-C', SCRIPTS_DIR, 'status', '--porcelain', '--untracked-files=no'],
+                                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                    universal_newlines=True, check=True).stdout
+            _revision = revision + ('+dirty' if status.strip() else '')
+        except (OSError, subprocess.CalledProcessError):
+            _revision = ''
+    return _revision or None
+
+def default_db_path():
+    return os.environ.get(RUN_DB_ENV) or None
+
+def connect(path):
+    # Driver steps can finish concurrently; wait for the write lock instead of failing
+    db = sqlite3.connect(path, timeout=60)
+    db.row_factory = sqlite3.Row
+    db.executescript(SCHEMA)
+    return db
+
+def input_size(paths):
+    """Total size of the input files that exist, or None when there are none"""
+    sizes = [os.path.getsize(path) for path in paths if os.path.isfile(path)]
+    return sum(sizes) if sizes else None
+
+def record_stage(task, labels=None, db_path=None, **values):
+    """
+    Append one stage execution to the run database
+
+    Args:
+        task: Stage name, e.g. compare_sv or truvari_bench
+        labels: Telemetry labels; dataset, tool and analysis get their own columns
+        db_path: Database file (default: $OCTOPUSV_BENCH_RUN_DB; nothing is recorded when neither is set)
+        values: Other stage_runs columns (output, input_records, input_bytes, read_bytes,
+                wall_seconds, cpu_seconds, peak_rss_mb, exit_code, command)
+
+    Returns:
+        str: The database path, or None if nothing was recorded
+    """
+    db_path = db_path or default_db_path()
+    if not db_path:
+        return None
+    labels = dict(labels or {})
+    row = {
+        'run_id': os.environ.get(RUN_ID_ENV) or git_revision() or 'unversioned',
+        'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'git_revision': git_revision(),
+        'host': socket.gethostname(),
+        'task': task,
+        'dataset': labels.pop('dataset', None),
+        'tool': labels.pop('tool', None),
+        'analysis_type': labels.pop('analysis', None),
+        'labels': json.dumps(labels, sort_keys=True) if labels else None,
+    }
+    row.update(values)
+    if row.get('output'):
+        row['output'] = os.path.abspath(row['output'])
+    if isinstance(row.get('command'), (list, tuple)):
+        row['command'] = json.dumps([str(arg) for arg in row['command']])
+    with connect(db_path) as db:
+        db.execute(f"INSERT INTO stage_runs ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+                   list(row.values()))
+    db.close()
+    return db_path
+
+def list_runs(db):
+    """Runs in the order they were first recorded, with their stage counts and time span"""
+    return db.execute("SELECT run_id, MIN(recorded_at) AS first, MAX(recorded_at) AS last, COUNT(*) AS stages, "
+                      "GROUP_CONCAT(DISTINCT git_revision) AS revisions "
+                      "FROM stage_runs GROUP BY run_id ORDER BY MIN(id)").fetchall()
+
+def latest_stages(db, run_id):
+    """
+    The most recent successful execution of every stage of a run
+
+    Returns:
+        dict: stage key tuple -> row
+    """
+    rows = db.execute("SELECT * FROM stage_runs WHERE run_id = ? AND exit_code = 0 ORDER BY id", (run_id,))
+    return {tuple(row[column] for column in STAGE_KEY): row for row in rows}
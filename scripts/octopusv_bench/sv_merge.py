@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+
+import gzip
+from bisect import bisect_right
+from collections import defaultdict
+
+from octopusv_bench.breakends import parse_info, parse_breakend_record
+from octopusv_bench.contigs import ContigOrder
+
+# Strand pairs implied by a breakend connection or by the SV type
+ORIENTATION_STRANDS = {'3to5': '+-', '3to3': '++', '5to5': '--', '5to3': '-+'}
+TYPE_STRANDS = {'DEL': '+-', 'DUP': '-+', 'INS': '+-'}
+MISSING_SAMPLE = './.:NaN:NaN:NaN:NaN'
+
+def load_callset(path, callset, min_size=0):
+    """
+    Parse one caller VCF into SV dicts used by the merger
+
+    Breakend records take their mate and strands from the bracket ALT (or
+    CHR2/END); BND records are reclassified as TRA/INV/DEL/DUP. Intra-
+    chromosomal SVs shorter than min_size are dropped.
+
+    Returns:
+        list: SV dicts with callset, chrom, pos, chr2, end, svtype, svlen,
+              strands, id, ref and alt
+    """
+    svs = []
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt') as f:
+        for line in f:
+            if line.startswith('#'):
+                continue
+            fields = line.rstrip('\n').split('\t')
+            if len(fields) < 8:
+                continue
+            info = parse_info(fields[7])
+            svtype = info.get('SVTYPE', 'NA')
+            chrom = fields[0]
+            pos = int(fields[1])
+            chr2, end = chrom, pos
+            strands = info.get('STRANDS')
+
+            bnd = parse_breakend_record(fields, info, svtypes=('BND', 'TRA'))
+            if bnd is not None:
+                if bnd['mate_chrom'] is not None:
+                    chr2, end = bnd['mate_chrom'], bnd['mate_pos']
+                if svtype == 'BND':
+                    svtype = bnd['sv_class']
+                strands = strands or ORIENTATION_STRANDS.get(bnd['orientation'])
+            else:
+                end_str = info.get('END')
+                if isinstance(end_str, str) and end_str.isdigit():
+                    end = int(end_str)
+
+            try:
+                svlen = abs(int(str(info.get('SVLEN')).split(',')[0]))
+            except ValueError:
+                svlen = abs(end - pos) if chr2 == chrom else 0
+            if chr2 == chrom and svtype not in ('TRA', 'BND') and svlen < min_size:
+                continue
+
+            svs.append({
+                'callset': callset, 'chrom': chrom, 'pos': pos, 'chr2': chr2, 'end': end,
+                'svtype': svtype, 'svlen': svlen,
+                'strands': (strands or TYPE_STRANDS.get(svtype, ''))[:2] or None,
+                'id': fields[2], 'ref': fields[3], 'alt': fields[4]
+            })
+    return svs
+
+def candidate_pairs(svs, max_dist, require_type=True, use_strand=True):
+    """
+    Yield (distance, i, j) for every cross-callset pair within max_dist
+
+    SVs are grouped by (chrom, chr2) and swept in sorted position order;
+    the distance is the larger of the start and end breakpoint offsets.
+    """
+    groups = defaultdict(list)
+    for i, sv in enumerate(svs):
+        groups[(sv['chrom'], sv['chr2'])].append(i)
+
+    for members in groups.values():
+        members.sort(key=lambda i: svs[i]['pos'])
+        positions = [svs[i]['pos'] for i in members]
+        for a, i in enumerate(members):
+            si = svs[i]
+            for b in range(a + 1, bisect_right(positions, si['pos'] + max_dist)):
+                j = members[b]
+                sj = svs[j]
+                if si['callset'] == sj['callset']:
+                    continue
+                if require_type and si['svtype'] != sj['svtype']:
+                    continue
+                if use_strand and si['strands'] and sj['strands'] and si['strands'] != sj['strands']:
+                    continue
+                distance = max(sj['pos'] - si['pos'], abs(sj['end'] - si['end']))
+                if distance <= max_dist:
+                    yield distance, i, j
+
+class UnionFind:
+    """Disjoint sets over 0..n-1 with path halving and union by size"""
+    def __init__(self, n):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, i):
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i, j):
+        """Join the sets of i and j; returns False if they were already joined"""
+        ri, rj = self.find(i), self.find(j)
+        if ri == rj:
+            return False
+        if self.size[ri] < self.size[rj]:
+            ri, rj = rj, ri
+        self.parent[rj] = ri
+        self.size[ri] += self.size[rj]
+        return True
+
+    def groups(self):
+        groups = defaultdict(list)
+        for i in range(len(self.parent)):
+            groups[self.find(i)].append(i)
+        return list(groups.values())
+
+def merge_svs(svs, max_dist, require_type=True, use_strand=True):
+    """
+    Single-linkage clusters of SVs linked by candidate pairs
+
+    Returns:
+        list: Clusters as lists of SV indices
+    """
+    uf = UnionFind(len(svs))
+    for _, i, j in candidate_pairs(svs, max_dist, require_type, use_strand):
+        uf.union(i, j)
+    return uf.groups()
+
+def cluster_record(svs, members, names):
+    """
+    Build the merged VCF fields for one cluster
+
+    The representative is the call from the first callset (then the lowest
+    position). Every callset gets a sample column with GT:TY:ID:LN:ST.
+
+    Returns:
+        tuple: (support, fields)
+    """
+    members = sorted(members, key=lambda i: (svs[i]['callset'], svs[i]['pos']))
+    rep = svs[members[0]]
+    by_callset = {}
+    for i in members:
+        by_callset.setdefault(svs[i]['callset'], svs[i])
+    support = len(by_callset)
+    supp_vec = ''.join('1' if k in by_callset else '0' for k in range(len(names)))
+
+    info = [f"SUPP={support}", f"SUPP_VEC={supp_vec}", f"SVTYPE={rep['svtype']}"]
+    svlen = -rep['svlen'] if rep['svtype'] == 'DEL' else rep['svlen']
+    info.append(f"SVLEN={svlen}")
+    if rep['chr2'] != rep['chrom']:
+        info.append(f"CHR2={rep['chr2']}")
+    info.append(f"END={rep['end']}")
+    if rep['strands']:
+        info.append(f"STRANDS={rep['strands']}")
+
+    samples = []
+    for k in range(len(names)):
+        sv = by_callset.get(k)
+        if sv is None:
+            samples.append(MISSING_SAMPLE)
+        else:
+            samples.append(f"1/1:{sv['svtype']}:{sv['id']}:{sv['svlen']}:{sv['strands'] or '.'}")
+
+    fields = [rep['chrom'], str(rep['pos']), rep['id'], rep['ref'], rep['alt'], '.', 'PASS',
+              ';'.join(info), 'GT:TY:ID:LN:ST'] + samples
+    return support, fields
+
+def write_merged_vcf(path, svs, clusters, names, min_support=1):
+    """
+    Write clusters with at least min_support callsets, sorted by position
+
+    Returns:
+        int: Number of records written
+    """
+    records = []
+    for members in clusters:
+        support, fields = cluster_record(svs, members, names)
+        if support >= min_support:
+            records.append(fields)
+    contig_order = ContigOrder([])
+    records.sort(key=lambda f: (contig_order.key(f[0]), int(f[1])))
+
+    with open(path, 'w') as out:
+        out.write('##fileformat=VCFv4.2\n')
+        out.write('##source=octopusv_bench.sv_merge\n')
+        out.write('##INFO=<ID=SUPP,Number=1,Type=Integer,Description="Number of callsets supporting the call">\n')
+        out.write('##INFO=<ID=SUPP_VEC,Number=1,Type=String,Description="Callsets supporting the call, in input order">\n')
+        out.write('##INFO=<ID=SVTYPE,Number=1,Type=String,Description="Type of structural variant">\n')
+        out.write('##INFO=<ID=SVLEN,Number=1,Type=Integer,Description="Length of the SV">\n')
+        out.write('##INFO=<ID=CHR2,Number=1,Type=String,Description="Chromosome of the mate breakend">\n')
+        out.write('##INFO=<ID=END,Number=1,Type=Integer,Description="End position of the SV">\n')
+        out.write('##INFO=<ID=STRANDS,Number=1,Type=String,Description="Breakpoint strands">\n')
+        out.write('##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">\n')
+        out.write('##FORMAT=<ID=TY,Number=1,Type=String,Description="SV type in this callset">\n')
+        out.write('##FORMAT=<ID=ID,Number=1,Type=String,Description="Record ID in this callset">\n')
+        out.write('##FORMAT=<ID=LN,Number=1,Type=Integer,Description="SV length in this callset">\n')
+        out.write('##FORMAT=<ID=ST,Number=1,Type=String,Description="Strands in this callset">\n')
+        out.write('\t'.join(['#CHROM', 'POS', 'ID', 'REF', 'ALT', 'QUAL', 'FILTER', 'INFO', 'FORMAT'] + names) + '\n')
+        for fields in records:
+            out.write('\t'.join(fields) + '\n')
+    return len(records)
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+
+import math
+from bisect import bisect_right
+
+# GRCh38 primary assembly lengths; GRCh37 is close enough for synthetic positions
+CONTIG_LENGTHS = [
+    ('1', 248956422), ('2', 242193529), ('3', 198295559), ('4', 190214555), ('5', 181538259),
+    ('6', 170805979), ('7', 159345973), ('8', 145138636), ('9', 138394717), ('10', 133797422),
+    ('11', 135086622), ('12', 133275309), ('13', 114364328), ('14', 107043718), ('15', 101991189),
+    ('16', 90338345), ('17', 83257441), ('18', 80373285), ('19', 58617616), ('20', 64444167),
+    ('21', 46709983), ('22', 50818468), ('X', 156040895), ('Y', 57227415)
+]
+TYPE_WEIGHTS = {'DEL': 0.40, 'INS': 0.35, 'DUP': 0.10, 'INV': 0.08, 'TRA': 0.07}
+MIN_SV_SIZE = 50
+MAX_SV_SIZE = 50000
+
+# How each caller writes its records:
+#   chr_prefix   'chr' on contig names (None: same as the truth set)
+#   tra          'TRA' one record with CHR2/END, 'BND' mate pair with MATEID,
+#                'BND_single' one bracket-ALT BND record
+#   all_bnd      every SV as a BND mate pair (no resolved types)
+#   del_negative negative SVLEN on deletions
+#   svlen        write SVLEN at all
+#   strands      write STRANDS
+#   repeat_ids   reuse IDs across records
+DEFAULT_DIALECT = {'chr_prefix': None, 'tra': 'TRA', 'all_bnd': False, 'del_negative': False,
+                   'svlen': True, 'strands': False, 'repeat_ids': False}
+CALLER_DIALECTS = {
+    'delly': {'chr_prefix': False, 'tra': 'BND', 'svlen': False},
+    'lumpy': {'tra': 'BND', 'del_negative': True, 'strands': True},
+    'manta': {'tra': 'BND', 'del_negative': True},
+    'svaba': {'all_bnd': True, 'svlen': False},
+    'cutesv': {'tra': 'BND_single', 'del_negative': True},
+    'debreak': {'tra': 'TRA'},
+    'pbsv': {'tra': 'BND', 'del_negative': True},
+    'sniffles': {'tra': 'BND_single', 'del_negative': True},
+    'svdss': {'repeat_ids': True},
+    'svim': {'tra': 'BND_single', 'del_negative': True},
+}
+TYPE_STRANDS = {'DEL': '+-', 'DUP': '-+', 'INS': '+-', 'INV': '++', 'TRA': '+-'}
+
+def dialect(caller):
+    """Dialect settings of a caller name (unknown names get the default dialect)"""
+    return dict(DEFAULT_DIALECT, **CALLER_DIALECTS.get(caller, {}))
+
+class Genome:
+    """Contigs of the synthetic genome with length-weighted position sampling"""
+    def __init__(self, contigs=CONTIG_LENGTHS, chr_prefix=True):
+        self.contigs = [(('chr' + name) if chr_prefix else name, length) for name, length in contigs]
+        self.lengths = dict(self.contigs)
+        self.order = {name: i for i, (name, _) in enumerate(self.contigs)}
+        self.cumulative = []
+        total = 0
+        for _, length in self.contigs:
+            total += length
+            self.cumulative.append(total)
+        self.total = total
+
+    def random_position(self, rng, margin=0):
+        """Random (contig, position) at least margin bases from the contig end"""
+        while True:
+            offset = rng.randrange(self.total)
+            i = bisect_right(self.cumulative, offset)
+            name, length = self.contigs[i]
+            pos = offset - (self.cumulative[i - 1] if i else 0) + 1
+            if pos + margin < length:
+                return name, pos
+
+def random_size(rng, min_size=MIN_SV_SIZE, max_size=MAX_SV_SIZE):
+    """Log-uniform SV size, so small events dominate as in real callsets"""
+    return int(math.exp(rng.uniform(math.log(min_size), math.log(max_size))))
+
+def random_sv(rng, genome, type_weights=TYPE_WEIGHTS, min_size=MIN_SV_SIZE, max_size=MAX_SV_SIZE):
+    svtype = rng.choices(list(type_weights), weights=list(type_weights.values()))[0]
+    if svtype == 'TRA':
+        chrom, pos = genome.random_position(rng)
+        chr2, end = chrom, pos
+        while chr2 == chrom:
+            chr2, end = genome.random_position(rng)
+        return {'chrom': chrom, 'pos': pos, 'svtype': 'TRA', 'svlen': 0, 'chr2': chr2, 'end': end}
+    svlen = random_size(rng, min_size, max_size)
+    chrom, pos = genome.random_position(rng, svlen)
+    end = pos + 1 if svtype == 'INS' else pos + svlen
+    return {'chrom': chrom, 'pos': pos, 'svtype': svtype, 'svlen': svlen, 'chr2': chrom, 'end': end}
+
+def generate_truth(rng, genome, n, type_weights=TYPE_WEIGHTS, min_size=MIN_SV_SIZE, max_size=MAX_SV_SIZE):
+    """
+    Draw n truth SVs, sorted by position, with IDs truth_<n>
+
+    Returns:
+        list: SV dicts with id, chrom, pos, svtype, svlen, chr2 and end
+    """
+    svs = [random_sv(rng, genome, type_weights, min_size, max_size) for _ in range(n)]
+    svs.sort(key=lambda sv: (genome.order[sv['chrom']], sv['pos']))
+    for i, sv in enumerate(svs):
+        sv['id'] = f"truth_{i}"
+    return svs
+
+def call_sv(rng, sv, genome, jitter, size_jitter, type_confusion):
+    """
+    One caller's version of a truth SV: breakpoints moved by up to jitter,
+    size scaled by up to size_jitter and, with probability type_confusion,
+    DUP/INS swapped or the event left as an unresolved BND
+    """
+    call = dict(sv)
+    call['truth_id'] = sv['id']
+    call['pos'] = max(1, sv['pos'] + rng.randint(-jitter, jitter))
+    if sv['svtype'] == 'TRA':
+        call['end'] = max(1, sv['end'] + rng.randint(-jitter, jitter))
+        return call
+    call['svlen'] = max(1, int(sv['svlen'] * (1 + rng.uniform(-size_jitter, size_jitter))))
+    call['end'] = call['pos'] + 1 if sv['svtype'] == 'INS' else min(call['pos'] + call['svlen'],
+                                                                   genome.lengths[sv['chrom']] - 1)
+    if rng.random() < type_confusion:
+        if sv['svtype'] in ('DUP', 'INS') and rng.random() < 0.5:
+            call['svtype'] = 'INS' if sv['svtype'] == 'DUP' else 'DUP'
+            call['end'] = call['pos'] + 1 if call['svtype'] == 'INS' else call['pos'] + call['svlen']
+        elif sv['svtype'] != 'INS':
+            call['svtype'] = 'BND'
+    return call
+
+def generate_calls(rng, truth, genome, sensitivity=0.8, jitter=50, size_jitter=0.05,
+                   type_confusion=0.05, fp_rate=0.1):
+    """
+    Calls of one caller: detected truth SVs plus fp_rate false positives per
+    detected call, sorted by position
+
+    Returns:
+        list: SV dicts; false positives have truth_id None
+    """
+    calls = [call_sv(rng, sv, genome, jitter, size_jitter, type_confusion)
+             for sv in truth if rng.random() < sensitivity]
+    n_fp = int(round(len(calls) * fp_rate))
+    for _ in range(n_fp):
+        fp = random_sv(rng, genome)
+        fp['truth_id'] = None
+        calls.append(fp)
+    calls.sort(key=lambda sv: (genome.order[sv['chrom']], sv['pos']))
+    return calls
+
+def rename(chrom, chr_prefix):
+    if chr_prefix is None:
+        return chrom
+    bare = chrom[3:] if chrom.startswith('chr') else chrom
+    return 'chr' + bare if chr_prefix else bare
+
+def bracket_alt(chrom, pos):
+    return f"N[{chrom}:{pos}["
+
+def truth_lines(sv):
+    """VCF data lines of one truth SV in the VISOR truth layout (TRA as a MATEID pair)"""
+    if sv['svtype'] == 'TRA':
+        first = f"{sv['id']}_1"
+        second = f"{sv['id']}_2"
+        return [
+            [sv['chrom'], sv['pos'], first, 'N', bracket_alt(sv['chr2'], sv['end']),
+             f"SVTYPE=TRA;CHR2={sv['chr2']};END={sv['end']};MATEID={second}"],
+            [sv['chr2'], sv['end'], second, 'N', bracket_alt(sv['chrom'], sv['pos']),
+             f"SVTYPE=TRA;CHR2={sv['chrom']};END={sv['pos']};MATEID={first}"],
+        ]
+    return [[sv['chrom'], sv['pos'], sv['id'], 'N', f"<{sv['svtype']}>",
+             f"SVTYPE={sv['svtype']};END={sv['end']};SVLEN={sv['svlen']}"]]
+
+def caller_lines(call, n, caller, settings):
+    """VCF data lines (without QUAL/FILTER/FORMAT) of one call in the caller's dialect"""
+    chrom = rename(call['chrom'], settings['chr_prefix'])
+    chr2 = rename(call['chr2'], settings['chr_prefix'])
+    record_id = f"{caller}_{n // 2 if settings['repeat_ids'] else n}"
+    svtype = call['svtype']
+    style = 'BND' if settings['all_bnd'] else settings['tra']
+
+    if svtype == 'BND' or (svtype == 'TRA' and style != 'TRA') or settings['all_bnd']:
+        info = 'SVTYPE=BND'
+        if settings['strands']:
+            info += f";STRANDS={TYPE_STRANDS.get(svtype, '+-')}"
+        if style == 'BND_single' or svtype == 'INS':
+            return [[chrom, call['pos'], record_id, 'N', bracket_alt(chr2, call['end']), info]]
+        return [
+            [chrom, call['pos'], f"{record_id}_1", 'N', bracket_alt(chr2, call['end']),
+             f"{info};MATEID={record_id}_2"],
+            [chr2, call['end'], f"{record_id}_2", 'N', bracket_alt(chrom, call['pos']),
+             f"{info};MATEID={record_id}_1"],
+        ]
+
+    info = [f"SVTYPE={svtype}"]
+    if svtype == 'TRA':
+        info += [f"CHR2={chr2}", f"END={call['end']}"]
+    else:
+        info.append(f"END={call['end']}")
+        if settings['svlen']:
+            svlen = -call['svlen'] if svtype == 'DEL' and settings['del_negative'] else call['svlen']
+            info.append(f"SVLEN={svlen}")
+    if settings['strands']:
+        info.append(f"STRANDS={TYPE_STRANDS[svtype]}")
+    return [[chrom, call['pos'], record_id, 'N', f"<{svtype}>", ';'.join(info)]]
+
+def vcf_header(contigs, info_ids, sample=None):
+    lines = ['##fileformat=VCFv4.2', '##source=octopusv_bench.synthetic']
+    lines += [f"##contig=<ID={name},length={length}>" for name, length in contigs]
+    descriptions = {
+        'SVTYPE': ('1', 'String', 'Type of structural variant'),
+        'END': ('1', 'Integer', 'End position of the variant'),
+        'SVLEN': ('1', 'Integer', 'Length of the SV'),
+        'CHR2': ('1', 'String', 'Chromosome of the mate breakend'),
+        'MATEID': ('1', 'String', 'ID of the mate breakend'),
+        'STRANDS': ('1', 'String', 'Breakpoint strands'),
+    }
+    for key in info_ids:
+        number, kind, description = descriptions[key]
+        lines.append(f'##INFO=<ID={key},Number={number},Type={kind},Description="{description}">')
+    columns = ['#CHROM', 'POS', 'ID', 'REF', 'ALT', 'QUAL', 'FILTER', 'INFO']
+    if sample:
+        lines.append('##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">')
+        columns += ['FORMAT', sample]
+    lines.append('\t'.join(columns))
+    return [line + '\n' for line in lines]
+
+def write_truth_vcf(path, truth, genome):
+    """
+    Write the truth set; returns the number of records
+    """
+    records = [fields for sv in truth for fields in truth_lines(sv)]
+    records.sort(key=lambda f: (genome.order[f[0]], f[1]))
+    with open(path, 'w') as out:
+        out.writelines(vcf_header(genome.contigs, ['SVTYPE', 'END', 'SVLEN', 'CHR2', 'MATEID']))
+        for chrom, pos, record_id, ref, alt, info in records:
+            out.write(f"{chrom}\t{pos}\t{record_id}\tN\t{alt}\t.\tPASS\t{info}\n")
+    return len(records)
+
+def write_caller_vcf(path, calls, genome, caller, rng):
+    """
+    Write one caller's calls in its dialect; returns the number of records
+    """
+    settings = dialect(caller)
+    records = []
+    for n, call in enumerate(calls):
+        records.extend(caller_lines(call, n, caller, settings))
+    order = {rename(name, settings['chr_prefix']): i for name, i in genome.order.items()}
+    records.sort(key=lambda f: (order[f[0]], f[1]))
+    contigs = [(rename(name, settings['chr_prefix']), length) for name, length in genome.contigs]
+    # Callers only declare what they write; undefined keys are left for the fixers
+    info_ids = ['SVTYPE', 'END', 'CHR2', 'MATEID'] + (['SVLEN'] if settings['svlen'] else [])
+    with open(path, 'w') as out:
+        out.writelines(vcf_header(contigs, info_ids, sample=caller.upper()))
+        for chrom, pos, record_id, ref, alt, info in records:
+            gt = '1/1' if rng.random() < 0.3 else '0/1'
+            out.write(f"{chrom}\t{pos}\t{record_id}\t{ref}\t{alt}\t.\tPASS\t{info}\tGT\t{gt}\n")
+    return len(records)
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import sys
+import time
+import resource
+
+from octopusv_bench.run_db import PROFILED_ENV, record_stage, input_size
+
+# Directory of a node_exporter textfile collector; tools write one .prom file per task there
+TEXTFILE_DIR_ENV = 'OCTOPUSV_BENCH_TEXTFILE_DIR'
+TEXTFILE_INTERVAL = 10.0
+TTY_INTERVAL = 0.5
+METRIC_PREFIX = 'octopusv_bench'
+
+def add_telemetry_arguments(parser):
+    parser.add_argument("--telemetry-textfile",
+                        help=f"Metrics textfile refreshed while running, for a node_exporter textfile collector "
+                             f"(default: a .prom file in ${TEXTFILE_DIR_ENV} when that is set)")
+    parser.add_argument("--telemetry-label", action="append", default=[], metavar="KEY=VALUE",
+                        help="Label for the telemetry metrics, e.g. dataset=visor_ont or tool=cutesv; repeatable")
+
+def parse_labels(items):
+    """KEY=VALUE strings to a label dict"""
+    labels = {}
+    for item in items:
+        key, sep, value = item.partition('=')
+        if not sep or not re.fullmatch(r'[a-zA-Z_][a-zA-Z0-9_]*', key):
+            raise ValueError(f"Telemetry label must be KEY=VALUE with a metric label name, got '{item}'")
+        labels[key] = value
+    return labels
+
+def default_textfile(task, labels):
+    """<$OCTOPUSV_BENCH_TEXTFILE_DIR>/octopusv_bench_<task>_<label values>.prom, or None"""
+    directory = os.environ.get(TEXTFILE_DIR_ENV)
+    if not directory:
+        return None
+    name = '_'.join([METRIC_PREFIX, task] + list(labels.values()))
+    return os.path.join(directory, re.sub(r'[^A-Za-z0-9_.-]', '_', name) + '.prom')
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+class Telemetry:
+    """
+    Progress of one task: records, bytes read, rates, current stage and ETA
+
+    The metrics are rewritten atomically to a textfile every TEXTFILE_INTERVAL
+    seconds (and on every stage change) in the Prometheus text format read
+    by node_exporter's textfile collector. When stderr is a terminal a
+    progress line is redrawn there as well. Without a textfile or terminal
+    every call is a cheap counter update. With record=True, closing also
+    appends the task to the run database (see run_db) when one is configured,
+    unless profile_command.py is running the task and records it instead.
+    """
+    def __init__(self, task, labels=None, textfile=None, progress=None, interval=TEXTFILE_INTERVAL, record=True):
+        self.task = task
+        self.labels = dict(labels or {})
+        self.textfile = textfile or default_textfile(task, self.labels)
+        self.progress = sys.stderr.isatty() if progress is None else progress
+        self.interval = interval
+        self.start = time.monotonic()
+        self.records = 0
+        self.bytes_read = 0
+        self.total_records = None
+        self.total_bytes = None
+        self.expected_seconds = None
+        self.stage = 'start'
+        self.state = 'running'
+        self.last_write = float('-inf')
+        self.last_draw = float('-inf')
+        self.active = bool(self.textfile or self.progress)
+        self.record = record and not os.environ.get(PROFILED_ENV)
+        self.inputs = []
+        self.output = None
+
+    @classmethod
+    def from_args(cls, task, args, **kwargs):
+        """Telemetry configured by the add_telemetry_arguments options"""
+        return cls(task, parse_labels(args.telemetry_label), args.telemetry_textfile, **kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close('failed' if exc_type is not None else 'done')
+
+    def set_totals(self, records=None, bytes_read=None, expected_seconds=None):
+        """Totals used for the ETA; any of them may stay unknown"""
+        if records is not None:
+            self.total_records = records
+        if bytes_read is not None:
+            self.total_bytes = bytes_read
+        if expected_seconds is not None:
+            self.expected_seconds = expected_seconds
+
+    def set_files(self, inputs=(), output=None):
+        """Input files (their sizes go to the run database) and the main output file"""
+        self.inputs.extend(inputs)
+        if output is not None:
+            self.output = output
+
+    def set_stage(self, stage):
+        self.stage = stage
+        self.tick(force=True)
+
+    def advance(self, records=0, bytes_read=0):
+        self.records += records
+        self.bytes_read += bytes_read
+        if self.active:
+            self.tick()
+
+    def set_progress(self, records=None, bytes_read=None):
+        """Absolute counters, for progress sampled from outside (e.g. /proc)"""
+        if records is not None:
+            self.records = records
+        if bytes_read is not None:
+            self.bytes_read = bytes_read
+        if self.active:
+            self.tick()
+
+    def elapsed(self):
+        return time.monotonic() - self.start
+
+    def fraction(self):
+        """Completed fraction from bytes, then records, then expected duration, or None"""
+        if self.state == 'done':
+            return 1.0
+        if self.total_bytes:
+            return min(self.bytes_read / self.total_bytes, 1.0)
+        if self.total_records:
+            return min(self.records / self.total_records, 1.0)
+        if self.expected_seconds:
+            return min(self.elapsed() / self.expected_seconds, 1.0)
+        return None
+
+    def eta(self):
+        if self.state != 'running':
+            return 0.0
+        fraction = self.fraction()
+        if not fraction:
+            return None
+        return self.elapsed() * (1 - fraction) / fraction
+
+    def tick(self, force=False):
+        now = time.monotonic()
+        if self.textfile and (force or now - self.last_write >= self.interval):
+            self.write_textfile()
+            self.last_write = now
+        if self.progress and (force or now - self.last_draw >= TTY_INTERVAL):
+            self.draw()
+            self.last_draw = now
+
+    def close(self, state='done'):
+        self.state = state
+        self.tick(force=True)
+        if self.progress:
+            sys.stderr.write('\n')
+            sys.stderr.flush()
+        if self.record:
+            self.record_run()
+
+    def record_run(self):
+        """Append this task to the run database, if one is configured"""
+        usage = [resource.getrusage(who) for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+        record_stage(self.task, self.labels,
+                     output=self.output,
+                     input_records=self.records,
+                     input_bytes=input_size(self.inputs),
+                     read_bytes=self.bytes_read,
+                     wall_seconds=round(self.elapsed(), 3),
+                     cpu_seconds=round(sum(u.ru_utime + u.ru_stime for u in usage), 3),
+                     # ru_maxrss is in kilobytes on Linux; for children it is the largest single worker
+                     peak_rss_mb=round(max(u.ru_maxrss for u in usage) / 1024, 1),
+                     exit_code=0 if self.state == 'done' else 1,
+                     command=sys.argv)
+
+    def metrics(self):
+        """(name, type, help, value, extra labels) of every metric in the textfile"""
+        elapsed = self.elapsed()
+        rows = [
+            ('records_total', 'counter', 'Records processed', self.records, {}),
+            ('read_bytes_total', 'counter', 'Input bytes read', self.bytes_read, {}),
+            ('records_per_second', 'gauge', 'Mean records per second', self.records / elapsed if elapsed else 0, {}),
+            ('read_bytes_per_second', 'gauge', 'Mean bytes read per second',
+             self.bytes_read / elapsed if elapsed else 0, {}),
+            ('elapsed_seconds', 'gauge', 'Seconds since the task started', elapsed, {}),
+            ('stage', 'gauge', 'Current stage (value 1)', 1, {'stage': self.stage}),
+            ('running', 'gauge', '1 while the task runs, 0 when it has finished or failed',
+             int(self.state == 'running'), {'state': self.state}),
+            ('last_update_timestamp_seconds', 'gauge', 'Unix time of this update', time.time(), {}),
+        ]
+        fraction = self.fraction()
+        if fraction is not None:
+            rows.append(('progress_ratio', 'gauge', 'Completed fraction', fraction, {}))
+        eta = self.eta()
+        if eta is not None:
+            rows.append(('eta_seconds', 'gauge', 'Estimated seconds until the task finishes', eta, {}))
+        return rows
+
+    def write_textfile(self):
+        labels = dict({'task': self.task}, **self.labels)
+        lines = []
+        for name, metric_type, help_text, value, extra in self.metrics():
+            metric = f"{METRIC_PREFIX}_{name}"
+            label_text = ','.join(f'{key}="{escape_label(val)}"' for key, val in dict(labels, **extra).items())
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {metric_type}")
+            lines.append(f"{metric}{{{label_text}}} {round(value, 3) if isinstance(value, float) else value}")
+        # Write and rename so the collector never reads a partial file
+        tmp_path = f"{self.textfile}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, self.textfile)
+
+    def draw(self):
+        elapsed = self.elapsed()
+        name = '/'.join([self.task] + list(self.labels.values()))
+        parts = [f"[{name}] {self.stage}", f"{self.records:,} records"]
+        if self.bytes_read:
+            parts.append(f"{self.bytes_read / 1024 ** 2:,.1f} MB")
+        if elapsed and self.records:
+            parts.append(f"{self.records / elapsed:,.0f} rec/s")
+        fraction = self.fraction()
+        if fraction is not None:
+            parts.append(f"{fraction * 100:.0f}%")
+        eta = self.eta()
+        parts.append(f"ETA {format_duration(eta)}" if eta is not None else f"elapsed {format_duration(elapsed)}")
+        sys.stderr.write('\r\033[K' + ', '.join(parts))
+        sys.stderr.flush()
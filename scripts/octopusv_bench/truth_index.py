@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+import copy
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+from octopusv_bench.bnd_index import BreakendIndex
+
+TRA_END_TOLERANCE = 5000
+
+class TruthIndex:
+    """
+    Truth SVs indexed for tolerance-window lookups
+
+    Non-TRA events are kept per chromosome in position order. TRA events go
+    into a BreakendIndex keyed by (chrom, chr2), so both breakpoints are
+    constrained by the lookup itself.
+
+    Events are the dicts produced by the comparators' parse functions
+    (chrom, pos, svtype, end, chr2).
+    """
+    def __init__(self, events, tra_end_tolerance=TRA_END_TOLERANCE):
+        self.events = events
+        self.tra_end_tolerance = tra_end_tolerance
+        self.breakends = BreakendIndex()
+        self.positions = {}
+
+        by_chrom = defaultdict(list)
+        for i, sv in enumerate(events):
+            if sv['svtype'] == 'TRA':
+                if sv['end'] is not None:
+                    self.breakends.add(sv['chrom'], sv['pos'], sv['chr2'], sv['end'], i)
+            else:
+                by_chrom[sv['chrom']].append((sv['pos'], i))
+
+        for chrom, entries in by_chrom.items():
+            entries.sort()
+            self.positions[chrom] = ([pos for pos, _ in entries], [i for _, i in entries])
+
+    def with_tra_end_tolerance(self, tra_end_tolerance):
+        """This index queried with another TRA end tolerance, sharing the lookup structures"""
+        if tra_end_tolerance == self.tra_end_tolerance:
+            return self
+        index = copy.copy(self)
+        index.tra_end_tolerance = tra_end_tolerance
+        return index
+
+    def candidates(self, sv, tolerance):
+        """
+        Indices of truth events that can match sv within the tolerance window
+
+        TRA calls are only compared with TRA truth events and vice versa,
+        mirroring is_matching_sv in the comparators.
+        """
+        if sv['svtype'] == 'TRA':
+            if sv['end'] is None:
+                return []
+            return self.breakends.query(sv['chrom'], sv['pos'], sv['chr2'], sv['end'],
+                                        tolerance, self.tra_end_tolerance)
+        entry = self.positions.get(sv['chrom'])
+        if entry is None:
+            return []
+        positions, order = entry
+        lo = bisect_left(positions, sv['pos'] - tolerance)
+        hi = bisect_right(positions, sv['pos'] + tolerance)
+        return order[lo:hi]
+
+    def first_match(self, sv, tolerance, is_match):
+        """
+        Index of the first truth event (in truth file order) accepted by is_match
+
+        Returns:
+            int: Index into events, or None if nothing matches
+        """
+        best = None
+        for i in self.candidates(sv, tolerance):
+            if best is not None and i > best:
+                continue
+            if is_match(sv, self.events[i], tolerance):
+                best = i
+        return best
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import pickle
+import sqlite3
+import weakref
+import tempfile
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+from octopusv_bench.bnd_index import BreakendIndex
+from octopusv_bench.truth_index import TruthIndex, TRA_END_TOLERANCE
+
+# Rough per-record overhead of the parsed dict and its index entries, on top of the record's line
+RECORD_OVERHEAD_BYTES = 600
+# Chromosomes kept in memory at once by a spilled index; calls are read in position order
+MAX_PAGES = 2
+BATCH_SIZE = 10000
+SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+def estimate_bytes(records):
+    """Approximate memory held by a list of parsed records (dicts with a 'line')"""
+    return sum(len(record['line']) for record in records) + RECORD_OVERHEAD_BYTES * len(records)
+
+def parse_size(text):
+    """'2G', '512M', '300k' or a plain byte count to bytes (argparse type)"""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([kKmMgGtT]?)i?[bB]?\s*', text)
+    if not match:
+        raise ValueError(f"not a size: '{text}'")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).upper()])
+
+def add_memory_budget_argument(parser):
+    parser.add_argument("--memory-budget", type=parse_size, metavar="SIZE",
+                        help="Estimated memory for the parsed truth (e.g. 2G or 500M); a larger truth is "
+                             "spilled to a temporary SQLite file and paged in per chromosome. Results are "
+                             "identical; matching is slower. Temporary files go to $TMPDIR")
+
+def remove_spill(db, path):
+    db.close()
+    if os.path.exists(path):
+        os.unlink(path)
+
+class SpilledEvents:
+    """
+    Parsed truth events in a temporary SQLite file, used like the in-memory list
+
+    Events keep their list index (idx) and are stored pickled, so every
+    lookup returns an equal dict. Indexing pages in whole chromosomes, the
+    MAX_PAGES most recently used ones stay in memory. The file is removed
+    when the object is closed or garbage collected.
+    """
+    def __init__(self, spill_dir=None, max_pages=MAX_PAGES):
+        fd, self.path = tempfile.mkstemp(prefix='octopusv_truth_', suffix='.sqlite', dir=spill_dir)
+        os.close(fd)
+        self.db = sqlite3.connect(self.path)
+        # A scratch file: no journal or fsync needed
+        self.db.executescript("PRAGMA journal_mode=OFF; PRAGMA synchronous=OFF;"
+                              "CREATE TABLE events (idx INTEGER PRIMARY KEY, chrom TEXT, pos INTEGER, "
+                              "svtype TEXT, chr2 TEXT, end INTEGER, data BLOB)")
+        self.count = 0
+        self.max_pages = max_pages
+        self.pages = OrderedDict()
+        self.finalizer = weakref.finalize(self, remove_spill, self.db, self.path)
+
+    def extend(self, events):
+        rows = []
+        for sv in events:
+            rows.append((self.count, sv['chrom'], sv['pos'], sv['svtype'], sv['chr2'], sv['end'],
+                         pickle.dumps(sv, pickle.HIGHEST_PROTOCOL)))
+            self.count += 1
+            if len(rows) >= BATCH_SIZE:
+                self.db.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                rows = []
+        self.db.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def finish(self):
+        """Index the stored events by chromosome once all of them are in"""
+        self.db.execute("CREATE INDEX events_chrom ON events (chrom)")
+        self.db.commit()
+        return self
+
+    def close(self):
+        self.finalizer()
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for (data,) in self.db.execute("SELECT data FROM events ORDER BY idx"):
+            yield pickle.loads(data)
+
+    def rows(self, chrom):
+        """(idx, pos, svtype, chr2, end) of a chromosome's events, in idx order"""
+        return self.db.execute("SELECT idx, pos, svtype, chr2, end FROM events WHERE chrom = ? ORDER BY idx",
+                               (chrom,)).fetchall()
+
+    def page(self, chrom):
+        """idx -> event for one chromosome, loading it and evicting the oldest page if needed"""
+        if chrom in self.pages:
+            self.pages.move_to_end(chrom)
+            return self.pages[chrom]
+        page = {idx: pickle.loads(data)
+                for idx, data in self.db.execute("SELECT idx, data FROM events WHERE chrom = ?", (chrom,))}
+        self.pages[chrom] = page
+        while len(self.pages) > self.max_pages:
+            self.pages.popitem(last=False)
+        return page
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("truth event index out of range")
+        for page in reversed(self.pages.values()):
+            if i in page:
+                return page[i]
+        (data,) = self.db.execute("SELECT data FROM events WHERE idx = ?", (i,)).fetchone()
+        return pickle.loads(data)
+
+class SpilledTruthIndex(TruthIndex):
+    """
+    TruthIndex over SpilledEvents, built one chromosome at a time
+
+    The position arrays and breakend index of a chromosome are built from
+    the spill file the first time a call on that chromosome is looked up,
+    together with its page of events; the MAX_PAGES most recent are kept.
+    Candidates are the same as those of the in-memory TruthIndex.
+    """
+    def __init__(self, events, tra_end_tolerance=TRA_END_TOLERANCE, max_pages=MAX_PAGES):
+        self.events = events
+        self.tra_end_tolerance = tra_end_tolerance
+        self.max_pages = max_pages
+        self.chrom_pages = OrderedDict()
+
+    def chrom_page(self, chrom):
+        """(positions, order, BreakendIndex) of one chromosome"""
+        if chrom in self.chrom_pages:
+            self.chrom_pages.move_to_end(chrom)
+            return self.chrom_pages[chrom]
+        breakends = BreakendIndex()
+        entries = []
+        for idx, pos, svtype, chr2, end in self.events.rows(chrom):
+            if svtype == 'TRA':
+                if end is not None:
+                    breakends.add(chrom, pos, chr2, end, idx)
+            else:
+                entries.append((pos, idx))
+        entries.sort()
+        page = ([pos for pos, _ in entries], [i for _, i in entries], breakends)
+        self.chrom_pages[chrom] = page
+        while len(self.chrom_pages) > self.max_pages:
+            self.chrom_pages.popitem(last=False)
+        # Matched events are read next; load them with the positions
+        self.events.page(chrom)
+        return page
+
+    def candidates(self, sv, tolerance):
+        """Indices of truth events that can match sv within the tolerance window, as TruthIndex.candidates"""
+        if sv['svtype'] == 'TRA' and sv['end'] is None:
+            return []
+        positions, order, breakends = self.chrom_page(sv['chrom'])
+        if sv['svtype'] == 'TRA':
+            return breakends.query(sv['chrom'], sv['pos'], sv['chr2'], sv['end'], tolerance, self.tra_end_tolerance)
+        lo = bisect_left(positions, sv['pos'] - tolerance)
+        hi = bisect_right(positions, sv['pos'] + tolerance)
+        return order[lo:hi]
+
+def budgeted_events(events, memory_budget=None, spill_dir=None):
+    """
+    Collect parsed truth events in a list, or spill them to disk past memory_budget bytes
+
+    Returns:
+        list or SpilledEvents
+    """
+    if memory_budget is None:
+        return list(events)
+    events = iter(events)
+    kept = []
+    used = 0
+    for sv in events:
+        kept.append(sv)
+        used += len(sv['line']) + RECORD_OVERHEAD_BYTES
+        if used > memory_budget:
+            spilled = SpilledEvents(spill_dir)
+            spilled.extend(kept)
+            del kept[:]
+            spilled.extend(events)
+            return spilled.finish()
+    return kept
+
+def index_truth(events, tra_end_tolerance=TRA_END_TOLERANCE):
+    """The TruthIndex for events, or a SpilledTruthIndex when they were spilled"""
+    if isinstance(events, SpilledEvents):
+        return SpilledTruthIndex(events, tra_end_tolerance)
+    return TruthIndex(events, tra_end_tolerance)
+
+def resident_bytes(events):
+    """Estimated memory held by loaded truth events (a spilled set holds only its pages)"""
+    if isinstance(events, SpilledEvents):
+        return 0
+    return estimate_bytes(events)
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+
+import re
+
+STD_CHROMOSOMES = frozenset([str(i) for i in range(1, 23)] + ['X', 'Y', 'M'])
+GT_FORMAT_LINE = '##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">'
+PASS_FILTER_LINE = '##FILTER=<ID=PASS,Description="All filters passed">'
+MISSING_GT = ('./.', '.', './1', '1/.')
+META_ID_PATTERN = re.compile(r'^##(INFO|FORMAT|FILTER|contig)=<ID=([^,>]+)')
+
+def standardize_chrom_name(chrom, genome_version):
+    """
+    Standardize a chromosome name for GRCh37 (no 'chr') or GRCh38 ('chr')
+
+    Only the standard chromosomes (1-22, X, Y, M) are renamed.
+    """
+    if genome_version == '38':
+        if chrom.startswith('chr'):
+            return chrom if chrom[3:] in STD_CHROMOSOMES else chrom[3:]
+        return f"chr{chrom}" if chrom in STD_CHROMOSOMES else chrom
+    if genome_version == '37':
+        if chrom.startswith('chr') and chrom[3:] in STD_CHROMOSOMES:
+            return chrom[3:]
+    return chrom
+
+class VCFRecord:
+    """
+    One data line, split once and shared by all rules
+
+    The INFO column is parsed on first access and only re-serialized
+    when a rule changed it, so untouched records keep their exact text.
+    """
+    def __init__(self, line):
+        self.fields = line.strip().split('\t')
+        self._info = None
+        self.info_changed = False
+
+    @property
+    def info(self):
+        if self._info is None:
+            self._info = {}
+            for kv in self.fields[7].split(';'):
+                if '=' in kv:
+                    key, val = kv.split('=', 1)
+                    self._info[key] = val
+                else:
+                    self._info[kv] = True
+        return self._info
+
+    def set_info(self, key, value):
+        self.info[key] = value
+        self.info_changed = True
+
+    def to_line(self):
+        if self.info_changed:
+            self.fields[7] = ';'.join(k if v is True else f"{k}={v}" for k, v in self._info.items())
+        return '\t'.join(self.fields) + '\n'
+
+class Rule:
+    """
+    Base class for fixer rules
+
+    fix_record(record, counts) returns True when it changed the record; it
+    may also tally extra keys in counts.
+    fix_header(meta_lines, chrom_fields, counts) returns the new meta
+    lines, #CHROM columns and the number of header changes; it runs after
+    all records so it can use what the records reported in counts.
+    """
+    name = None
+
+    def fix_record(self, record, counts):
+        return False
+
+    def fix_header(self, meta_lines, chrom_fields, counts):
+        return meta_lines, chrom_fields, 0
+
+class ChromRenameRule(Rule):
+    """Rename chromosomes (CHROM, CHR2/CHROM2 and contig lines) for a genome version"""
+    name = 'chrom_rename'
+
+    def __init__(self, genome_version):
+        self.genome_version = genome_version
+
+    def fix_record(self, record, counts):
+        changed = False
+        chrom = standardize_chrom_name(record.fields[0], self.genome_version)
+        if chrom != record.fields[0]:
+            record.fields[0] = chrom
+            changed = True
+        for key in ('CHR2', 'CHROM2'):
+            value = record.info.get(key)
+            if isinstance(value, str):
+                std_value = standardize_chrom_name(value, self.genome_version)
+                if std_value != value:
+                    record.set_info(key, std_value)
+                    changed = True
+        return changed
+
+    def fix_header(self, meta_lines, chrom_fields, counts):
+        fixed = []
+        changes = 0
+        for line in meta_lines:
+            if line.startswith('##contig=<ID='):
+                chrom = re.search(r'ID=([^,>]+)', line).group(1)
+                std_chrom = standardize_chrom_name(chrom, self.genome_version)
+                if std_chrom != chrom:
+                    line = line.replace(f'ID={chrom}', f'ID={std_chrom}')
+                    changes += 1
+            fixed.append(line)
+        return fixed, chrom_fields, changes
+
+class TraSvlenRule(Rule):
+    """Set SVLEN=0 on TRA records without SVLEN"""
+    name = 'tra_svlen'
+
+    def fix_record(self, record, counts):
+        if len(record.fields) < 8 or record.info.get('SVTYPE') != 'TRA' or 'SVLEN' in record.info:
+            return False
+        record.set_info('SVLEN', '0')
+        return True
+
+class InsSvlenRule(Rule):
+    """Recompute SVLEN='.' on INS records as END - POS (at least 1)"""
+    name = 'ins_svlen'
+
+    def fix_record(self, record, counts):
+        if len(record.fields) < 8 or record.info.get('SVTYPE') != 'INS' or record.info.get('SVLEN') != '.':
+            return False
+        try:
+            end_str = record.info.get('END')
+            if end_str is not None and end_str != '.':
+                svlen = int(end_str) - int(record.fields[1])
+                record.set_info('SVLEN', str(svlen if svlen != 0 else 1))
+            else:
+                record.set_info('SVLEN', '1')
+        except ValueError:
+            record.set_info('SVLEN', '1')
+        return True
+
+class InferSvlenRule(Rule):
+    """
+    Fill any missing SVLEN from END and SVTYPE (VCF_savior.py semantics)
+
+    Without a numeric END, VCF_savior.py writes a placeholder SVLEN (1 for
+    INS, -1 for DEL, 0 otherwise). With placeholders=False such records are
+    left unchanged and tallied as 'no_svlen_or_end' instead.
+    """
+    name = 'infer_svlen'
+
+    def __init__(self, placeholders=True):
+        self.placeholders = placeholders
+
+    def fix_record(self, record, counts):
+        if len(record.fields) < 8:
+            return False
+        info = record.info
+        svlen = info.get('SVLEN')
+        if svlen is not None and svlen != '.':
+            return False
+        svtype = info.get('SVTYPE')
+        end_str = info.get('END')
+        if isinstance(end_str, str) and end_str.isdigit():
+            length = int(end_str) - int(record.fields[1])
+            if svtype == 'DEL':
+                new_svlen = -(length + 1)
+            elif svtype == 'INS':
+                new_svlen = max(length, 1)
+            elif svtype in ('DUP', 'INV'):
+                new_svlen = max(length + 1, 1)
+            else:
+                new_svlen = 0
+        elif self.placeholders:
+            new_svlen = {'INS': 1, 'DEL': -1}.get(svtype, 0)
+        else:
+            counts['no_svlen_or_end'] += 1
+            return False
+        record.set_info('SVLEN', str(new_svlen))
+        return True
+
+class InferEndRule(Rule):
+    """Fill a missing END from POS and SVLEN (POS for INS, POS + |SVLEN| otherwise); needs a numeric SVLEN"""
+    name = 'infer_end'
+
+    def fix_record(self, record, counts):
+        if len(record.fields) < 8:
+            return False
+        info = record.info
+        end = info.get('END')
+        svtype = info.get('SVTYPE')
+        if (end is not None and end != '.') or svtype not in ('DEL', 'INS', 'DUP', 'INV'):
+            return False
+        try:
+            svlen = abs(int(str(info.get('SVLEN')).split(',')[0]))
+        except ValueError:
+            return False
+        pos = int(record.fields[1])
+        record.set_info('END', str(pos if svtype == 'INS' else pos + svlen))
+        return True
+
+class PassFilterRule(Rule):
+    """Force FILTER to PASS and declare the PASS filter"""
+    name = 'pass_filter'
+
+    def fix_record(self, record, counts):
+        if len(record.fields) < 7 or record.fields[6] == 'PASS':
+            return False
+        record.fields[6] = 'PASS'
+        return True
+
+    def fix_header(self, meta_lines, chrom_fields, counts):
+        if any(line.startswith('##FILTER=<ID=PASS') for line in meta_lines):
+            return meta_lines, chrom_fields, 0
+        insert_at = 1 if meta_lines and meta_lines[0].startswith('##fileformat=') else 0
+        return meta_lines[:insert_at] + [PASS_FILTER_LINE] + meta_lines[insert_at:], chrom_fields, 1
+
+class GenotypeRule(Rule):
+    """
+    Make every record carry a called GT as its first FORMAT field
+
+    Records without FORMAT/sample columns get GT 1/1, GT is moved to the
+    front when present elsewhere and missing calls become 1/1.
+    """
+    name = 'genotype'
+
+    def fix_record(self, record, counts):
+        fields = record.fields
+        if len(fields) < 8:
+            return False
+        if len(fields) < 10:
+            del fields[8:]
+            fields.extend(['GT', '1/1'])
+            return True
+        format_fields = fields[8].split(':')
+        sample_fields = fields[9].split(':')
+        if 'GT' not in format_fields:
+            format_fields.insert(0, 'GT')
+            sample_fields.insert(0, '1/1')
+        elif format_fields[0] != 'GT':
+            gt_idx = format_fields.index('GT')
+            format_fields.insert(0, format_fields.pop(gt_idx))
+            sample_fields.insert(0, sample_fields.pop(gt_idx))
+        if sample_fields[0] in MISSING_GT:
+            sample_fields[0] = '1/1'
+        format_str = ':'.join(format_fields)
+        sample_str = ':'.join(sample_fields)
+        if format_str == fields[8] and sample_str == fields[9]:
+            return False
+        fields[8], fields[9] = format_str, sample_str
+        return True
+
+    def fix_header(self, meta_lines, chrom_fields, counts):
+        changes = 0
+        if not any(line.startswith('##FORMAT=<ID=GT,') for line in meta_lines):
+            meta_lines = meta_lines + [GT_FORMAT_LINE]
+            changes += 1
+        if 'FORMAT' not in chrom_fields:
+            chrom_fields = chrom_fields[:8] + ['FORMAT', 'SAMPLE']
+            changes += 1
+        elif chrom_fields.index('FORMAT') == len(chrom_fields) - 1:
+            chrom_fields = chrom_fields + ['SAMPLE']
+            changes += 1
+        return meta_lines, chrom_fields, changes
+
+class HeaderDedupRule(Rule):
+    """Ensure a fileformat line and drop repeated INFO/FORMAT/FILTER/contig definitions"""
+    name = 'header_dedup'
+
+    def fix_header(self, meta_lines, chrom_fields, counts):
+        changes = 0
+        if not any(line.startswith('##fileformat=') for line in meta_lines):
+            meta_lines = ['##fileformat=VCFv4.2'] + meta_lines
+            changes += 1
+        seen = set()
+        fixed = []
+        for line in meta_lines:
+            match = META_ID_PATTERN.match(line)
+            if match:
+                if match.groups() in seen:
+                    changes += 1
+                    continue
+                seen.add(match.groups())
+            fixed.append(line)
+        return fixed, chrom_fields, changes
+
+class DefineMissingRule(Rule):
+    """Declare INFO keys and FORMAT fields that records use without a definition"""
+    name = 'define_missing'
+
+    def fix_record(self, record, counts):
+        if len(record.fields) < 8:
+            return False
+        if record.fields[7] != '.':
+            for key in record.info:
+                counts[('INFO', key)] += 1
+        if len(record.fields) > 8:
+            for field in record.fields[8].split(':'):
+                counts[('FORMAT', field)] += 1
+        return False
+
+    def fix_header(self, meta_lines, chrom_fields, counts):
+        defined = {match.groups() for match in map(META_ID_PATTERN.match, meta_lines) if match}
+        new_lines = []
+        for kind in ('INFO', 'FORMAT'):
+            for field in sorted(key[1] for key in counts if isinstance(key, tuple) and key[0] == kind):
+                if (kind, field) not in defined:
+                    new_lines.append(f'##{kind}=<ID={field},Number=.,Type=String,'
+                                     f'Description="Auto-generated definition for {field}">')
+        return meta_lines + new_lines, chrom_fields, len(new_lines)
+
+RULES = {
+    rule.name: rule for rule in (ChromRenameRule, TraSvlenRule, InsSvlenRule, InferSvlenRule, InferEndRule,
+                                 PassFilterRule, GenotypeRule, HeaderDedupRule, DefineMissingRule)
+}
+
+def build_rules(names, genome_version=None):
+    """
+    Instantiate rules by name, in the order given
+
+    Raises:
+        ValueError: For unknown names or chrom_rename without a genome version
+    """
+    rules = []
+    for name in names:
+        if name not in RULES:
+            raise ValueError(f"Unknown rule '{name}'; choose from {', '.join(RULES)}")
+        if name == ChromRenameRule.name:
+            if genome_version is None:
+                raise ValueError("chrom_rename needs a genome version")
+            rules.append(ChromRenameRule(genome_version))
+        else:
+            rules.append(RULES[name]())
+    return rules
+
+def fix_vcf_records(rules, line, counts):
+    """Run every rule over one data line, counting hits per rule name and the records seen"""
+    record = VCFRecord(line)
+    counts['records'] += 1
+    for rule in rules:
+        if rule.fix_record(record, counts):
+            counts[rule.name] += 1
+    return record.to_line()
+
+def fix_vcf_header(rules, header, counts):
+    """Apply the header part of every rule; header lines keep their newlines"""
+    meta_lines = [line.strip() for line in header if line.startswith('##')]
+    chrom_lines = [line.strip() for line in header if line.startswith('#CHROM')]
+    if not chrom_lines:
+        raise ValueError("No #CHROM line found in the input VCF")
+    chrom_fields = chrom_lines[-1].split('\t')
+    for rule in rules:
+        meta_lines, chrom_fields, changes = rule.fix_header(meta_lines, chrom_fields, counts)
+        counts[f"{rule.name}_header"] += changes
+    return [line + '\n' for line in meta_lines] + ['\t'.join(chrom_fields) + '\n']
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.synthetic import (CALLER_DIALECTS, TYPE_WEIGHTS, MIN_SV_SIZE, MAX_SV_SIZE, Genome,
+                                      generate_truth, generate_calls, write_truth_vcf, write_caller_vcf)
+
+NGS_CALLERS = ['delly', 'lumpy', 'manta', 'svaba']
+LONG_READ_CALLERS = ['cutesv', 'debreak', 'pbsv', 'sniffles', 'svdss', 'svim']
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Generate a seeded truth VCF (VISOR truth layout) and caller VCFs with breakpoint jitter, "
+                    "type confusion, false positives and caller-specific dialects.")
+    parser.add_argument("-n", "--num-svs", type=int, required=True, help="Number of truth SVs")
+    parser.add_argument("-o", "--output-dir", required=True,
+                        help="Writes truth.vcf, caller_vcf/<caller>.vcf and synthetic.json")
+    parser.add_argument("--callers", nargs='+', default=LONG_READ_CALLERS,
+                        help=f"Caller names; known dialects: {', '.join(CALLER_DIALECTS)} "
+                             "(default: the six long-read callers)")
+    parser.add_argument("--ngs", action="store_true", help="Use the four NGS callers instead")
+    parser.add_argument("-g", "--genome", choices=['37', '38'], default='38',
+                        help="38 names contigs chr1..chrY as in the VISOR truth, 37 uses 1..Y (default: 38)")
+    parser.add_argument("--sensitivity", type=float, default=0.8, help="Fraction of truth SVs each caller finds")
+    parser.add_argument("--jitter", type=int, default=50, help="Maximum breakpoint shift in bp (default: 50)")
+    parser.add_argument("--size-jitter", type=float, default=0.05,
+                        help="Maximum relative SV size error (default: 0.05)")
+    parser.add_argument("--type-confusion", type=float, default=0.05,
+                        help="Probability of swapping DUP/INS or reporting an unresolved BND (default: 0.05)")
+    parser.add_argument("--fp-rate", type=float, default=0.1,
+                        help="False positives per true call of each caller (default: 0.1)")
+    parser.add_argument("--min-size", type=int, default=MIN_SV_SIZE, help="Smallest SV size")
+    parser.add_argument("--max-size", type=int, default=MAX_SV_SIZE, help="Largest SV size")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default: 1)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    callers = NGS_CALLERS if args.ngs else args.callers
+    caller_dir = os.path.join(args.output_dir, 'caller_vcf')
+    os.makedirs(caller_dir, exist_ok=True)
+    start = time.perf_counter()
+
+    genome = Genome(chr_prefix=args.genome == '38')
+    rng = random.Random(args.seed)
+    truth = generate_truth(rng, genome, args.num_svs, TYPE_WEIGHTS, args.min_size, args.max_size)
+    truth_path = os.path.join(args.output_dir, 'truth.vcf')
+    report = {'parameters': vars(args), 'callers': {},
+              'truth': {'path': truth_path, 'svs': len(truth), 'records': write_truth_vcf(truth_path, truth, genome)}}
+
+    for caller in callers:
+        # Each caller gets its own stream so adding a caller leaves the others unchanged
+        caller_rng = random.Random(f"{args.seed}:{caller}")
+        calls = generate_calls(caller_rng, truth, genome, args.sensitivity, args.jitter, args.size_jitter,
+                               args.type_confusion, args.fp_rate)
+        path = os.path.join(caller_dir, f"{caller}.vcf")
+        records = write_caller_vcf(path, calls, genome, caller, caller_rng)
+        report['callers'][caller] = {
+            'path': path,
+            'calls': len(calls),
+            'true_calls': sum(1 for call in calls if call['truth_id'] is not None),
+            'records': records
+        }
+        print(f"{caller}: {len(calls)} calls, {records} records -> {path}")
+
+    report['seconds'] = round(time.perf_counter() - start, 3)
+    with open(os.path.join(args.output_dir, 'synthetic.json'), 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Truth: {len(truth)} SVs -> {truth_path} ({report['seconds']}s total)")
+
+if __name__ == "__main__":
+    main()
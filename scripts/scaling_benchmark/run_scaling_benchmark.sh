@@ -0,0 +1,92 @@
+#!/bin/bash
+
+# Scaling benchmark on synthetic callsets: every stage of the pipeline runs
+# through profile_command.py at each size, and the records are collected into
+# runtime/memory curves by summarize_scaling.py.
+#
+# Usage: run_scaling_benchmark.sh [output_dir]
+#   SIZES     truth SV counts to sweep (default: "10000 100000 1000000")
+#   CALLERS   caller dialects (default: the six long-read callers)
+#   SEED      generator seed (default: 1)
+
+OUTDIR="${1:-scaling_benchmark}"
+SIZES="${SIZES:-10000 100000 1000000}"
+CALLERS="${CALLERS:-cutesv debreak pbsv sniffles svdss svim}"
+SEED="${SEED:-1}"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+MERGE_DIR="${SCRIPT_DIR}/../merge_benchmark"
+TRUTH_DIR="${SCRIPT_DIR}/../truth_set_preparation"
+CORRECT_DIR="${SCRIPT_DIR}/../correct_benchmark"
+
+# Stages are recorded under the scaling task, with the stage as the tool and
+# the size directory (n<size>) as the dataset
+source "${MERGE_DIR}/profile_lib.sh"
+PROFILE_TASK=scaling
+
+for size in $SIZES; do
+    run_dir="$OUTDIR/n${size}"
+    stage_dir="$run_dir/stages"
+    mkdir -p "$stage_dir"
+    echo "Size $size -> $run_dir"
+
+    profile generate "$stage_dir/generate" "n${size}" none -- \
+        python3 "${SCRIPT_DIR}/generate_synthetic_callsets.py" \
+        -n "$size" -o "$run_dir" --callers $CALLERS --seed "$SEED"
+
+    # Truth preparation
+    profile visor_bed "$stage_dir/visor_bed" "n${size}" none "$run_dir/truth.vcf" -- \
+        python3 "${TRUTH_DIR}/vcf2visor_bed_input.py" \
+        -i "$run_dir/truth.vcf" -o "$run_dir/visor_bed" --seed "$SEED"
+    profile fix_truth "$stage_dir/fix_truth" "n${size}" none "$run_dir/truth.vcf" -- \
+        python3 "${TRUTH_DIR}/fix_vcf_pipeline.py" \
+        -i "$run_dir/truth.vcf" -o "$run_dir/truth_fixed.vcf" -t 4
+
+    # Caller VCF fixing; VCF_savior.py also needs bcftools, bgzip and tabix
+    for caller in $CALLERS; do
+        profile "fix_pipeline_${caller}" "$stage_dir/fix_pipeline_${caller}" "n${size}" none \
+            "$run_dir/caller_vcf/${caller}.vcf" -- \
+            python3 "${TRUTH_DIR}/fix_vcf_pipeline.py" \
+            -i "$run_dir/caller_vcf/${caller}.vcf" -o "$run_dir/fixed_vcf_${caller}.vcf" -g 38 -t 4
+        if command -v bcftools > /dev/null && command -v tabix > /dev/null; then
+            profile "vcf_savior_${caller}" "$stage_dir/vcf_savior_${caller}" "n${size}" none \
+                "$run_dir/caller_vcf/${caller}.vcf" -- \
+                python3 "${MERGE_DIR}/VCF_savior.py" \
+                -i "$run_dir/caller_vcf/${caller}.vcf" -o "$run_dir/savior_${caller}.vcf" -g 38 -t 4
+        fi
+    done
+
+    if command -v tabix > /dev/null; then
+        profile normalize "$stage_dir/normalize" "n${size}" none "$run_dir/caller_vcf"/*.vcf -- \
+            python3 "${MERGE_DIR}/normalize_caller_vcfs.py" \
+            --input-dir "$run_dir/caller_vcf" --output-dir "$run_dir/normalized_vcf" -g 38
+        merge_inputs=("$run_dir/normalized_vcf"/*.vcf)
+    else
+        merge_inputs=("$run_dir/caller_vcf"/*.vcf)
+    fi
+
+    # Mergers
+    profile reference_merge "$stage_dir/reference_merge" "n${size}" min2 "${merge_inputs[@]}" -- \
+        python3 "${MERGE_DIR}/reference_merge.py" \
+        -i "${merge_inputs[@]}" -o "$run_dir/reference_merged_min2.vcf" --min-support 2
+    profile merge_distance_sweep "$stage_dir/merge_distance_sweep" "n${size}" min2 \
+        "${merge_inputs[@]}" "$run_dir/truth.vcf" -- \
+        python3 "${MERGE_DIR}/merge_distance_sweep.py" \
+        -i "${merge_inputs[@]}" --truth "$run_dir/truth.vcf" --min-support 2 \
+        -o "$run_dir/merge_distance_sweep.tsv"
+    if command -v SURVIVOR > /dev/null; then
+        printf '%s\n' "${merge_inputs[@]}" > "$run_dir/survivor_files.txt"
+        profile survivor_merge "$stage_dir/survivor_merge" "n${size}" min2 "${merge_inputs[@]}" -- \
+            SURVIVOR merge "$run_dir/survivor_files.txt" 1000 2 1 1 0 30 "$run_dir/survivor_merged_min2.vcf"
+    fi
+
+    # Comparator
+    profile compare_sv "$stage_dir/compare_sv" "n${size}" min2 \
+        "$run_dir/reference_merged_min2.vcf" "$run_dir/truth.vcf" -- \
+        python3 "${CORRECT_DIR}/compare_sv.py" \
+        "$run_dir/reference_merged_min2.vcf" "$run_dir/truth.vcf" \
+        "$run_dir/compare_sv_matches.txt" "$run_dir/compare_sv.log" \
+        --metrics-json "$run_dir/compare_sv_metrics.json"
+done
+
+python3 "${SCRIPT_DIR}/summarize_scaling.py" "$OUTDIR" -o "$OUTDIR/scaling_curves.tsv"
+echo "Scaling benchmark completed: $OUTDIR/scaling_curves.tsv"
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import sys
+import glob
+import json
+import argparse
+
+COLUMNS = ['wall_seconds', 'user_seconds', 'system_seconds', 'peak_rss_mb', 'read_chars', 'write_chars', 'exit_code']
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Collect the per-stage resource records of run_scaling_benchmark.sh into runtime/memory curves.")
+    parser.add_argument("benchmark_dir", help="Output directory of run_scaling_benchmark.sh")
+    parser.add_argument("-o", "--output", help="TSV with one row per size and stage (default: stdout)")
+    return parser.parse_args()
+
+def collect(benchmark_dir):
+    """
+    Read n<size>/stages/*.resources.json
+
+    Returns:
+        list: (size, stage, record) sorted by stage, then size
+    """
+    rows = []
+    for path in glob.glob(os.path.join(benchmark_dir, 'n*', 'stages', '*.resources.json')):
+        match = re.fullmatch(r'n(\d+)', os.path.basename(os.path.dirname(os.path.dirname(path))))
+        if not match:
+            continue
+        with open(path) as f:
+            record = json.load(f)
+        stage = record.get('label') or os.path.basename(path)[:-len('.resources.json')]
+        rows.append((int(match.group(1)), stage, record))
+    rows.sort(key=lambda row: (row[1], row[0]))
+    return rows
+
+def main():
+    args = parse_args()
+    rows = collect(args.benchmark_dir)
+    if not rows:
+        sys.stderr.write(f"Error: no stage records found under {args.benchmark_dir}\n")
+        sys.exit(1)
+
+    out = open(args.output, 'w') if args.output else sys.stdout
+    out.write('\t'.join(['stage', 'size'] + COLUMNS + ['seconds_per_1k_svs']) + '\n')
+    for size, stage, record in rows:
+        wall = record.get('wall_seconds')
+        per_1k = round(wall / size * 1000, 4) if wall is not None and size else 'NA'
+        values = [stage, size] + [record.get(column, 'NA') for column in COLUMNS] + [per_1k]
+        out.write('\t'.join(str(v) for v in values) + '\n')
+    if args.output:
+        out.close()
+
+if __name__ == "__main__":
+    main()
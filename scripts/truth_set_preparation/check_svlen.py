@@ -1,69 +1,70 @@
 #!/usr/bin/env python3
 import argparse
+import os
 import sys
 
-def main():
-    parser = argparse.ArgumentParser(description="Check SVLEN fields in a VCF file.")
-    parser.add_argument("-i", "--input", required=True, help="Input VCF file")
-    args = parser.parse_args()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.chunked import map_records
+
+def check_record(line, counts):
+    """Check the SVLEN of one record, returning a message when it is invalid"""
+    line = line.strip()
+    counts['total_variants'] += 1
+
+    # Split the VCF line
+    fields = line.split('\t')
+    if len(fields) < 8:
+        print(f"Invalid VCF line (less than 8 columns): {line}", file=sys.stderr)
+        counts['invalid_entries'] += 1
+        return None
 
-    invalid_entries = 0
-    total_variants = 0
+    info_field = fields[7]  # INFO field is at index 7
+    # Parse the INFO field into key-value pairs
+    info_dict = {}
+    for kv in info_field.split(';'):
+        if '=' in kv:
+            key, val = kv.split('=', 1)
+            info_dict[key] = val
+        else:
+            # Just a flag without value
+            info_dict[kv] = True
 
-    with open(args.input, 'r') as infile:
-        for line in infile:
-            line = line.strip()
-            if line.startswith('#'):  # Skip header lines
-                continue
-            
-            total_variants += 1
+    # Check SVLEN
+    svlen = info_dict.get("SVLEN", None)
+    if svlen is None:
+        # No SVLEN present
+        counts['invalid_entries'] += 1
+        return f"Missing SVLEN: {line}"
 
-            # Split the VCF line
-            fields = line.split('\t')
-            if len(fields) < 8:
-                print(f"Invalid VCF line (less than 8 columns): {line}", file=sys.stderr)
-                invalid_entries += 1
-                continue
+    # SVLEN might have multiple values if Number=., but we expect one integer
+    # If multiple values, we check each one
+    vals = svlen.split(',')
+    # Check if all values are integers
+    for v in vals:
+        try:
+            int(v)
+        except ValueError:
+            counts['invalid_entries'] += 1
+            return f"Non-integer SVLEN encountered: {line}"
+    # Check if there's any None or empty strings
+    if any(v.strip() == '' for v in vals):
+        counts['invalid_entries'] += 1
+        return f"Empty SVLEN value: {line}"
+    return None
 
-            info_field = fields[7]  # INFO field is at index 7
-            # Parse the INFO field into key-value pairs
-            info_dict = {}
-            for kv in info_field.split(';'):
-                if '=' in kv:
-                    key, val = kv.split('=', 1)
-                    info_dict[key] = val
-                else:
-                    # Just a flag without value
-                    info_dict[kv] = True
-            
-            # Check SVLEN
-            svlen = info_dict.get("SVLEN", None)
-            if svlen is None:
-                # No SVLEN present
-                print(f"Missing SVLEN: {line}")
-                invalid_entries += 1
-            else:
-                # SVLEN might have multiple values if Number=., but we expect one integer
-                # If multiple values, we check each one
-                vals = svlen.split(',')
-                # Check if all values are integers
-                all_integers = True
-                for v in vals:
-                    try:
-                        int(v)
-                    except ValueError:
-                        all_integers = False
-                        break
-                if not all_integers:
-                    print(f"Non-integer SVLEN encountered: {line}")
-                    invalid_entries += 1
-                else:
-                    # Check if there's any None or empty strings
-                    if any(v.strip() == '' for v in vals):
-                        print(f"Empty SVLEN value: {line}")
-                        invalid_entries += 1
+def main():
+    parser = argparse.ArgumentParser(description="Check SVLEN fields in a VCF file.")
+    parser.add_argument("-i", "--input", required=True, help="Input VCF file (plain, gzip or BGZF)")
+    parser.add_argument("-t", "--threads", type=int, default=1,
+                        help="Worker processes; plain and BGZF inputs are split into chunks (default: 1)")
+    args = parser.parse_args()
 
-    print(f"Total variants checked: {total_variants}", file=sys.stderr)
+    messages, counts = map_records(args.input, check_record, args.threads)
+    for message in messages:
+        print(message)
+
+    invalid_entries = counts['invalid_entries']
+    print(f"Total variants checked: {counts['total_variants']}", file=sys.stderr)
     print(f"Invalid SVLEN entries found: {invalid_entries}", file=sys.stderr)
 
     if invalid_entries > 0:
@@ -72,4 +73,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
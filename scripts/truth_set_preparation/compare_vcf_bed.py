@@ -1,85 +1,199 @@
 #!/usr/bin/env python3
 
+import os
 import sys
+import argparse
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
 
-def parse_vcf(vcf_file):
-    """Parse VCF file and count unique SVs by type and position"""
-    sv_counts = defaultdict(int)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.breakends import parse_breakend_alt
+
+# Convert BED types to VCF types
+TYPE_MAPPING = {
+    'deletion': 'DEL',
+    'insertion': 'INS',
+    'inversion': 'INV',
+    'tandem duplication': 'DUP',
+    'translocation copy-paste': 'TRA'
+}
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Check which truth VCF records made it into the VISOR haplotype BEDs.")
+    parser.add_argument("-v", "--vcf", default="nstd106.GRCh38.variant_true_call.vcf", help="Truth VCF")
+    parser.add_argument("--bed1", default="visor_bed_haplotype1.bed", help="Haplotype 1 BED")
+    parser.add_argument("--bed2", default="visor_bed_haplotype2.bed", help="Haplotype 2 BED")
+    parser.add_argument("--tolerance", type=int, default=0,
+                        help="Maximum distance between VCF POS and BED start (default: 0)")
+    parser.add_argument("--offset", type=int, default=0,
+                        help="Expected BED start minus VCF POS; -1 for 0-based BED starts "
+                             "(default: 0, as written by vcf2visor_bed_input.py)")
+    parser.add_argument("-o", "--output-prefix",
+                        help="Write <prefix>_matched.tsv, <prefix>_missing.tsv and <prefix>_extra.tsv")
+    return parser.parse_args()
+
+def normalize_chrom(chrom):
+    return chrom[3:] if chrom.startswith('chr') else chrom
+
+class BedIndex:
+    """
+    BED starts of one haplotype, per (chromosome, SV type) in sorted arrays
+
+    Each entry can be claimed once; claimed entries stay visible to
+    mate lookups so both breakends of a translocation find the same entry,
+    and an entry found through a mate is claimed by it.
+    """
+    def __init__(self, bed_file):
+        entries = defaultdict(list)
+        self.total = defaultdict(int)
+        with open(bed_file, 'r') as f:
+            for n, line in enumerate(f):
+                fields = line.rstrip('\n').split('\t')
+                if len(fields) < 4:
+                    continue
+                sv_type = TYPE_MAPPING.get(fields[3], fields[3])
+                entries[(normalize_chrom(fields[0]), sv_type)].append((int(fields[1]), n, fields[0]))
+                self.total[sv_type] += 1
+
+        self.starts = {}
+        self.lines = {}
+        self.chroms = {}
+        self.claimed = {}
+        for key, items in entries.items():
+            items.sort()
+            self.starts[key] = array('q', (start for start, _, _ in items))
+            self.lines[key] = array('q', (n for _, n, _ in items))
+            self.chroms[key] = [chrom for _, _, chrom in items]
+            self.claimed[key] = bytearray(len(items))
+
+    def find(self, chrom, sv_type, pos, tolerance, claim=True):
+        """
+        Closest entry within tolerance of pos
+
+        Returns:
+            tuple: (key, index) or None; with claim=True only unclaimed
+                   entries are considered and the hit is claimed
+        """
+        key = (chrom, sv_type)
+        starts = self.starts.get(key)
+        if starts is None:
+            return None
+        claimed = self.claimed[key]
+        best = None
+        for i in range(bisect_left(starts, pos - tolerance), bisect_right(starts, pos + tolerance)):
+            if claim and claimed[i]:
+                continue
+            if best is None or abs(starts[i] - pos) < abs(starts[best] - pos):
+                best = i
+        if best is None:
+            return None
+        if claim:
+            claimed[best] = 1
+        return key, best
+
+    def claim(self, hit):
+        """Mark an entry returned by find() as claimed"""
+        key, i = hit
+        self.claimed[key][i] = 1
+
+    def unclaimed(self):
+        for key, claimed in self.claimed.items():
+            for i, flag in enumerate(claimed):
+                if not flag:
+                    yield self.chroms[key][i], self.starts[key][i], key[1], self.lines[key][i] + 1
+
+def compare(vcf_file, bed_indexes, tolerance, offset):
+    """
+    Join every VCF record with the haplotype BEDs
+
+    Returns:
+        tuple: (per-type counts, matched rows, missing rows, unique VCF positions)
+    """
+    counts = defaultdict(lambda: defaultdict(int))
+    matched = []
+    missing = []
     unique_positions = set()
-    
+
     with open(vcf_file, 'r') as f:
         for line in f:
             if line.startswith('#'):
                 continue
-            
             fields = line.strip().split('\t')
-            chrom = fields[0]
-            pos = fields[1]
-            info = dict(item.split('=', 1) if '=' in item else (item, True) 
-                       for item in fields[7].split(';'))
-            
+            info = dict(item.split('=', 1) if '=' in item else (item, True)
+                        for item in fields[7].split(';'))
             svtype = info.get('SVTYPE')
-            if svtype:
-                key = f"{chrom}_{pos}_{svtype}"
-                unique_positions.add(key)
-                sv_counts[svtype] += 1
-                
-    return sv_counts, len(unique_positions)
-
-def parse_bed(bed_file):
-    """Parse BED file and count SVs by type"""
-    sv_counts = defaultdict(int)
-    unique_positions = set()
-    
-    with open(bed_file, 'r') as f:
-        for line in f:
-            fields = line.strip().split('\t')
-            chrom = fields[0]
-            start = fields[1]
-            sv_type = fields[3]
-            
-            # Convert BED types to VCF types
-            type_mapping = {
-                'deletion': 'DEL',
-                'insertion': 'INS',
-                'inversion': 'INV',
-                'tandem duplication': 'DUP',
-                'translocation copy-paste': 'TRA'
-            }
-            
-            sv_type = type_mapping.get(sv_type, sv_type)
-            key = f"{chrom}_{start}_{sv_type}"
-            unique_positions.add(key)
-            sv_counts[sv_type] += 1
-            
-    return sv_counts, len(unique_positions)
+            if not svtype:
+                continue
+            chrom = normalize_chrom(fields[0])
+            pos = int(fields[1])
+            unique_positions.add((chrom, pos, svtype))
+            counts[svtype]['VCF'] += 1
+
+            expected = pos + offset
+            hits = [index.find(chrom, svtype, expected, tolerance) for index in bed_indexes]
+            how = 'position'
+            if svtype == 'TRA' and not any(hits):
+                # The mate breakend carries the single BED entry of the event
+                mate = parse_breakend_alt(fields[4])
+                if mate:
+                    mate_chrom = normalize_chrom(mate[0])
+                    hits = [index.find(mate_chrom, svtype, mate[1] + offset, tolerance, claim=False)
+                            for index in bed_indexes]
+                    how = 'mate'
+                    # The entry is accounted for even if its own breakend is not in the VCF
+                    for index, hit in zip(bed_indexes, hits):
+                        if hit:
+                            index.claim(hit)
+
+            haplotypes = [str(n + 1) for n, hit in enumerate(hits) if hit]
+            if not haplotypes:
+                counts[svtype]['missing'] += 1
+                missing.append((fields[0], pos, fields[2], svtype))
+                continue
+            counts[svtype]['matched'] += 1
+            counts[svtype]['homozygous' if len(haplotypes) == len(bed_indexes) else 'heterozygous'] += 1
+            hap, (key, i) = next((n, hit) for n, hit in enumerate(hits) if hit)
+            bed_start = bed_indexes[hap].starts[key][i]
+            matched.append((fields[0], pos, fields[2], svtype, ','.join(haplotypes), bed_start - expected, how))
+
+    return counts, matched, missing, len(unique_positions)
+
+def write_rows(path, header, rows):
+    with open(path, 'w') as out:
+        out.write('\t'.join(header) + '\n')
+        for row in rows:
+            out.write('\t'.join(str(v) for v in row) + '\n')
 
 def main():
-    vcf_file = "nstd106.GRCh38.variant_true_call.vcf"
-    bed1_file = "visor_bed_haplotype1.bed"
-    bed2_file = "visor_bed_haplotype2.bed"
-    
-    # Parse files
-    vcf_counts, vcf_unique = parse_vcf(vcf_file)
-    bed1_counts, bed1_unique = parse_bed(bed1_file)
-    bed2_counts, bed2_unique = parse_bed(bed2_file)
-    
-    # Combine bed1 and bed2 counts for homozygous variants
-    total_bed_counts = defaultdict(int)
-    for sv_type in set(list(bed1_counts.keys()) + list(bed2_counts.keys())):
-        total_bed_counts[sv_type] = bed1_counts[sv_type] + bed2_counts[sv_type]
-    
-    # Print comparison
+    args = parse_args()
+    bed_indexes = [BedIndex(args.bed1), BedIndex(args.bed2)]
+    counts, matched, missing, vcf_unique = compare(args.vcf, bed_indexes, args.tolerance, args.offset)
+
+    extra = []
+    for hap, index in enumerate(bed_indexes, 1):
+        for chrom, start, sv_type, line_number in index.unclaimed():
+            counts[sv_type]['extra'] += 1
+            extra.append((chrom, start, sv_type, hap, line_number))
+
     print("\nComparison Results:")
     print("-" * 50)
     print(f"Total unique positions in VCF: {vcf_unique}")
-    print(f"Total unique positions in BED1: {bed1_unique}")
-    print(f"Total unique positions in BED2: {bed2_unique}")
+    print(f"Tolerance: {args.tolerance} bp, BED offset: {args.offset}")
     print("\nCounts by SV type:")
-    print("Type\tVCF\tBED_Total")
-    for sv_type in sorted(set(list(vcf_counts.keys()) + list(total_bed_counts.keys()))):
-        print(f"{sv_type}\t{vcf_counts[sv_type]}\t{total_bed_counts[sv_type]}")
+    print("Type\tVCF\tBED_Total\tMatched\tMissing\tExtra\tHom\tHet")
+    for sv_type in sorted(set(counts) | set(bed_indexes[0].total) | set(bed_indexes[1].total)):
+        c = counts[sv_type]
+        bed_total = bed_indexes[0].total[sv_type] + bed_indexes[1].total[sv_type]
+        print(f"{sv_type}\t{c['VCF']}\t{bed_total}\t{c['matched']}\t{c['missing']}\t{c['extra']}\t"
+              f"{c['homozygous']}\t{c['heterozygous']}")
+
+    if args.output_prefix:
+        write_rows(f"{args.output_prefix}_matched.tsv",
+                   ['chrom', 'pos', 'id', 'svtype', 'haplotypes', 'bed_offset', 'matched_by'], matched)
+        write_rows(f"{args.output_prefix}_missing.tsv", ['chrom', 'pos', 'id', 'svtype'], missing)
+        write_rows(f"{args.output_prefix}_extra.tsv", ['chrom', 'start', 'svtype', 'haplotype', 'bed_line'], extra)
 
 if __name__ == "__main__":
     main()
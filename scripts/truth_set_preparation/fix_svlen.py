@@ -1,75 +1,80 @@
 #!/usr/bin/env python3
 import argparse
+import os
 import sys
 
-def main():
-    parser = argparse.ArgumentParser(description="Fix SVLEN for TRA and INS in VCF for Truvari.")
-    parser.add_argument("-i", "--input", required=True, help="Input VCF file")
-    parser.add_argument("-o", "--output", required=True, help="Output VCF file")
-    args = parser.parse_args()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.chunked import transform_vcf
+
+def fix_record(line, counts):
+    """Return the record with SVLEN fixed for TRA and INS"""
+    fields = line.strip().split('\t')
+    if len(fields) < 8:
+        return line
 
-    with open(args.input, 'r') as infile, open(args.output, 'w') as outfile:
-        for line in infile:
-            if line.startswith('#'):
-                # Write header lines as-is
-                outfile.write(line)
-                continue
+    info_field = fields[7]
+    info_pairs = info_field.split(';')
+    info_dict = {}
+    for kv in info_pairs:
+        if '=' in kv:
+            key, val = kv.split('=', 1)
+            info_dict[key] = val
+        else:
+            # Flag
+            info_dict[kv] = True
 
-            fields = line.strip().split('\t')
-            if len(fields) < 8:
-                outfile.write(line)
-                continue
+    svtype = info_dict.get("SVTYPE", None)
+    svlen = info_dict.get("SVLEN", None)
 
-            info_field = fields[7]
-            info_pairs = info_field.split(';')
-            info_dict = {}
-            for kv in info_pairs:
-                if '=' in kv:
-                    key, val = kv.split('=', 1)
-                    info_dict[key] = val
-                else:
-                    # Flag
-                    info_dict[kv] = True
+    # If SVTYPE=TRA and no SVLEN, set SVLEN=0
+    if svtype == "TRA" and svlen is None:
+        info_dict["SVLEN"] = "0"
+        counts['tra_svlen_added'] += 1
 
-            svtype = info_dict.get("SVTYPE", None)
-            svlen = info_dict.get("SVLEN", None)
+    # If SVTYPE=INS and SVLEN='.', recalculate SVLEN using END - POS
+    if svtype == "INS" and svlen == ".":
+        counts['ins_svlen_fixed'] += 1
+        try:
+            pos = int(fields[1])
+            end_str = info_dict.get("END", None)
+            if end_str is not None and end_str != ".":
+                end = int(end_str)
+                # Calculate length (assuming END and POS define the insertion length)
+                calc_len = end - pos
+                if calc_len == 0:
+                    # If the calculated length is zero, you might decide to set it to 1 
+                    # or handle this as a special case.
+                    calc_len = 1
+                info_dict["SVLEN"] = str(calc_len)
+            else:
+                # If END not available or '.', fallback to 1 or skip
+                info_dict["SVLEN"] = "1"
+        except ValueError:
+            # If POS or END are not integers, fallback
+            info_dict["SVLEN"] = "1"
 
-            # If SVTYPE=TRA and no SVLEN, set SVLEN=0
-            if svtype == "TRA" and svlen is None:
-                info_dict["SVLEN"] = "0"
+    # Rebuild the INFO field
+    new_info = []
+    for k, v in info_dict.items():
+        if v is True:
+            new_info.append(k)
+        else:
+            new_info.append(f"{k}={v}")
 
-            # If SVTYPE=INS and SVLEN='.', recalculate SVLEN using END - POS
-            if svtype == "INS" and svlen == ".":
-                try:
-                    pos = int(fields[1])
-                    end_str = info_dict.get("END", None)
-                    if end_str is not None and end_str != ".":
-                        end = int(end_str)
-                        # Calculate length (assuming END and POS define the insertion length)
-                        calc_len = end - pos
-                        if calc_len == 0:
-                            # If the calculated length is zero, you might decide to set it to 1 
-                            # or handle this as a special case.
-                            calc_len = 1
-                        info_dict["SVLEN"] = str(calc_len)
-                    else:
-                        # If END not available or '.', fallback to 1 or skip
-                        info_dict["SVLEN"] = "1"
-                except ValueError:
-                    # If POS or END are not integers, fallback
-                    info_dict["SVLEN"] = "1"
+    fields[7] = ';'.join(new_info)
+    return '\t'.join(fields) + '\n'
 
-            # Rebuild the INFO field
-            new_info = []
-            for k, v in info_dict.items():
-                if v is True:
-                    new_info.append(k)
-                else:
-                    new_info.append(f"{k}={v}")
+def main():
+    parser = argparse.ArgumentParser(description="Fix SVLEN for TRA and INS in VCF for Truvari.")
+    parser.add_argument("-i", "--input", required=True, help="Input VCF file (plain, gzip or BGZF)")
+    parser.add_argument("-o", "--output", required=True, help="Output VCF file")
+    parser.add_argument("-t", "--threads", type=int, default=1,
+                        help="Worker processes; plain and BGZF inputs are split into chunks (default: 1)")
+    args = parser.parse_args()
 
-            fields[7] = ';'.join(new_info)
-            outfile.write('\t'.join(fields) + '\n')
+    counts = transform_vcf(args.input, args.output, fix_record, args.threads)
+    print(f"SVLEN added to {counts['tra_svlen_added']} TRA and recalculated for {counts['ins_svlen_fixed']} INS records",
+          file=sys.stderr)
 
 if __name__ == "__main__":
     main()
-
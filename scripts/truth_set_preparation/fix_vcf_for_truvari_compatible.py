@@ -1,13 +1,21 @@
 #!/usr/bin/env python3
-import argparse
+import os
 import sys
+import gzip
+import argparse
 
-def main():
-    parser = argparse.ArgumentParser(description="Fix VCF header and format to be Truvari-compatible.")
-    parser.add_argument("-i", "--input", required=True, help="Input VCF file")
-    parser.add_argument("-o", "--output", required=True, help="Output VCF file")
-    args = parser.parse_args()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.bgzf import BGZF_EOF, MAX_BLOCK_DATA, is_bgzf, block_size, block_offsets, read_block, write_blocks
 
+COPY_BLOCK_SIZE = 8 * 1024 * 1024
+
+def fix_header(header_lines):
+    """
+    Fix the '#' lines of a VCF
+
+    Returns:
+        tuple: (meta lines, fixed #CHROM line) without newlines
+    """
     # We will:
     # 1) Ensure the fileformat line is present and properly formatted (prefer v4.2).
     # 2) Ensure that we have a GT format line in the header.
@@ -19,22 +27,6 @@ def main():
     #       This script attempts minimal fixes. More complicated cases may require
     #       manual edits or stricter validation.
 
-    # Read entire file
-    with open(args.input, 'r') as infile:
-        lines = [l.strip('\n') for l in infile]
-
-    header_lines = []
-    variant_lines = []
-    in_header = True
-
-    # Collect header lines and variant lines separately
-    for line in lines:
-        if line.startswith("#"):
-            header_lines.append(line)
-        else:
-            in_header = False
-            variant_lines.append(line)
-
     # At this point, header_lines should contain all lines starting with '#'.
     # The last header line should start with '#CHROM'
     # We'll process header lines (those starting with '##') separately from the #CHROM line.
@@ -130,21 +122,173 @@ def main():
     # Now we have:
     # meta_lines (## lines)
     # fixed_chrom_line (#CHROM line)
-    # variant_lines (variants)
 
     # Also ensure all meta lines start with ##
     # If there's any line that doesn't start with ## (except #CHROM), remove or fix it
     final_meta_lines = [l for l in meta_lines if l.startswith("##")]
 
-    # Output the result
-    with open(args.output, 'w') as outfile:
-        for l in final_meta_lines:
-            outfile.write(l + "\n")
-        outfile.write(fixed_chrom_line + "\n")
-        for v in variant_lines:
-            outfile.write(v + "\n")
+    return final_meta_lines, fixed_chrom_line
+
+def read_header(f):
+    """
+    Read the '#' lines from the start of an open binary stream
+
+    Returns:
+        tuple: (header lines without newlines, bytes of the first data line)
+    """
+    header_lines = []
+    for line in f:
+        if not line.startswith(b'#'):
+            return header_lines, line
+        header_lines.append(line.decode().strip('\n'))
+    return header_lines, b''
+
+def read_bgzf_header(f, path):
+    """
+    Decompress BGZF blocks only until the first data line
+
+    Returns:
+        tuple: (header lines, body bytes left in the block where the body
+                starts, compressed offset of the following block)
+    """
+    data = b''
+    pos = 0
+    offset = 0
+    while True:
+        while pos < len(data) and data.startswith(b'#', pos):
+            cut = data.find(b'\n', pos)
+            if cut < 0:
+                break
+            pos = cut + 1
+        if pos < len(data) and not data.startswith(b'#', pos):
+            return data[:pos].decode().splitlines(), data[pos:], offset
+        size = block_size(f, offset, path)
+        if size is None:
+            return data.decode().splitlines(), b'', offset
+        data += read_block(f, offset, size)
+        offset += size
+
+def copy_range(src, dst, offset, end=None):
+    """Copy an open file from offset to end (default EOF), with sendfile where available"""
+    dst.flush()
+    remaining = (os.fstat(src.fileno()).st_size if end is None else end) - offset
+    try:
+        while remaining > 0:
+            sent = os.sendfile(dst.fileno(), src.fileno(), offset, min(remaining, 1 << 30))
+            if sent == 0:
+                break
+            offset += sent
+            remaining -= sent
+    except (AttributeError, OSError):
+        src.seek(offset)
+        while remaining > 0:
+            data = src.read(min(remaining, COPY_BLOCK_SIZE))
+            if not data:
+                break
+            dst.write(data)
+            remaining -= len(data)
 
+def copy_stream(src, dst):
+    """Copy the rest of a binary stream, returning its last byte"""
+    last = b''
+    while True:
+        data = src.read(COPY_BLOCK_SIZE)
+        if not data:
+            break
+        dst.write(data)
+        last = data[-1:]
+    return last
+
+def copy_as_bgzf(src, dst):
+    """Compress the rest of a binary stream into BGZF blocks, returning its last byte"""
+    last = b''
+    while True:
+        data = src.read(MAX_BLOCK_DATA)
+        if not data:
+            break
+        write_blocks(dst, data)
+        last = data[-1:]
+    return last
+
+def copy_bgzf_blocks(src, dst, path, offset, first_body):
+    """
+    Copy the BGZF blocks from offset on without recompressing them
+
+    Only the last block holding data is rewritten, when the file does not
+    end with a newline, so the output always does.
+    """
+    blocks = [(start, size) for start, size in block_offsets(path) if start >= offset]
+    tail = b''
+    k = len(blocks)
+    while k > 0 and not tail:
+        k -= 1
+        tail = read_block(src, *blocks[k])
+    if not (tail or first_body) or (tail or first_body).endswith(b'\n'):
+        if blocks:
+            copy_range(src, dst, offset)
+        else:
+            dst.write(BGZF_EOF)
+        return
+    copy_range(src, dst, offset, blocks[k][0] if tail else offset)
+    write_blocks(dst, tail + b'\n')
+    dst.write(BGZF_EOF)
+
+def main():
+    parser = argparse.ArgumentParser(description="Fix VCF header and format to be Truvari-compatible.")
+    parser.add_argument("-i", "--input", required=True, help="Input VCF file (plain, gzip or BGZF)")
+    parser.add_argument("-o", "--output", required=True,
+                        help="Output VCF file; a .gz name writes BGZF")
+    args = parser.parse_args()
+
+    # Only the header changes: variant lines are copied byte for byte from
+    # the first data line on, re-using the compressed blocks of BGZF inputs;
+    # a missing newline after the last line is added
+    bgzf_in = is_bgzf(args.input)
+    bgzf_out = args.output.endswith('.gz')
+    with open(args.input, 'rb') as infile, open(args.output, 'wb') as outfile:
+        body = None
+        if bgzf_in:
+            header_lines, first_body, body_offset = read_bgzf_header(infile, args.input)
+        elif args.input.endswith('.gz'):
+            body = gzip.open(infile, 'rb')
+            header_lines, first_body = read_header(body)
+        else:
+            header_lines, first_body = read_header(infile)
+            body_offset = infile.tell()
+
+        final_meta_lines, fixed_chrom_line = fix_header(header_lines)
+        header = (''.join(l + "\n" for l in final_meta_lines) + fixed_chrom_line + "\n").encode()
+
+        if bgzf_in and bgzf_out:
+            write_blocks(outfile, header)
+            write_blocks(outfile, first_body)
+            copy_bgzf_blocks(infile, outfile, args.input, body_offset, first_body)
+            return
+
+        if bgzf_in:
+            infile.seek(body_offset)
+            body = gzip.GzipFile(fileobj=infile, mode='rb')
+
+        if bgzf_out:
+            write_blocks(outfile, header + first_body)
+            if body is None:
+                infile.seek(body_offset)
+                body = infile
+            last = copy_as_bgzf(body, outfile) or first_body[-1:]
+            if last not in (b'', b'\n'):
+                write_blocks(outfile, b'\n')
+            outfile.write(BGZF_EOF)
+            return
+
+        outfile.write(header + first_body)
+        if body is None:
+            copy_range(infile, outfile, body_offset)
+            infile.seek(max(body_offset, os.path.getsize(args.input) - 1))
+            last = infile.read(1) or first_body[-1:]
+        else:
+            last = copy_stream(body, outfile) or first_body[-1:]
+        if last not in (b'', b'\n'):
+            outfile.write(b'\n')
 
 if __name__ == "__main__":
     main()
-
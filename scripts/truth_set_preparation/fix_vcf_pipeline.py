@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import argparse
+from functools import partial
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.chunked import transform_vcf
+from octopusv_bench.instrument import Instrumentation, add_profile_argument
+from octopusv_bench.vcf_rules import RULES, build_rules, fix_vcf_records, fix_vcf_header
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Fix a VCF for Truvari in one pass with composable rules "
+                    "(replaces fix_svlen.py, fix_vcf_for_truvari_compatible.py, "
+                    "fix_visor_truth_vcf_for_truvari.py and the VCF_savior.py fixes).")
+    parser.add_argument("-i", "--input", required=True, help="Input VCF file (plain, gzip or BGZF)")
+    parser.add_argument("-o", "--output", required=True, help="Output VCF file")
+    parser.add_argument("-r", "--rules",
+                        help=f"Comma-separated rules, applied in this order (default: {','.join(RULES)}; "
+                             "chrom_rename only when --genome is given)")
+    parser.add_argument("--skip", default='', help="Comma-separated rules to leave out")
+    parser.add_argument("-g", "--genome", choices=['37', '38'], help="Genome version for chrom_rename")
+    parser.add_argument("-t", "--threads", type=int, default=1,
+                        help="Worker processes; plain and BGZF inputs are split into chunks (default: 1)")
+    parser.add_argument("--report", help="Write per-rule hit counts as JSON")
+    add_profile_argument(parser)
+    return parser.parse_args()
+
+def select_rules(rules, skip, genome):
+    """Rule names from the comma-separated --rules/--skip options"""
+    skip = {name for name in skip.split(',') if name}
+    if rules:
+        names = [name for name in rules.split(',') if name]
+    else:
+        names = [name for name in RULES if genome or name != 'chrom_rename']
+    return [name for name in names if name not in skip]
+
+def rule_report(input_path, output_path, rules, counts):
+    """Per-rule hit counts, also printed to stderr"""
+    report = {
+        'input': input_path,
+        'output': output_path,
+        'rules': {
+            rule.name: {'records': counts[rule.name], 'header': counts[f"{rule.name}_header"]}
+            for rule in rules
+        }
+    }
+    for name, hits in report['rules'].items():
+        print(f"{name}: {hits['records']} records, {hits['header']} header lines", file=sys.stderr)
+    return report
+
+def main():
+    args = parse_args()
+    names = select_rules(args.rules, args.skip, args.genome)
+    inst = Instrumentation('fix_vcf_pipeline.py', args.profile)
+    try:
+        rules = build_rules(names, args.genome)
+        with inst.phase('fix') as phase:
+            counts = transform_vcf(args.input, args.output, partial(fix_vcf_records, rules), args.threads,
+                                   header_fn=partial(fix_vcf_header, rules))
+            phase['records'] = counts['records']
+    except ValueError as e:
+        sys.stderr.write(f"Error: {e}\n")
+        sys.exit(1)
+
+    report = rule_report(args.input, args.output, rules, counts)
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+    inst.finish(args.output)
+
+if __name__ == "__main__":
+    main()
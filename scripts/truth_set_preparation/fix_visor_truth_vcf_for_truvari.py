@@ -1,6 +1,11 @@
 #!/usr/bin/env python3
 
+import os
 import sys
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.chunked import transform_vcf
 
 def fix_header(line):
     """Fix the header line by adding FORMAT and SAMPLE columns"""
@@ -8,23 +13,25 @@ def fix_header(line):
         return line.strip() + "\tFORMAT\tSAMPLE\n"
     return line
 
-def fix_content(line):
+def fix_content(line, counts=None):
     """Fix content lines by adding GT format field"""
     # Add GT:1/1 for structural variants
     return line.strip() + "\tGT\t1/1\n"
 
+def fix_header_lines(header, counts=None):
+    # Write the additional format header lines
+    return ['##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">\n'] + [fix_header(line) for line in header]
+
 def main():
-    with open('visor_truth.vcf', 'r') as infile, \
-         open('visor_truth_fixed_truvari.vcf', 'w') as outfile:
-        
-        # Write the additional format header lines
-        outfile.write('##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">\n')
-        
-        for line in infile:
-            if line.startswith('#'):
-                outfile.write(fix_header(line))
-            else:
-                outfile.write(fix_content(line))
+    parser = argparse.ArgumentParser(description="Add a GT column to the VISOR truth VCF for Truvari.")
+    parser.add_argument("-i", "--input", default="visor_truth.vcf", help="Input VCF (default: visor_truth.vcf)")
+    parser.add_argument("-o", "--output", default="visor_truth_fixed_truvari.vcf",
+                        help="Output VCF (default: visor_truth_fixed_truvari.vcf)")
+    parser.add_argument("-t", "--threads", type=int, default=1,
+                        help="Worker processes; plain and BGZF inputs are split into chunks (default: 1)")
+    args = parser.parse_args()
+
+    transform_vcf(args.input, args.output, fix_content, args.threads, header_fn=fix_header_lines)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import sys
+import gzip
+import json
+import heapq
+import argparse
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.contigs import ContigOrder
+from octopusv_bench.instrument import Instrumentation, add_profile_argument
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Merge sorted truth VCFs with a k-way merge, drop duplicates and collect statistics in one pass.")
+    parser.add_argument("-i", "--inputs", nargs='+', required=True,
+                        help="Input VCF files; on duplicates the record from the earlier file is kept")
+    parser.add_argument("-o", "--output", required=True, help="Merged output VCF")
+    parser.add_argument("-s", "--stats", required=True, help="Statistics JSON")
+    parser.add_argument("--type-counts", help="Also write SVTYPE counts in 'uniq -c' format")
+    parser.add_argument("--sort", action="store_true",
+                        help="Sort each input in memory first (for inputs that are not coordinate-sorted)")
+    add_profile_argument(parser)
+    return parser.parse_args()
+
+def open_vcf(path):
+    return gzip.open(path, 'rt') if path.endswith('.gz') else open(path, 'r')
+
+def read_header(path):
+    """Return meta lines, the #CHROM line and the declared contig order"""
+    meta_lines = []
+    chrom_line = None
+    contigs = []
+    with open_vcf(path) as f:
+        for line in f:
+            if line.startswith('##'):
+                line = line.rstrip('\n')
+                meta_lines.append(line)
+                if line.startswith('##contig=<ID='):
+                    contigs.append(re.search(r'ID=([^,>]+)', line).group(1))
+            elif line.startswith('#'):
+                chrom_line = line.rstrip('\n')
+            else:
+                break
+    return meta_lines, chrom_line, contigs
+
+def merge_headers(headers):
+    """Union of meta lines in first-seen order, #CHROM line of the first input"""
+    seen = set()
+    meta_lines = []
+    for header_meta, _, _ in headers:
+        for line in header_meta:
+            if line.startswith('##fileformat=') and meta_lines:
+                continue
+            if line not in seen:
+                seen.add(line)
+                meta_lines.append(line)
+    chrom_line = next((h[1] for h in headers if h[1]), '#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO')
+    return meta_lines, chrom_line
+
+def parse_info(info_field):
+    info = {}
+    for item in info_field.split(';'):
+        if '=' in item:
+            key, val = item.split('=', 1)
+            info[key] = val
+    return info
+
+def record_stream(path, source, contig_order, presort=False):
+    """
+    Yield (sort key, source, line number, fields) for every data line
+
+    Raises:
+        ValueError: If the input is not sorted and presort is False
+    """
+    def records():
+        with open_vcf(path) as f:
+            for n, line in enumerate(f):
+                if line.startswith('#'):
+                    continue
+                fields = line.rstrip('\n').split('\t')
+                yield (contig_order.key(fields[0]), int(fields[1])), source, n, fields
+
+    if presort:
+        yield from sorted(records(), key=lambda r: (r[0], r[2]))
+        return
+
+    previous = None
+    for record in records():
+        if previous is not None and record[0] < previous:
+            raise ValueError(f"{path} is not sorted at line {record[2] + 1}; sort it first or use --sort")
+        previous = record[0]
+        yield record
+
+def normalized_key(fields, info):
+    """Identity used for duplicate removal"""
+    svlen = info.get('SVLEN', '.').lstrip('-')
+    return (fields[0], fields[1], fields[3].upper(), fields[4].upper(),
+            info.get('SVTYPE', '.'), info.get('END', '.'), svlen)
+
+class TruthStats:
+    """Counts collected while records are written"""
+    def __init__(self, inputs):
+        self.input_records = {path: 0 for path in inputs}
+        self.duplicates = {path: 0 for path in inputs}
+        self.merged = 0
+        self.by_type = defaultdict(int)
+        self.by_chrom = defaultdict(int)
+        self.svlen = {}
+
+    def add_input(self, path):
+        self.input_records[path] += 1
+
+    def add_duplicate(self, path):
+        self.duplicates[path] += 1
+
+    def add_merged(self, fields, info):
+        svtype = info.get('SVTYPE', 'NA')
+        self.merged += 1
+        self.by_type[svtype] += 1
+        self.by_chrom[fields[0]] += 1
+        try:
+            svlen = abs(int(info['SVLEN'].split(',')[0]))
+        except (KeyError, ValueError):
+            return
+        entry = self.svlen.setdefault(svtype, {'count': 0, 'min': svlen, 'max': svlen, 'sum': 0})
+        entry['count'] += 1
+        entry['min'] = min(entry['min'], svlen)
+        entry['max'] = max(entry['max'], svlen)
+        entry['sum'] += svlen
+
+    def to_dict(self):
+        svlen = {}
+        for svtype, entry in sorted(self.svlen.items()):
+            svlen[svtype] = {'count': entry['count'], 'min': entry['min'], 'max': entry['max'],
+                             'mean': round(entry['sum'] / entry['count'], 2)}
+        return {
+            'input_records': self.input_records,
+            'duplicates_removed': self.duplicates,
+            'merged_records': self.merged,
+            'svtype_counts': dict(sorted(self.by_type.items())),
+            'chrom_counts': dict(self.by_chrom),
+            'svlen': svlen
+        }
+
+def merged_records(inputs, presort=False):
+    """
+    K-way merge the inputs, keeping the first copy of duplicates
+
+    The records are produced lazily, so the statistics are complete only
+    once the generator has been exhausted.
+
+    Returns:
+        tuple: (header lines without newlines, generator of kept record fields, TruthStats)
+    """
+    headers = [read_header(path) for path in inputs]
+    contigs = [chrom for header in headers for chrom in header[2]]
+    contig_order = ContigOrder(contigs)
+    meta_lines, chrom_line = merge_headers(headers)
+    stats = TruthStats(inputs)
+
+    def records():
+        streams = [record_stream(path, source, contig_order, presort) for source, path in enumerate(inputs)]
+        current_position = None
+        seen_keys = set()
+        for position, source, _, fields in heapq.merge(*streams, key=lambda r: (r[0], r[1], r[2])):
+            path = inputs[source]
+            stats.add_input(path)
+            # Duplicates share a position, so only keys at the current one are kept
+            if position != current_position:
+                current_position = position
+                seen_keys.clear()
+            info = parse_info(fields[7]) if len(fields) > 7 else {}
+            key = normalized_key(fields, info)
+            if key in seen_keys:
+                stats.add_duplicate(path)
+                continue
+            seen_keys.add(key)
+            stats.add_merged(fields, info)
+            yield fields
+
+    return meta_lines + [chrom_line], records(), stats
+
+def merge_truth_vcfs(inputs, output, presort=False):
+    """
+    K-way merge the inputs into output, keeping the first copy of duplicates
+
+    Returns:
+        TruthStats: Statistics gathered during the merge
+    """
+    header, records, stats = merged_records(inputs, presort)
+    with open(output, 'w') as out:
+        for line in header:
+            out.write(line + '\n')
+        for fields in records:
+            out.write('\t'.join(fields) + '\n')
+    return stats
+
+def write_stats(stats, stats_path, type_counts_path=None):
+    """Write the statistics JSON (and SVTYPE counts) and print the per-input summary"""
+    summary = stats.to_dict()
+    with open(stats_path, 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    if type_counts_path:
+        with open(type_counts_path, 'w') as f:
+            for svtype, count in summary['svtype_counts'].items():
+                f.write(f"{count:7d} {svtype}\n")
+
+    for path, count in summary['input_records'].items():
+        print(f"{path}: {count} records, {summary['duplicates_removed'][path]} duplicates removed")
+    print(f"Final merged file: {summary['merged_records']}")
+    return summary
+
+def main():
+    args = parse_args()
+    inst = Instrumentation('merge_truth_vcfs.py', args.profile)
+    try:
+        with inst.phase('merge') as phase:
+            stats = merge_truth_vcfs(args.inputs, args.output, args.sort)
+            phase['records'] = sum(stats.input_records.values())
+    except ValueError as e:
+        sys.stderr.write(f"Error: {e}\n")
+        sys.exit(1)
+
+    with inst.phase('write') as phase:
+        write_stats(stats, args.stats, args.type_counts)
+        phase['records'] = stats.merged
+    inst.finish(args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import gzip
+import json
+import argparse
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.bgzf import is_bgzf, block_offsets, split_blocks, iter_range_lines
+
+SVLEN_BINS = [50, 100, 500, 1000, 5000, 10000, 100000, 1000000]
+MISSING_FIELDS = ['ID', 'QUAL', 'FILTER', 'SVTYPE', 'SVLEN', 'END', 'GT']
+MISSING_GT = ('.', './.', '.|.')
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Profile an SV callset in a single pass and report JSON statistics.")
+    parser.add_argument("-i", "--input", required=True, help="Input VCF (plain, gzip or BGZF)")
+    parser.add_argument("-o", "--output", help="Output JSON (default: stdout)")
+    parser.add_argument("-t", "--threads", type=int, default=1,
+                        help="Worker processes for BGZF inputs (default: 1)")
+    return parser.parse_args()
+
+def svlen_bin(svlen):
+    """Label of the SVLEN histogram bin holding abs(svlen)"""
+    lower = 0
+    for upper in SVLEN_BINS:
+        if svlen < upper:
+            return f"{lower}-{upper - 1}"
+        lower = upper
+    return f">={lower}"
+
+def new_profile():
+    return {
+        'records': 0,
+        'svtype_counts': defaultdict(int),
+        'chrom_counts': defaultdict(int),
+        'svlen_histogram': defaultdict(lambda: defaultdict(int)),
+        'missing': defaultdict(int),
+        'positions': set(),
+        'duplicate_positions': 0
+    }
+
+def profile_lines(lines):
+    """Accumulate statistics for an iterable of VCF lines"""
+    profile = new_profile()
+    svtype_counts = profile['svtype_counts']
+    chrom_counts = profile['chrom_counts']
+    histogram = profile['svlen_histogram']
+    missing = profile['missing']
+    positions = profile['positions']
+    records = 0
+
+    for line in lines:
+        if line.startswith('#'):
+            continue
+        fields = line.rstrip('\n').split('\t')
+        if len(fields) < 8:
+            continue
+        records += 1
+        chrom = fields[0]
+        chrom_counts[chrom] += 1
+
+        position = (chrom, fields[1])
+        if position in positions:
+            profile['duplicate_positions'] += 1
+        else:
+            positions.add(position)
+
+        if fields[2] == '.':
+            missing['ID'] += 1
+        if fields[5] == '.':
+            missing['QUAL'] += 1
+        if fields[6] == '.':
+            missing['FILTER'] += 1
+
+        svtype = svlen = end = None
+        for item in fields[7].split(';'):
+            key, _, val = item.partition('=')
+            if key == 'SVTYPE':
+                svtype = val
+            elif key == 'SVLEN':
+                svlen = val
+            elif key == 'END':
+                end = val
+
+        if svtype is None:
+            missing['SVTYPE'] += 1
+            svtype = 'NA'
+        svtype_counts[svtype] += 1
+        if end is None or end == '.':
+            missing['END'] += 1
+        if svlen is None or svlen == '.':
+            missing['SVLEN'] += 1
+            histogram[svtype]['missing'] += 1
+        else:
+            try:
+                histogram[svtype][svlen_bin(abs(int(svlen.split(',')[0])))] += 1
+            except ValueError:
+                histogram[svtype]['invalid'] += 1
+
+        if len(fields) < 10 or not fields[8].startswith('GT') or fields[9].split(':', 1)[0] in MISSING_GT:
+            missing['GT'] += 1
+
+    profile['records'] = records
+    return profile
+
+def merge_profiles(profiles):
+    """Combine partial profiles from consecutive chunks"""
+    merged = new_profile()
+    for profile in profiles:
+        merged['records'] += profile['records']
+        for key in ('svtype_counts', 'chrom_counts', 'missing'):
+            for name, count in profile[key].items():
+                merged[key][name] += count
+        for svtype, bins in profile['svlen_histogram'].items():
+            for name, count in bins.items():
+                merged['svlen_histogram'][svtype][name] += count
+        # A position seen in an earlier chunk makes every copy here a duplicate
+        merged['duplicate_positions'] += profile['duplicate_positions']
+        merged['duplicate_positions'] += len(profile['positions'] & merged['positions'])
+        merged['positions'] |= profile['positions']
+    return merged
+
+def finalize_profile(profile, path):
+    records = profile['records']
+    bin_order = [svlen_bin(0)] + [svlen_bin(upper) for upper in SVLEN_BINS] + ['missing', 'invalid']
+    histogram = {}
+    for svtype, bins in sorted(profile['svlen_histogram'].items()):
+        histogram[svtype] = {name: bins[name] for name in bin_order if name in bins}
+    return {
+        'input': path,
+        'records': records,
+        'svtype_counts': dict(sorted(profile['svtype_counts'].items())),
+        'chrom_counts': dict(profile['chrom_counts']),
+        'svlen_histogram': histogram,
+        'missing_field_rates': {
+            field: round(profile['missing'][field] / records, 6) if records else 0 for field in MISSING_FIELDS
+        },
+        'duplicate_positions': profile['duplicate_positions']
+    }
+
+def profile_bgzf_range(job):
+    path, blocks, start, end = job
+    profile = profile_lines(iter_range_lines(path, blocks, start, end))
+    # Plain dicts so the partial profile can be sent back to the parent process
+    profile['svlen_histogram'] = {svtype: dict(bins) for svtype, bins in profile['svlen_histogram'].items()}
+    return profile
+
+def profile_vcf(path, threads=1):
+    """
+    Profile a VCF in one pass
+
+    BGZF inputs are split into block ranges and profiled in parallel when
+    threads > 1; other inputs are streamed in the calling process.
+    """
+    if threads > 1 and is_bgzf(path):
+        blocks = block_offsets(path)
+        jobs = [(path, blocks, start, end) for start, end in split_blocks(blocks, threads)]
+        with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+            profile = merge_profiles(pool.map(profile_bgzf_range, jobs))
+    else:
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt') as f:
+            profile = profile_lines(f)
+    return finalize_profile(profile, path)
+
+def main():
+    args = parse_args()
+    result = profile_vcf(args.input, args.threads)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+    else:
+        json.dump(result, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,29 @@
 #!/usr/bin/env python3
 
+import os
 import sys
 import argparse
 import re
 import random
 from collections import defaultdict
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from octopusv_bench.breakends import parse_breakend_alt
+from octopusv_bench.bnd_index import breakend_events
+
+# Maps every byte value onto a base; 256 is a multiple of 4 so bases stay uniform
+DNA_TABLE = bytes.maketrans(bytes(range(256)), b'ATCG' * 64)
+WRITE_BUFFER_SIZE = 4 * 1024 * 1024
+
 def parse_args():
     parser = argparse.ArgumentParser(description="Convert custom VCF to VISOR HACk BED format with zygosity assignment.")
     parser.add_argument("-i", "--input_vcf", required=True, help="Input VCF file.")
     parser.add_argument("-o", "--output_prefix", required=True, help="Output prefix for BED files (haplotype1 and haplotype2).")
     parser.add_argument("--homozygous_ratio", type=float, default=0.3, help="Ratio of homozygous variants (default: 0.3).")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for zygosity and insertion sequences.")
+    parser.add_argument("--merge_tra_mates", action="store_true",
+                        help="Write one translocation entry per mate pair (matched by MATEID or bracket ALT) "
+                             "instead of one per TRA record; paired entries are written after all other variants.")
     return parser.parse_args()
 
 def standardize_chromosome(chrom):
@@ -28,26 +41,23 @@ def standardize_chromosome(chrom):
         # Return original name for non-standard chromosomes
         return chrom
 
-def generate_random_sequence(length):
+def generate_random_sequence(length, rng=random):
     """Generate random DNA sequence of specified length"""
-    return ''.join(random.choices('ATCG', k=length))
+    if length <= 0:
+        return ''
+    # Draw all bits at once and map each byte to a base instead of choosing base by base
+    raw = rng.getrandbits(length * 8).to_bytes(length, 'little')
+    return raw.translate(DNA_TABLE).decode('ascii')
 
 def parse_translocation(alt):
     """Parse different types of translocation notation in ALT field"""
-    # Pattern 1: C[12:10767[ or A[1:224014549[
-    pattern1 = r'[ATCG]?\[([^:]+):(\d+)\['
-    # Pattern 2: [Y:10136631[T
-    pattern2 = r'\[([^:]+):(\d+)\][ATCG]?'
-    # Pattern 3: ]4:71592079]G
-    pattern3 = r'\]([^:]+):(\d+)\][ATCG]?'
-    
-    for pattern in [pattern1, pattern2, pattern3]:
-        match = re.search(pattern, alt)
-        if match:
-            target_chrom, target_pos = match.groups()
-            # Standardize the chromosome name here
-            target_chrom = standardize_chromosome(target_chrom)
-            return target_chrom, int(target_pos)
+    # Handles C[12:10767[, A]1:224014549], [Y:10136631[T and ]4:71592079]G
+    parsed = parse_breakend_alt(alt)
+    if parsed:
+        target_chrom, target_pos, _ = parsed
+        # Standardize the chromosome name here
+        target_chrom = standardize_chromosome(target_chrom)
+        return target_chrom, target_pos
     return None, None
 
 def process_insertion(pos, info_dict, alt):
@@ -72,16 +82,38 @@ def process_insertion(pos, info_dict, alt):
             
     return generate_random_sequence(100)
 
+def translocation_entry(chrom, pos, target_chrom, target_pos, haplotype):
+    """VISOR copy-paste translocation entry for one breakend"""
+    hap = 'h1' if haplotype == 'hap1' else 'h2'
+    return [chrom, str(pos), str(pos), 'translocation copy-paste',
+            f"{hap}:{target_chrom}:{target_pos}:forward", '0']
+
+def write_bed_entry(bed_entry, haplotype, hap1_out, hap2_out):
+    bed_line = '\t'.join(bed_entry) + '\n'
+    if haplotype == 'both':
+        hap1_out.write(bed_line)
+        hap2_out.write(bed_line)
+    elif haplotype == 'hap1':
+        hap1_out.write(bed_line)
+    else:
+        hap2_out.write(bed_line)
+
 def main():
     args = parse_args()
     stats = defaultdict(int)
+    # With --merge_tra_mates, TRA records are emitted after pairing so both
+    # breakends of one event produce a single translocation entry
+    translocations = []
+    
+    if args.seed is not None:
+        random.seed(args.seed)
     
     hap1_bed = args.output_prefix + '_haplotype1.bed'
     hap2_bed = args.output_prefix + '_haplotype2.bed'
     log_file = args.output_prefix + '_conversion.log'
     
-    with open(hap1_bed, 'w') as hap1_out, \
-         open(hap2_bed, 'w') as hap2_out, \
+    with open(hap1_bed, 'w', buffering=WRITE_BUFFER_SIZE) as hap1_out, \
+         open(hap2_bed, 'w', buffering=WRITE_BUFFER_SIZE) as hap2_out, \
          open(log_file, 'w') as log:
         
         with open(args.input_vcf, 'r') as f:
@@ -131,27 +163,32 @@ def main():
                 
                 elif svtype == 'TRA':
                     target_chrom, target_pos = parse_translocation(alt)
+                    if target_chrom and target_pos and args.merge_tra_mates:
+                        translocations.append({
+                            'id': fields[2], 'chrom': chrom, 'pos': pos,
+                            'mate_chrom': target_chrom, 'mate_pos': target_pos,
+                            'mate_id': info.get('MATEID', '.'), 'haplotype': haplotype
+                        })
+                        continue
                     if target_chrom and target_pos:
-                        hap = 'h1' if haplotype == 'hap1' else 'h2'
-                        bed_entry = [chrom, str(pos), str(pos), 
-                                   'translocation copy-paste',
-                                   f"{hap}:{target_chrom}:{target_pos}:forward", 
-                                   '0']
+                        bed_entry = translocation_entry(chrom, pos, target_chrom, target_pos, haplotype)
                 
                 if bed_entry:
-                    bed_line = '\t'.join(bed_entry) + '\n'
                     stats['processed'] += 1
                     stats[f'processed_{svtype}'] += 1
-                    
-                    if haplotype == 'both':
-                        hap1_out.write(bed_line)
-                        hap2_out.write(bed_line)
-                    elif haplotype == 'hap1':
-                        hap1_out.write(bed_line)
-                    else:
-                        hap2_out.write(bed_line)
+                    write_bed_entry(bed_entry, haplotype, hap1_out, hap2_out)
                 else:
                     log.write(f"Warning: Could not process line: {line}")
+        
+        for first, mate in breakend_events(translocations):
+            tra = translocations[first]
+            bed_entry = translocation_entry(tra['chrom'], tra['pos'], tra['mate_chrom'], tra['mate_pos'],
+                                            tra['haplotype'])
+            stats['processed'] += 1
+            stats['processed_TRA'] += 1
+            if mate is not None:
+                stats['paired_TRA_mates'] += 1
+            write_bed_entry(bed_entry, tra['haplotype'], hap1_out, hap2_out)
     
     with open(log_file, 'a') as log:
         log.write(f"\nProcessing Statistics:\n")
@@ -159,6 +196,8 @@ def main():
         log.write(f"Processed variants: {stats['processed']}\n")
         log.write(f"Homozygous variants: {stats['homozygous']}\n")
         log.write(f"Heterozygous variants: {stats['heterozygous']}\n")
+        if args.merge_tra_mates:
+            log.write(f"TRA mate breakends merged into one entry: {stats['paired_TRA_mates']}\n")
         log.write("\nProcessed by type:\n")
         for key in stats:
             if key.startswith('processed_'):